@@ -0,0 +1,7 @@
+"""
+Offline microbenchmarks for per-request hot paths.
+
+Run with ``python -m benchmarks --help``. Results are compared against a
+baseline recorded on the same machine (``benchmarks/baselines/local.json``,
+not committed) with a regression threshold.
+"""
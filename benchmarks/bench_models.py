@@ -0,0 +1,61 @@
+from benchmarks import fixtures
+from benchmarks.registry import benchmark
+from events.models import (
+    event_to_public, to_mongo_event, validate_event,
+    event_to_fields, EVENT_LIST_FIELDS, EVENT_DETAIL_FIELDS,
+)
+from users.models import user_to_public, validate_register
+
+
+@benchmark("events.event_to_public[page=100,mixed_dates]")
+def _event_to_public_page():
+    docs = fixtures.event_page(100)
+    return (lambda: [event_to_public(d) for d in docs]), len(docs)
+
+
+@benchmark("events.event_to_public[attendees=10000]")
+def _event_to_public_large():
+    doc = fixtures.event_doc(1, 10_000)
+    return (lambda: event_to_public(doc)), 1
+
+
+@benchmark("events.event_to_fields[list,page=1000]")
+def _event_to_fields_list():
+    docs = fixtures.event_page(1000)
+    return (lambda: [event_to_fields(d, EVENT_LIST_FIELDS) for d in docs]), len(docs)
+
+
+@benchmark("events.event_to_fields[detail,attendees=10000]")
+def _event_to_fields_detail():
+    doc = fixtures.event_doc(1, 10_000)
+    return (lambda: event_to_fields(doc, EVENT_DETAIL_FIELDS)), 1
+
+
+@benchmark("events.to_mongo_event[full]")
+def _to_mongo_event():
+    payloads = [fixtures.event_payload(i) for i in range(100)]
+    return (lambda: [to_mongo_event(p) for p in payloads]), len(payloads)
+
+
+@benchmark("events.to_mongo_event[partial]")
+def _to_mongo_event_partial():
+    payloads = [{"title": p["title"], "date": p["date"]} for p in (fixtures.event_payload(i) for i in range(100))]
+    return (lambda: [to_mongo_event(p, partial=True) for p in payloads]), len(payloads)
+
+
+@benchmark("events.validate_event[full]")
+def _validate_event():
+    payloads = [fixtures.event_payload(i) for i in range(100)]
+    return (lambda: [validate_event(p) for p in payloads]), len(payloads)
+
+
+@benchmark("users.user_to_public[page=100]")
+def _user_to_public():
+    docs = [fixtures.user_doc(i) for i in range(100)]
+    return (lambda: [user_to_public(d) for d in docs]), len(docs)
+
+
+@benchmark("users.validate_register")
+def _validate_register():
+    payloads = [fixtures.register_payload(i) for i in range(100)]
+    return (lambda: [validate_register(p) for p in payloads]), len(payloads)
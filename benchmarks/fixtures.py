@@ -0,0 +1,89 @@
+import random
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+from bson import ObjectId
+
+_rng = random.Random(42)
+_BASE_DAY = date(2025, 1, 1)
+
+
+def _oid(i: int) -> ObjectId:
+    return ObjectId(i.to_bytes(12, "big"))
+
+
+def _date_value(i: int) -> Any:
+    """
+    Cycle through the date shapes found in stored documents.
+    """
+    day = _BASE_DAY + timedelta(days=i % 365)
+    kind = i % 4
+    if kind == 0:
+        return day.isoformat()
+    if kind == 1:
+        return f"{day.isoformat()}T18:30:00"
+    if kind == 2:
+        return datetime(day.year, day.month, day.day, 18, 30)
+    return day
+
+
+def event_doc(i: int, attendees: int) -> Dict[str, Any]:
+    """
+    An event document as stored in MongoDB.
+    """
+    return {
+        "_id": _oid(i),
+        "title": f"  Community meetup #{i}  ",
+        "description": "An evening of talks and networking. " * 4,
+        "details": "Doors open at 18:00. Bring your laptop. " * 20,
+        "date": _date_value(i),
+        "image": f"https://cdn.example.com/events/{i}.jpg",
+        "created_by": str(_oid(10_000_000 + i)),
+        "attendees": [str(_oid(20_000_000 + j)) for j in range(attendees)],
+    }
+
+
+def event_page(rows: int) -> List[Dict[str, Any]]:
+    """
+    A page of events with a skewed attendee distribution (most small, a few large).
+    """
+    return [event_doc(i, min(5_000, int(_rng.paretovariate(1.1)) - 1)) for i in range(rows)]
+
+
+def event_payload(i: int) -> Dict[str, Any]:
+    """
+    An incoming create/update JSON body.
+    """
+    return {
+        "title": f"  Community meetup #{i} ",
+        "description": " An evening of talks. ",
+        "details": "Doors open at 18:00. " * 10,
+        "date": (_BASE_DAY + timedelta(days=i % 365)).isoformat(),
+        "image": f"https://cdn.example.com/events/{i}.jpg ",
+    }
+
+
+def user_doc(i: int) -> Dict[str, Any]:
+    """
+    A user document as stored in MongoDB (including the password hash).
+    """
+    return {
+        "_id": _oid(30_000_000 + i),
+        "email": f"Person.{i}@Example.com",
+        "password": "pbkdf2_sha256$1000000$salt$" + "x" * 44,
+        "first_name": "Person",
+        "last_name": f"Number {i}",
+        "created_at": datetime(2025, 1, 1, 12, 0),
+    }
+
+
+def register_payload(i: int) -> Dict[str, Any]:
+    """
+    An incoming registration JSON body.
+    """
+    return {
+        "email": f"  Person.{i}@Example.com ",
+        "password": "correct horse battery staple",
+        "first_name": "Person",
+        "last_name": f"Number {i}",
+    }
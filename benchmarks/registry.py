@@ -0,0 +1,19 @@
+from typing import Callable, Dict, Tuple
+
+# name -> factory returning (callable to time, rows processed per call)
+BENCHMARKS: Dict[str, Callable[[], Tuple[Callable[[], object], int]]] = {}
+
+
+def benchmark(name: str):
+    """
+    Register a benchmark factory under a stable name (used as the baseline key).
+
+    The factory does all setup and returns (fn, rows): fn is timed, and rows
+    is the number of documents it processes per call.
+    """
+    def register(factory):
+        if name in BENCHMARKS:
+            raise ValueError(f"Duplicate benchmark: {name}")
+        BENCHMARKS[name] = factory
+        return factory
+    return register
@@ -0,0 +1,143 @@
+import argparse
+import importlib
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from benchmarks.registry import BENCHMARKS
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+# Timings only compare on the same machine, so baselines are local (gitignored)
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "local.json"
+DEFAULT_THRESHOLD = 0.25
+
+BENCH_MODULES = (
+    "benchmarks.bench_models",
+    "benchmarks.bench_list",
+)
+
+
+def measure(fn, rows: int, repeat: int, min_time: float) -> Dict[str, Any]:
+    """
+    Time fn with timeit (best of `repeat` runs) and record its peak allocation.
+
+    Returns
+    -------
+    dict
+        us_per_call, ns_per_row, calls_per_s and alloc_kb (tracemalloc peak of one call).
+    """
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "us_per_call": round(best * 1e6, 3),
+        "ns_per_row": round(best * 1e9 / rows, 1),
+        "calls_per_s": round(1 / best, 1),
+        "alloc_kb": round(peak / 1024, 1),
+        "rows": rows,
+    }
+
+
+def _environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "node": platform.node(),
+    }
+
+
+def _comparable(meta: Dict[str, Any]) -> bool:
+    """
+    Return True if a baseline was recorded on this machine and interpreter.
+    """
+    env = _environment()
+    return all(meta.get(k) == env[k] for k in env)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run offline microbenchmarks.")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write results as the new baseline for this machine")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fail if a benchmark is slower than baseline by more than this fraction")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing run")
+    parser.add_argument("--output", help="also write results JSON here")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(BASE_DIR))
+    for module in BENCH_MODULES:
+        importlib.import_module(module)
+
+    baseline_path = Path(args.baseline)
+    saved = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    baseline = saved.get("results", {})
+    if not baseline:
+        print(f"No baseline at {baseline_path}; create one with --save-baseline")
+    elif not _comparable(saved.get("meta", {})):
+        print(f"Baseline {baseline_path} was recorded on another machine or Python; "
+              "not comparing (refresh it with --save-baseline)")
+        baseline = {}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    regressions = []
+    print(f"{'benchmark':<52} {'us/call':>12} {'ns/row':>10} {'alloc KB':>10} {'vs base':>9}")
+    for name, factory in sorted(BENCHMARKS.items()):
+        if args.pattern and args.pattern not in name:
+            continue
+        fn, rows = factory()
+        res = results[name] = measure(fn, rows, args.repeat, args.min_time)
+
+        base = baseline.get(name)
+        change = ""
+        if base:
+            ratio = res["us_per_call"] / base["us_per_call"] - 1
+            change = f"{ratio * 100:+.1f}%"
+            if ratio > args.threshold:
+                regressions.append((name, ratio))
+                change += " !"
+        print(f"{name:<52} {res['us_per_call']:>12.3f} {res['ns_per_row']:>10.1f} {res['alloc_kb']:>10.1f} {change:>9}")
+
+    payload = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **_environment(),
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(payload, indent=2, sort_keys=True))
+    if args.save_baseline:
+        if baseline_path.exists():
+            # Keep entries for benchmarks that were filtered out with -k
+            merged = dict(baseline, **results)
+            payload["results"] = merged
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if regressions:
+        for name, ratio in regressions:
+            print(f"REGRESSION: {name} is {ratio * 100:.1f}% slower than baseline "
+                  f"(threshold {args.threshold * 100:.0f}%)")
+        return 1
+    return 0
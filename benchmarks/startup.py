@@ -0,0 +1,92 @@
+"""
+Cold-start and per-request overhead benchmark for settings profiles.
+
+Run with ``python -m benchmarks.startup``. Each profile is measured in fresh
+subprocesses so imports are cold; the per-request figure drives the WSGI
+handler directly with a request that is rejected before touching MongoDB,
+so it isolates middleware and URL resolution cost.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PROFILES = (
+    "my_events_backend.settings",
+    "my_events_backend.settings_api",
+)
+
+# Runs inside the subprocess; prints one JSON line
+_PROBE = r"""
+import io, json, os, sys, time
+t0 = time.perf_counter()
+import django
+from django.core.wsgi import get_wsgi_application
+app = get_wsgi_application()
+startup = time.perf_counter() - t0
+modules = len(sys.modules)
+
+def call():
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": "/events/search/", "QUERY_STRING": "",
+        "SERVER_NAME": "localhost", "SERVER_PORT": "80", "HTTP_HOST": "localhost",
+        "wsgi.input": io.BytesIO(b""), "wsgi.url_scheme": "http", "wsgi.errors": sys.stderr,
+    }
+    body = app(environ, lambda status, headers: None)
+    b"".join(body)
+    body.close()
+
+for _ in range(200):
+    call()
+n = int(sys.argv[1])
+t1 = time.perf_counter()
+for _ in range(n):
+    call()
+per_request = (time.perf_counter() - t1) / n
+print(json.dumps({"startup_s": startup, "per_request_us": per_request * 1e6, "modules": modules}))
+"""
+
+
+def probe(profile: str, requests: int) -> Dict[str, Any]:
+    """
+    Measure one cold start (plus steady-state request cost) in a new interpreter.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=profile, DEBUG="False", PYTHONPATH=str(BASE_DIR))
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, str(requests)],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per profile")
+    parser.add_argument("--requests", type=int, default=2000, help="timed requests per interpreter")
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'profile':<34} {'startup ms':>11} {'us/request':>11} {'modules':>8}")
+    for profile in PROFILES:
+        runs = [probe(profile, args.requests) for _ in range(args.runs)]
+        res = results[profile] = {
+            "startup_ms": round(statistics.median(r["startup_s"] for r in runs) * 1000, 2),
+            "per_request_us": round(statistics.median(r["per_request_us"] for r in runs), 2),
+            "modules": runs[0]["modules"],
+        }
+        print(f"{profile:<34} {res['startup_ms']:>11.2f} {res['per_request_us']:>11.2f} {res['modules']:>8}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
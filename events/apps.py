@@ -1,4 +1,20 @@
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def _ensure_indexes():
+    from my_events_backend.mongo import get_events_collection
+    from . import search, upcoming
+
+    upcoming.ensure_index()
+    return {"text_index": search.ensure_text_index(get_events_collection())}
+
+
+def _build_upcoming():
+    from . import upcoming
+
+    return {"rows": upcoming.ensure_built()}
+
 
 class EventsConfig(AppConfig):
     """
@@ -6,3 +22,16 @@ class EventsConfig(AppConfig):
     """
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'events'
+
+    def ready(self):
+        from my_events_backend import warmup
+        from . import images, views
+
+        images.warn_if_thumbnails_unavailable()
+
+        if getattr(settings, "WARMUP_VERIFY_INDEXES", True):
+            warmup.register("events indexes", _ensure_indexes)
+        # Built here, not on the read path: read_upcoming() never writes
+        warmup.register("upcoming events view", _build_upcoming)
+        if getattr(settings, "WARMUP_PRIME_CACHE", True):
+            warmup.register("events read cache", views.prime_read_cache)
@@ -0,0 +1,141 @@
+"""
+Capacity-limited attendance with an optional FIFO waitlist.
+
+Every state change is a single conditional update on the event document:
+the filter re-checks capacity (and membership) when the write is applied,
+and MongoDB applies each update atomically. Concurrent attends therefore
+cannot overbook, without any application-level locking.
+"""
+from typing import Any, Dict, List, Tuple
+
+from bson import ObjectId
+
+JOINED = "joined"
+WAITLISTED = "waitlisted"
+ALREADY_ATTENDING = "already_attending"
+ALREADY_WAITLISTED = "already_waitlisted"
+FULL = "full"
+LEFT = "left"
+LEFT_WAITLIST = "left_waitlist"
+NOT_ATTENDING = "not_attending"
+NOT_FOUND = "not_found"
+
+# Matches events with a free seat: no capacity, or fewer attendees than capacity
+HAS_ROOM: Dict[str, Any] = {
+    "$or": [
+        {"capacity": None},
+        {"$expr": {"$lt": [{"$size": {"$ifNull": ["$attendees", []]}}, "$capacity"]}},
+    ]
+}
+
+
+def join(col, oid: ObjectId, user_id: str) -> Tuple[str, List[str]]:
+    """
+    Add a user to an event, or to its waitlist when the event is full.
+
+    Notes
+    -----
+    - A seat is only taken directly while nobody is waiting, so the waitlist
+      stays first come, first served.
+    - After queueing, free seats are filled from the head of the waitlist
+      (a seat may have opened between the two updates).
+
+    Parameters
+    ----------
+    col : Collection
+    Events collection.
+    oid : ObjectId
+    Event id.
+    user_id : str
+    Joining user.
+
+    Returns
+    -------
+    tuple
+    (outcome, user ids added to attendees by this call). The outcome is
+    JOINED, WAITLISTED, ALREADY_ATTENDING, ALREADY_WAITLISTED, FULL or NOT_FOUND.
+    """
+    res = col.update_one(
+        {"_id": oid, "attendees": {"$ne": user_id}, "waitlist.0": {"$exists": False}, **HAS_ROOM},
+        {"$push": {"attendees": user_id}},
+    )
+    if res.modified_count:
+        return JOINED, [user_id]
+
+    res = col.update_one(
+        {"_id": oid, "waitlist_enabled": True, "attendees": {"$ne": user_id}, "waitlist": {"$ne": user_id}},
+        {"$push": {"waitlist": user_id}},
+    )
+    if res.modified_count:
+        promoted = promote(col, oid)
+        return (JOINED if user_id in promoted else WAITLISTED), promoted
+
+    # Nothing changed: find out why (failure path only)
+    if not col.find_one({"_id": oid}, {"_id": 1}):
+        return NOT_FOUND, []
+    if col.find_one({"_id": oid, "attendees": user_id}, {"_id": 1}):
+        return ALREADY_ATTENDING, []
+    if col.find_one({"_id": oid, "waitlist": user_id}, {"_id": 1}):
+        return ALREADY_WAITLISTED, []
+    return FULL, []
+
+
+def leave(col, oid: ObjectId, user_id: str) -> Tuple[str, List[str]]:
+    """
+    Remove a user from an event's attendees (promoting from the waitlist) or its waitlist.
+
+    Returns
+    -------
+    tuple
+    (outcome, user ids promoted to attendees). The outcome is LEFT,
+    LEFT_WAITLIST, NOT_ATTENDING or NOT_FOUND.
+    """
+    res = col.update_one({"_id": oid, "attendees": user_id}, {"$pull": {"attendees": user_id}})
+    if res.modified_count:
+        return LEFT, promote(col, oid)
+
+    res = col.update_one({"_id": oid, "waitlist": user_id}, {"$pull": {"waitlist": user_id}})
+    if res.modified_count:
+        return LEFT_WAITLIST, []
+
+    if not col.find_one({"_id": oid}, {"_id": 1}):
+        return NOT_FOUND, []
+    return NOT_ATTENDING, []
+
+
+def promote(col, oid: ObjectId) -> List[str]:
+    """
+    Move users from the head of the waitlist into free seats, in order.
+
+    Notes
+    -----
+    - Each move pops the head only if it is still the head and a seat is
+      still free (compare-and-swap on "waitlist.0"), so concurrent promoters
+      never promote the same user twice or overfill the event.
+
+    Returns
+    -------
+    list[str]
+    User ids promoted by this call.
+    """
+    promoted: List[str] = []
+    while True:
+        doc = col.find_one({"_id": oid, "waitlist.0": {"$exists": True}, **HAS_ROOM}, {"waitlist": {"$slice": 1}})
+        if not doc:
+            return promoted
+        head = doc["waitlist"][0]
+        res = col.update_one(
+            {"_id": oid, "waitlist.0": head, **HAS_ROOM},
+            {"$pop": {"waitlist": -1}, "$addToSet": {"attendees": head}},
+        )
+        if res.modified_count:
+            promoted.append(head)
+
+
+def waitlist_position(col, oid: ObjectId, user_id: str) -> int:
+    """
+    1-based position of a user on the waitlist (0 if not waiting).
+    """
+    doc = col.find_one({"_id": oid}, {"waitlist": 1}) or {}
+    waitlist = doc.get("waitlist") or []
+    return waitlist.index(user_id) + 1 if user_id in waitlist else 0
@@ -0,0 +1,272 @@
+import contextvars
+import math
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable
+
+from django.conf import settings
+from django.core.cache import cache
+from pymongo.errors import ConnectionFailure
+
+from my_events_backend.mongo import (
+    DatabaseUnavailable, get_breaker, track_commands, set_read_mode, reset_read_mode,
+)
+
+_GENERATION_KEY = "events:gen"
+_MISSING = object()
+
+# True when the last cached_read() in this context fell back to a last-known-good value
+_served_stale: contextvars.ContextVar[bool] = contextvars.ContextVar("events_cache_stale", default=False)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    Notes
+    -----
+    - The first caller for a key runs the function; callers that arrive while
+      it is running wait and receive the same result (or exception).
+    - Per process; each worker process runs at most one load per key at a time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn() for key, or wait for the in-flight run and share its result.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """
+        Return True if a call for key is currently running.
+        """
+        with self._lock:
+            return key in self._calls
+
+
+_flight = SingleFlight()
+
+
+def _ttl() -> float:
+    return float(getattr(settings, "EVENTS_CACHE_TTL", 30))
+
+
+def _stale_ttl() -> float:
+    return float(getattr(settings, "EVENTS_CACHE_STALE_TTL", 60))
+
+
+def _beta() -> float:
+    return float(getattr(settings, "EVENTS_CACHE_BETA", 1.0))
+
+
+def _lkg_ttl() -> float:
+    return float(getattr(settings, "EVENTS_CACHE_LKG_TTL", 24 * 3600))
+
+
+def _lkg_key(name: str) -> str:
+    # Not versioned by generation: only read while MongoDB is unavailable
+    return f"events:lkg:{name}"
+
+
+def _generation_key(event_id: Any = None) -> str:
+    return _GENERATION_KEY if event_id is None else f"{_GENERATION_KEY}:{event_id}"
+
+
+def generation(event_id: Any = None) -> int:
+    """
+    Current events cache generation (part of every cache key), or the
+    generation of one event's detail keys if event_id is given.
+
+    Notes
+    -----
+    - Generations live in the default Django cache. With the default
+      LocMemCache they are per process: invalidate() in one worker does not
+      reach the others, which keep serving their copy for up to
+      EVENTS_CACHE_TTL + EVENTS_CACHE_STALE_TTL seconds. Set CACHE_URL to a
+      shared backend (Redis) when running several workers.
+    - A missing generation starts at the current time in ms, so an evicted
+      counter never returns to a value older entries were stored under.
+    """
+    key = _generation_key(event_id)
+    gen = cache.get(key)
+    if gen is None:
+        cache.add(key, time.time_ns() // 1_000_000, timeout=None)
+        gen = cache.get(key, 0)
+    return gen
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns() // 1_000_000, timeout=None)
+
+
+def invalidate() -> None:
+    """
+    Invalidate all cached event reads (call after any event write).
+    """
+    _bump(_generation_key())
+
+
+def invalidate_event(event_id: Any) -> None:
+    """
+    Invalidate only the cached detail reads of one event.
+
+    For high-rate writes that change a single event (attend/unattend): lists
+    keep their cached copy and pick up new counts when it expires.
+    """
+    _bump(_generation_key(event_id))
+
+
+def _load(key: str, name: str, loader: Callable[[], Any], primary: bool = False) -> Any:
+    start = time.monotonic()
+    # A miss may follow a write (new generation): a lagging secondary would
+    # cache the old document for the whole TTL
+    token = set_read_mode(None) if primary else None
+    try:
+        value = loader()
+    except ConnectionFailure:
+        get_breaker().record_failure()
+        raise
+    finally:
+        if token is not None:
+            reset_read_mode(token)
+    delta = time.monotonic() - start
+    ttl = _ttl()
+    entry = {"v": value, "t": time.time() + ttl, "d": delta}
+    cache.set(key, entry, timeout=ttl + _stale_ttl())
+    cache.set(_lkg_key(name), value, timeout=_lkg_ttl())
+    return value
+
+
+def _load_or_last_known_good(key: str, name: str, loader: Callable[[], Any]) -> Any:
+    try:
+        return _flight.do(key, lambda: _load(key, name, loader, primary=True))
+    except (DatabaseUnavailable, ConnectionFailure) as e:
+        value = cache.get(_lkg_key(name), _MISSING)
+        if value is _MISSING:
+            if isinstance(e, DatabaseUnavailable):
+                raise
+            # Already counted by the breaker; report as unavailable
+            raise DatabaseUnavailable(get_breaker().retry_after()) from e
+        _served_stale.set(True)
+        return value
+
+
+def served_stale() -> bool:
+    """
+    Return True if the last cached_read() in this context served a
+    last-known-good value because MongoDB was unavailable.
+    """
+    return _served_stale.get()
+
+
+def _refresh_in_background(key: str, name: str, loader: Callable[[], Any]) -> None:
+    if _flight.in_flight(key):
+        return
+    ctx = contextvars.copy_context()
+
+    def run() -> None:
+        # Keep the request's read policy, but not its command tracking
+        with track_commands():
+            try:
+                _flight.do(key, lambda: _load(key, name, loader))
+            except Exception:
+                pass  # the stale entry keeps being served until the hard expiry
+
+    threading.Thread(target=ctx.run, args=(run,), daemon=True).start()
+
+
+def cached_read(name: str, loader: Callable[[], Any], event_id: Any = None) -> Any:
+    """
+    Read-through cache for hot event reads with stampede protection.
+
+    Notes
+    -----
+    - Misses are coalesced: one loader() call per key runs, others wait for it.
+    - Probabilistic early refresh (XFetch): as an entry nears expiry, a request
+      may refresh it in the background, weighted by how long the load took.
+    - Stale-while-revalidate: for EVENTS_CACHE_STALE_TTL seconds after expiry
+      the old value is served while one background refresh runs.
+    - Keys include the cache generation, so invalidate() makes writes visible
+      (in every worker only with a shared cache backend, see generation()).
+      Misses load from the primary, so the first load after a write is not
+      served by a lagging secondary; early background refreshes keep the
+      request's read policy (see my_events_backend.read_routing).
+      Reads of a single event also include its own generation, bumped by
+      invalidate_event().
+    - Last-known-good: every load is also kept for EVENTS_CACHE_LKG_TTL
+      seconds under a generation-free key. If a miss cannot reach MongoDB
+      (circuit breaker open, connection failure), that copy is served and
+      served_stale() returns True; it may predate recent writes.
+
+    Parameters
+    ----------
+    name : str
+        Logical key (e.g. "list:id,title,date").
+    loader : Callable[[], Any]
+        Function that queries MongoDB; its result must be picklable.
+    event_id : Any, optional
+        Event the value depends on (detail reads), for invalidate_event().
+
+    Returns
+    -------
+    Any
+        The cached or freshly loaded value.
+
+    Raises
+    ------
+    DatabaseUnavailable
+        If MongoDB is unavailable and there is no last-known-good value.
+    """
+    _served_stale.set(False)
+    gen = str(generation())
+    if event_id is not None:
+        gen += f".{generation(event_id)}"
+    key = f"events:{gen}:{name}"
+    entry = cache.get(key)
+    if entry is None:
+        return _load_or_last_known_good(key, name, loader)
+
+    now = time.time()
+    # XFetch: refresh early with probability rising as expiry approaches
+    early = now - entry["d"] * _beta() * math.log(random.random() or 1e-12) >= entry["t"]
+    if early:
+        _refresh_in_background(key, name, loader)
+    return entry["v"]
@@ -0,0 +1,142 @@
+"""
+Streaming export of events (and optionally attendee ids) as NDJSON or CSV.
+
+Rows are read from one MongoDB cursor in _id order and encoded in chunks,
+so memory stays flat regardless of the number of events. An export can be
+resumed after the last received row by passing its "id" as the cursor.
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Any, Dict, Iterator, Optional
+
+from bson import ObjectId
+
+from .models import EventRecord
+
+FORMATS = ("ndjson", "csv")
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+EXPORT_FIELDS = (
+    "id", "title", "date", "description", "details", "image", "created_by", "capacity", "attendees_count",
+)
+
+DEFAULT_BATCH_SIZE = 1000
+# Rows encoded per yielded chunk
+CHUNK_ROWS = 500
+
+
+def parse_cursor(token: Optional[str]) -> Optional[ObjectId]:
+    """
+    Parse a resume cursor (the id of the last exported event).
+
+    Raises
+    ------
+    ValueError
+    If the token is not an event id.
+    """
+    if not token:
+        return None
+    if not ObjectId.is_valid(token):
+        raise ValueError("Invalid cursor")
+    return ObjectId(token)
+
+
+def _rows(col, attendees: bool, after: Optional[ObjectId], batch_size: int,
+          created_by: Optional[str]) -> Iterator[Dict[str, Any]]:
+    projection = {"_id": 1, "title": 1, "date": 1, "description": 1, "details": 1, "image": 1,
+                  "created_by": 1, "capacity": 1, "attendees": 1}
+    query: Dict[str, Any] = {"_id": {"$gt": after}} if after is not None else {}
+    if created_by is not None:
+        query["created_by"] = created_by
+    cursor = col.find(query, projection).sort("_id", 1).batch_size(batch_size)
+    try:
+        for doc in cursor:
+            row = EventRecord.public_from_bson(doc, EXPORT_FIELDS)
+            if attendees:
+                ids = doc.get("attendees")
+                row["attendees"] = [str(uid) for uid in ids] if isinstance(ids, list) else []
+            yield row
+    finally:
+        cursor.close()
+
+
+def _encode(rows: Iterator[Dict[str, Any]], fmt: str, attendees: bool) -> Iterator[bytes]:
+    if fmt == "ndjson":
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(row, separators=(",", ":")))
+            if len(lines) >= CHUNK_ROWS:
+                yield ("\n".join(lines) + "\n").encode("utf-8")
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+        return
+
+    columns = list(EXPORT_FIELDS) + (["attendees"] if attendees else [])
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    n = 0
+    for row in rows:
+        if attendees:
+            row["attendees"] = ";".join(row["attendees"])
+        writer.writerow(["" if row[c] is None else row[c] for c in columns])
+        n += 1
+        if n % CHUNK_ROWS == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def export_events(col, fmt: str = "ndjson", attendees: bool = False, after: Optional[ObjectId] = None,
+                  batch_size: int = DEFAULT_BATCH_SIZE, gzip: bool = False,
+                  created_by: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Stream all events as encoded chunks.
+
+    Parameters
+    ----------
+    col : Collection
+    Events collection.
+    fmt : str
+    "ndjson" (one JSON object per line) or "csv" (with a header row).
+    attendees : bool
+    Include attendee ids ("attendees": list in NDJSON, ";"-joined in CSV).
+    after : ObjectId | None
+    Resume after this event id (see parse_cursor).
+    batch_size : int
+    MongoDB cursor batch size.
+    gzip : bool
+    Gzip-compress the stream.
+    created_by : str | None
+    Only export events created by this user id (None = all events).
+
+    Returns
+    -------
+    Iterator[bytes]
+    Encoded chunks; nothing is read from MongoDB until iteration starts.
+
+    Raises
+    ------
+    ValueError
+    If the format is unknown or batch_size is not positive.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    chunks = _encode(_rows(col, attendees, after, batch_size, created_by), fmt, attendees)
+    return _gzip(chunks) if gzip else chunks
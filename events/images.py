@@ -0,0 +1,202 @@
+"""
+Event image storage: content-addressed originals plus background thumbnails.
+
+Files live in Django's default storage under event_images/<key>/<variant>,
+where key is a hash of the original bytes. A given URL therefore always
+names the same image, so responses can be cached for a year.
+"""
+import hashlib
+import importlib.util
+import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from .thumbnails import THUMBNAIL_SIZES, render_thumbnails
+
+ORIGINAL = "original"
+VARIANTS = (ORIGINAL,) + tuple(THUMBNAIL_SIZES)
+
+# Leading bytes -> content type; thumbnails keep the original format
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+_KEY_RE = re.compile(r"^[0-9a-f]{32}$")
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """
+    Return the image content type for the leading bytes, or None if unsupported.
+    """
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def is_valid_key(key: str) -> bool:
+    return bool(_KEY_RE.fullmatch(key))
+
+
+def thumbnails_enabled() -> bool:
+    """
+    Return True if thumbnails are generated (Pillow installed and not disabled).
+
+    Without them every variant is served from the original.
+    """
+    return getattr(settings, "EVENT_IMAGE_THUMBNAILS", True) and importlib.util.find_spec("PIL") is not None
+
+
+def warn_if_thumbnails_unavailable() -> None:
+    """
+    Log a warning at startup if thumbnails are enabled but Pillow is missing
+    (every list/detail thumbnail URL would serve the full-size original).
+    """
+    if getattr(settings, "EVENT_IMAGE_THUMBNAILS", True) and not thumbnails_enabled():
+        logger.warning(
+            "EVENT_IMAGE_THUMBNAILS is on but Pillow is not installed: event image thumbnails "
+            "serve the full-size originals. Install Pillow (pip install Pillow) or set "
+            "EVENT_IMAGE_THUMBNAILS=False."
+        )
+
+
+def _path(key: str, variant: str) -> str:
+    return f"event_images/{key}/{variant}"
+
+
+def variant_url(key: str, variant: str) -> str:
+    return reverse("event-image", args=[key, variant])
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking would copy the MongoClient and its monitor threads
+            _executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, "EVENT_IMAGE_WORKERS", 2),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _submit(fn, *args):
+    global _executor
+    try:
+        return _get_executor().submit(fn, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); replace the pool once
+        with _executor_lock:
+            _executor = None
+        return _get_executor().submit(fn, *args)
+
+
+def _schedule_thumbnails(key: str, data: bytes) -> None:
+    def store(future) -> None:
+        try:
+            rendered = future.result()
+        except Exception:
+            # The original keeps being served for this key
+            logger.exception("Thumbnail rendering failed for %s", key)
+            return
+        for variant, content in rendered.items():
+            if not default_storage.exists(_path(key, variant)):
+                default_storage.save(_path(key, variant), ContentFile(content))
+
+    try:
+        _submit(render_thumbnails, data).add_done_callback(store)
+    except Exception:
+        # Not fatal for the upload: the original is served until a re-upload
+        logger.exception("Could not queue thumbnails for %s", key)
+
+
+def max_bytes() -> int:
+    """
+    Largest accepted upload in bytes (EVENT_IMAGE_MAX_BYTES).
+    """
+    return getattr(settings, "EVENT_IMAGE_MAX_BYTES", 10 * 1024 * 1024)
+
+
+def save_image(data: bytes) -> Dict[str, str]:
+    """
+    Store an uploaded image and queue its thumbnails.
+
+    Notes
+    -----
+    - Returns immediately; thumbnails are rendered on a process pool and
+      written to storage when done. Until then their URLs serve the original.
+    - Re-uploading identical bytes reuses the stored files.
+
+    Parameters
+    ----------
+    data : bytes
+    Uploaded image bytes.
+
+    Returns
+    -------
+    dict
+    Event fields to $set: "image" (list thumbnail URL), "image_detail"
+    (detail thumbnail URL) and "image_key".
+
+    Raises
+    ------
+    ValueError
+    If the upload is empty, too large or not a supported image type.
+    """
+    limit = max_bytes()
+    if not data:
+        raise ValueError("Image is empty")
+    if len(data) > limit:
+        raise ValueError(f"Image max size is {limit} bytes")
+    if sniff_content_type(data[:12]) is None:
+        raise ValueError("Image must be JPEG, PNG, GIF or WebP")
+
+    key = hashlib.sha256(data).hexdigest()[:32]
+    if not default_storage.exists(_path(key, ORIGINAL)):
+        default_storage.save(_path(key, ORIGINAL), ContentFile(data))
+    if thumbnails_enabled() and not all(default_storage.exists(_path(key, v)) for v in THUMBNAIL_SIZES):
+        _schedule_thumbnails(key, data)
+
+    return {
+        "image": variant_url(key, "list"),
+        "image_detail": variant_url(key, "detail"),
+        "image_key": key,
+    }
+
+
+def resolve_variant(key: str, variant: str) -> Tuple[Optional[str], bool]:
+    """
+    Find the stored file that serves a variant.
+
+    Returns
+    -------
+    tuple
+    (storage path or None if the image does not exist, final). final is False
+    while a thumbnail is still pending and the original stands in for it.
+    """
+    path = _path(key, variant)
+    if default_storage.exists(path):
+        return path, True
+    original = _path(key, ORIGINAL)
+    if not default_storage.exists(original):
+        return None, False
+    return original, not thumbnails_enabled()
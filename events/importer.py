@@ -0,0 +1,80 @@
+"""
+Parsing and validation for `manage.py import_events`.
+
+validate_batch runs in worker processes, so this module only depends on
+events.models (no Django settings or MongoDB client).
+"""
+import csv
+import io
+import json
+import mmap
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .models import validate_event, to_mongo_event
+
+FORMATS = ("ndjson", "csv")
+
+# (record number, raw record): NDJSON lines as bytes, CSV rows as dicts
+Record = Tuple[int, Any]
+
+
+def detect_format(path: str) -> str:
+    """
+    Guess the input format from the file extension (defaults to NDJSON).
+    """
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def read_records(path: str, fmt: str) -> Iterator[Record]:
+    """
+    Stream records from a file without loading it into memory.
+
+    Notes
+    -----
+    - NDJSON is memory-mapped and split into lines; decoding happens in the
+      workers. Blank lines are skipped but still count as records, so
+      record numbers match line numbers.
+    - CSV is read with csv.DictReader (header row required); record numbers
+      count data rows from 1.
+    """
+    if fmt == "ndjson":
+        with open(path, "rb") as f:
+            if f.seek(0, io.SEEK_END) == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for n, line in enumerate(iter(mm.readline, b""), start=1):
+                    if line.strip():
+                        yield n, line
+        return
+
+    with open(path, newline="", encoding="utf-8") as f:
+        for n, row in enumerate(csv.DictReader(f), start=1):
+            yield n, row
+
+
+def validate_batch(records: List[Record], fmt: str) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    Decode and validate a batch of records.
+
+    Returns
+    -------
+    tuple
+    ([(record number, MongoDB document)], [rejected rows]). A rejected row
+    is {"record", "error", "row"}.
+    """
+    docs: List[Tuple[int, Dict[str, Any]]] = []
+    rejects: List[Dict[str, Any]] = []
+    for n, raw in records:
+        try:
+            item = json.loads(raw) if fmt == "ndjson" else raw
+            if not isinstance(item, dict):
+                raise ValueError("Event must be a JSON object")
+            if fmt == "csv":
+                # Empty CSV cells mean "not given"
+                item = {k: v for k, v in item.items() if k and v not in (None, "")}
+            validate_event(item)
+            docs.append((n, to_mongo_event(item)))
+        except ValueError as e:
+            row = raw.decode("utf-8", errors="replace").rstrip("\n") if isinstance(raw, bytes) else raw
+            rejects.append({"record": n, "error": str(e), "row": row})
+    return docs, rejects
@@ -0,0 +1,263 @@
+"""
+Live attendee counts for GET /events/live/ (Server-Sent Events, ASGI only).
+
+One LiveHub per process fans counts out to every connected viewer:
+
+- attend/unattend/delete in this process publish the new count directly;
+- a single watcher thread per process picks up changes made by other
+  processes, either from a change stream on the events collection
+  (replica sets) or by polling the counts of watched events every
+  EVENTS_LIVE_POLL_SECONDS (EVENTS_LIVE_SOURCE = auto | changestream | poll).
+
+However many viewers are connected, a process runs one upstream watch, and
+a viewer only receives the latest count of each event (intermediate counts
+are dropped for slow clients).
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from asgiref.sync import sync_to_async
+from bson import ObjectId
+from django.conf import settings
+from pymongo.errors import OperationFailure
+
+from my_events_backend.mongo import get_events_collection, is_standin
+
+logger = logging.getLogger(__name__)
+
+_UNKNOWN = object()
+
+
+def _poll_seconds() -> float:
+    return float(getattr(settings, "EVENTS_LIVE_POLL_SECONDS", 2))
+
+
+def parse_ids(raw: Optional[str]) -> List[str]:
+    """
+    Parse ?ids=a,b,c into a list of unique event ids.
+
+    Raises
+    ------
+    ValueError
+    If no id is given, an id is invalid, or there are more than EVENTS_LIVE_MAX_IDS.
+    """
+    ids = list(dict.fromkeys(i.strip() for i in (raw or "").split(",") if i.strip()))
+    if not ids:
+        raise ValueError("ids is required (comma-separated event ids)")
+    max_ids = int(getattr(settings, "EVENTS_LIVE_MAX_IDS", 50))
+    if len(ids) > max_ids:
+        raise ValueError(f"At most {max_ids} ids per stream")
+    for event_id in ids:
+        if not ObjectId.is_valid(event_id):
+            raise ValueError(f"Invalid event id: {event_id}")
+    return ids
+
+
+def fetch_counts(ids: Iterable[str]) -> Dict[str, int]:
+    """
+    Current attendee counts by event id (deleted events are missing).
+    """
+    pipeline = [
+        {"$match": {"_id": {"$in": [ObjectId(i) for i in ids]}}},
+        {"$project": {"count": {"$size": {"$ifNull": ["$attendees", []]}}}},
+    ]
+    return {str(doc["_id"]): doc["count"] for doc in get_events_collection().aggregate(pipeline)}
+
+
+class _Subscriber:
+    """
+    One SSE connection: the latest unsent count per event, and a wake-up flag.
+    """
+    __slots__ = ("loop", "ids", "pending", "wakeup")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, ids: List[str]):
+        self.loop = loop
+        self.ids = ids
+        self.pending: Dict[str, Optional[int]] = {}
+        self.wakeup = asyncio.Event()
+
+    def notify(self, event_id: str, count: Optional[int]) -> None:
+        # Called from any thread; pending/wakeup are only touched on the loop
+        try:
+            self.loop.call_soon_threadsafe(self._set, event_id, count)
+        except RuntimeError:
+            pass  # loop closed: the connection is gone
+
+    def _set(self, event_id: str, count: Optional[int]) -> None:
+        self.pending[event_id] = count
+        self.wakeup.set()
+
+
+class LiveHub:
+    """
+    Per-process fan-out of attendee counts to SSE subscribers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+        self._latest: Dict[str, Optional[int]] = {}
+        self._watcher: Optional[threading.Thread] = None
+
+    def subscribe(self, ids: List[str], loop: asyncio.AbstractEventLoop) -> _Subscriber:
+        """
+        Register a subscriber; its pending counts start with the latest known ones.
+        """
+        sub = _Subscriber(loop, ids)
+        with self._lock:
+            for event_id in ids:
+                self._subscribers.setdefault(event_id, set()).add(sub)
+                if event_id in self._latest:
+                    sub.pending[event_id] = self._latest[event_id]
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=_watch, args=(self,), name="events-live", daemon=True)
+                self._watcher.start()
+        return sub
+
+    def unsubscribe(self, sub: _Subscriber) -> None:
+        with self._lock:
+            for event_id in sub.ids:
+                subs = self._subscribers.get(event_id)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subscribers[event_id]
+                        self._latest.pop(event_id, None)
+
+    def watched(self) -> List[str]:
+        with self._lock:
+            return list(self._subscribers)
+
+    def _keep_watching(self) -> bool:
+        """
+        Called by the watcher thread; it exits once nobody is subscribed.
+        """
+        with self._lock:
+            if not self._subscribers:
+                self._watcher = None
+            return self._watcher is not None
+
+    def publish(self, event_id: str, count: Optional[int]) -> None:
+        """
+        Push a new attendee count (None = event deleted) to the event's subscribers.
+
+        Notes
+        -----
+        - A no-op for events nobody in this process is watching, and for
+          counts that did not change.
+        """
+        with self._lock:
+            subs = self._subscribers.get(event_id)
+            if not subs or self._latest.get(event_id, _UNKNOWN) == count:
+                return
+            self._latest[event_id] = count
+            subs = list(subs)
+        for sub in subs:
+            sub.notify(event_id, count)
+
+    def refresh(self, ids: List[str]) -> None:
+        """
+        Re-read the counts of the given events from MongoDB and publish them.
+        """
+        counts = fetch_counts(ids)
+        for event_id in ids:
+            self.publish(event_id, counts.get(event_id))
+
+
+hub = LiveHub()
+
+
+def publish(event_id, count: Optional[int]) -> None:
+    """
+    Publish a count change from a view (see LiveHub.publish).
+    """
+    hub.publish(str(event_id), count)
+
+
+def _use_change_stream() -> bool:
+    source = getattr(settings, "EVENTS_LIVE_SOURCE", "auto")
+    return source != "poll" and not is_standin()
+
+
+def _watch_changes(live: LiveHub) -> None:
+    """
+    Follow the events change stream; refresh watched events that changed.
+    """
+    pipeline = [
+        {"$match": {"operationType": {"$in": ["update", "replace", "delete"]}}},
+        {"$project": {"documentKey": 1}},
+    ]
+    with get_events_collection().watch(pipeline, max_await_time_ms=int(_poll_seconds() * 1000)) as stream:
+        while live.watched():
+            dirty = set()
+            change = stream.try_next()
+            while change is not None:
+                dirty.add(str(change["documentKey"]["_id"]))
+                change = stream.try_next() if len(dirty) < 1000 else None
+            dirty &= set(live.watched())
+            if dirty:
+                live.refresh(list(dirty))
+
+
+def _watch(live: LiveHub) -> None:
+    """
+    Watcher thread: runs while this process has subscribers.
+    """
+    change_stream = _use_change_stream()
+    while live._keep_watching():
+        try:
+            if change_stream:
+                _watch_changes(live)
+            else:
+                live.refresh(live.watched())
+                time.sleep(_poll_seconds())
+        except OperationFailure as e:
+            if getattr(settings, "EVENTS_LIVE_SOURCE", "auto") == "changestream":
+                logger.exception("Live counts change stream failed")
+                time.sleep(_poll_seconds())
+            else:
+                # e.g. standalone server: change streams need a replica set
+                logger.info("Live counts: change streams unavailable (%s), polling instead", e)
+                change_stream = False
+        except Exception as e:
+            logger.warning("Live counts watcher error: %s", e)
+            time.sleep(_poll_seconds())
+
+
+def _format(event_id: str, count: Optional[int]) -> str:
+    if count is None:
+        return f"event: deleted\ndata: {json.dumps({'id': event_id})}\n\n"
+    return f"event: attendees\ndata: {json.dumps({'id': event_id, 'attendees_count': count})}\n\n"
+
+
+async def stream(ids: List[str]) -> AsyncIterator[str]:
+    """
+    SSE body: the current counts, then every change, with keep-alive comments.
+    """
+    heartbeat = float(getattr(settings, "EVENTS_LIVE_HEARTBEAT_SECONDS", 15))
+    sub = hub.subscribe(ids, asyncio.get_running_loop())
+    try:
+        yield "retry: 5000\n\n"
+        unknown = [event_id for event_id in ids if event_id not in sub.pending]
+        if unknown:
+            counts = await sync_to_async(fetch_counts, thread_sensitive=False)(unknown)
+            # Reaches this subscriber through notify(), like any other change
+            for event_id in unknown:
+                hub.publish(event_id, counts.get(event_id))
+        while True:
+            if not sub.pending:
+                try:
+                    await asyncio.wait_for(sub.wakeup.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+            sub.wakeup.clear()
+            pending, sub.pending = sub.pending, {}
+            for event_id, count in pending.items():
+                yield _format(event_id, count)
+    finally:
+        hub.unsubscribe(sub)
@@ -0,0 +1,49 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events import export
+from my_events_backend.mongo import get_events_collection
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream all events as NDJSON or CSV (optionally with attendee ids and gzip) "
+        "to a file or stdout, with constant memory. Resume with --cursor <last id>."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=export.FORMATS, default="ndjson")
+        parser.add_argument("--attendees", action="store_true", help="include attendee ids")
+        parser.add_argument("--gzip", action="store_true", help="gzip the output")
+        parser.add_argument("--batch-size", type=int, default=export.DEFAULT_BATCH_SIZE)
+        parser.add_argument("--cursor", help="resume after this event id")
+        parser.add_argument("--output", "-o", default="-", help="output file ('-' for stdout)")
+
+    def handle(self, *args, **opts):
+        try:
+            after = export.parse_cursor(opts["cursor"])
+            chunks = export.export_events(
+                get_events_collection(), opts["format"], opts["attendees"], after, opts["batch_size"], opts["gzip"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        started = time.monotonic()
+        written = 0
+        out = sys.stdout.buffer if opts["output"] == "-" else open(opts["output"], "wb")
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+            else:
+                out.flush()
+
+        if opts["output"] != "-":
+            self.stdout.write(self.style.SUCCESS(
+                f"Exported {written} bytes to {opts['output']} in {time.monotonic() - started:.1f}s"
+            ))
@@ -0,0 +1,196 @@
+import contextlib
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from events import importer, upcoming
+from my_events_backend.mongo import get_events_collection, is_standin
+
+
+class Command(BaseCommand):
+    help = (
+        "Import events from an NDJSON or CSV file: rows are validated with validate_event "
+        "on a process pool and written in batches (upsert on a natural key, or insert). "
+        "Progress is checkpointed, so re-running after a crash resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON (.ndjson/.jsonl) or CSV (.csv) file")
+        parser.add_argument("--format", choices=importer.FORMATS, help="input format (default: from extension)")
+        parser.add_argument("--mode", choices=("upsert", "insert"), default="upsert",
+                            help="upsert on --key (idempotent) or plain unordered insert_many")
+        parser.add_argument("--key", default="title,date",
+                            help="comma-separated natural key fields for upserts")
+        parser.add_argument("--created-by", default="", help="user id recorded as creator of new events")
+        parser.add_argument("--batch-size", type=int, default=1_000)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="validation processes")
+        parser.add_argument("--checkpoint", help="checkpoint file (default: <path>.checkpoint)")
+        parser.add_argument("--rejects", help="rejected rows as NDJSON (default: <path>.rejects.ndjson)")
+        parser.add_argument("--fresh", action="store_true", help="ignore an existing checkpoint")
+
+    def handle(self, *args, **opts):
+        path = opts["path"]
+        if not os.path.isfile(path):
+            raise CommandError(f"No such file: {path}")
+        if opts["batch_size"] < 1 or opts["workers"] < 1:
+            raise CommandError("--batch-size and --workers must be >= 1")
+
+        self.fmt = opts["format"] or importer.detect_format(path)
+        self.mode = opts["mode"]
+        self.key = [f.strip() for f in opts["key"].split(",") if f.strip()]
+        if self.mode == "upsert" and not self.key:
+            raise CommandError("--key needs at least one field")
+        self.created_by = opts["created_by"]
+        self.col = get_events_collection()
+        self.checkpoint_path = opts["checkpoint"] or path + ".checkpoint"
+        fingerprint = self._fingerprint(path)
+
+        resume_after = 0 if opts["fresh"] else self._load_checkpoint(fingerprint)
+        if resume_after:
+            self.stdout.write(f"Resuming after record {resume_after} (checkpoint {self.checkpoint_path})")
+        if self.mode == "upsert":
+            self.col.create_index([(f, 1) for f in self.key])
+
+        self.stats = {"read": 0, "inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0}
+        started = time.monotonic()
+        rejects_path = opts["rejects"] or path + ".rejects.ndjson"
+        with open(rejects_path, "a" if resume_after else "w", encoding="utf-8") as rejects:
+            for last, docs, rejected in self._validated(path, resume_after, opts["batch_size"], opts["workers"]):
+                rejected += self._write(docs)
+                for row in rejected:
+                    rejects.write(json.dumps(row, default=str) + "\n")
+                rejects.flush()
+                self.stats["rejected"] += len(rejected)
+                # Written in input order, so everything up to `last` is done
+                self._save_checkpoint(fingerprint, last)
+                self._progress(started)
+
+        upcoming.rebuild()
+        # No checkpoint was written if the input had no records
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.checkpoint_path)
+        s = self.stats
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {path}: {s['inserted']} inserted, {s['updated']} updated, {s['unchanged']} unchanged, "
+            f"{s['rejected']} rejected in {time.monotonic() - started:.1f}s"
+            + (f" (rejected rows in {rejects_path})" if s["rejected"] else "")
+        ))
+
+    def _validated(self, path: str, resume_after: int, batch_size: int, workers: int):
+        """
+        Yield (last record number, docs, rejects) per batch, in input order.
+
+        Validation runs on a process pool with a bounded number of batches in
+        flight, so memory does not grow with the file size.
+        """
+        records = (r for r in importer.read_records(path, self.fmt) if r[0] > resume_after)
+        # spawn: forking would copy the MongoClient and its monitor threads
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            in_flight = deque()
+            while True:
+                while len(in_flight) < workers * 2:
+                    batch = list(islice(records, batch_size))
+                    if not batch:
+                        break
+                    self.stats["read"] += len(batch)
+                    in_flight.append((batch[-1][0], pool.submit(importer.validate_batch, batch, self.fmt)))
+                if not in_flight:
+                    return
+                last, future = in_flight.popleft()
+                docs, rejected = future.result()
+                yield last, docs, rejected
+
+    def _write(self, docs) -> List[Dict[str, Any]]:
+        """
+        Write one batch; returns rows rejected by the database.
+        """
+        if not docs:
+            return []
+        if self.mode == "insert":
+            return self._insert(docs)
+
+        upserts = [
+            ({f: doc.get(f) for f in self.key},
+             {"$set": doc, "$setOnInsert": {"attendees": [], "created_by": self.created_by}})
+            for _, doc in docs
+        ]
+        if is_standin():
+            # The stand-in's bulk_write does not accept current pymongo operations
+            for filt, update in upserts:
+                res = self.col.update_one(filt, update, upsert=True)
+                self._count_upsert(1 if res.upserted_id is not None else 0, res.matched_count, res.modified_count)
+            return []
+        try:
+            res = self.col.bulk_write([UpdateOne(f, u, upsert=True) for f, u in upserts], ordered=False)
+            self._count_upsert(res.upserted_count, res.matched_count, res.modified_count)
+            return []
+        except BulkWriteError as e:
+            d = e.details
+            self._count_upsert(d.get("nUpserted", 0), d.get("nMatched", 0), d.get("nModified", 0))
+            return self._write_errors(docs, d)
+
+    def _insert(self, docs) -> List[Dict[str, Any]]:
+        payload = [dict(doc, attendees=[], created_by=self.created_by) for _, doc in docs]
+        try:
+            self.col.insert_many(payload, ordered=False)
+            self.stats["inserted"] += len(payload)
+            return []
+        except BulkWriteError as e:
+            self.stats["inserted"] += e.details.get("nInserted", 0)
+            return self._write_errors(docs, e.details)
+
+    @staticmethod
+    def _write_errors(docs, details) -> List[Dict[str, Any]]:
+        return [
+            {"record": docs[err["index"]][0], "error": err.get("errmsg", "write failed"), "row": docs[err["index"]][1]}
+            for err in details.get("writeErrors", [])
+        ]
+
+    def _count_upsert(self, upserted: int, matched: int, modified: int) -> None:
+        self.stats["inserted"] += upserted
+        self.stats["updated"] += modified
+        self.stats["unchanged"] += matched - modified
+
+    def _progress(self, started: float) -> None:
+        s = self.stats
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(
+            f"  read {s['read']}  inserted {s['inserted']}  updated {s['updated']}  "
+            f"rejected {s['rejected']}  ({s['read'] / elapsed:.0f} rows/s)"
+        )
+
+    @staticmethod
+    def _fingerprint(path: str) -> Dict[str, Any]:
+        st = os.stat(path)
+        return {"path": os.path.abspath(path), "size": st.st_size, "mtime": st.st_mtime}
+
+    def _load_checkpoint(self, fingerprint: Dict[str, Any]) -> int:
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            raise CommandError(f"Unreadable checkpoint {self.checkpoint_path}; use --fresh to start over")
+        if saved.get("input") != fingerprint:
+            raise CommandError(
+                f"Checkpoint {self.checkpoint_path} belongs to a different or modified file; use --fresh"
+            )
+        return int(saved.get("records", 0))
+
+    def _save_checkpoint(self, fingerprint: Dict[str, Any], records: int) -> None:
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"input": fingerprint, "records": records, "mode": self.mode}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint_path)
@@ -0,0 +1,21 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from my_events_backend import profiling
+
+
+class Command(BaseCommand):
+    help = (
+        "Print a signed token that profiles a request when sent as the X-Profile header "
+        "(or ?_profile=<token>). Profiles are written to PROFILING_DIR."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=profiling.MODES, default="sample",
+                            help="sample (low overhead) or trace (deterministic, slower)")
+
+    def handle(self, *args, **opts):
+        try:
+            self.stdout.write(profiling.make_token(opts["mode"]))
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
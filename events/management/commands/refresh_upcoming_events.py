@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events import upcoming
+
+
+class Command(BaseCommand):
+    help = (
+        "Fully rebuild the materialized upcoming-events view. Run periodically "
+        "(e.g. hourly from cron) so past events drop out and drift is repaired."
+    )
+
+    def handle(self, *args, **opts):
+        started = time.monotonic()
+        rows = upcoming.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Upcoming events view rebuilt: {rows} rows in {time.monotonic() - started:.2f}s"
+        ))
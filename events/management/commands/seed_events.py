@@ -0,0 +1,172 @@
+import hashlib
+import math
+import random
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+
+from bson import ObjectId
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from pymongo.errors import BulkWriteError
+
+from events import upcoming
+from events.models import to_mongo_event
+from my_events_backend.mongo import get_events_collection, get_users_collection
+
+# Fixed ObjectId timestamp so generated ids (and documents) depend only on the seed
+_ID_EPOCH = 1735689600  # 2025-01-01T00:00:00Z
+_KIND_USER = 0
+_KIND_EVENT = 1
+
+_TOPICS = ("Jazz", "Tech", "Yoga", "Wine", "Chess", "Film", "Poetry", "Startup", "Running", "Cooking")
+_FORMATS = ("night", "meetup", "workshop", "festival", "talk", "tasting", "marathon", "club")
+_FIRST_NAMES = ("Maria", "Nikos", "Eleni", "Giorgos", "Anna", "Dimitris", "Sofia", "Kostas")
+_LAST_NAMES = ("Papadopoulos", "Nikolaou", "Georgiou", "Ioannou", "Frydaki", "Vlachou")
+
+
+def seeded_id(seed_tag: bytes, kind: int, index: int) -> ObjectId:
+    """
+    Deterministic ObjectId for the index-th generated user/event of a seed.
+    """
+    return ObjectId(struct.pack(">IB3sI", _ID_EPOCH, kind, seed_tag, index))
+
+
+def _batch_rng(seed: int, kind: str, batch: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{batch}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed MongoDB with a deterministic synthetic dataset of users and events "
+        "(batched unordered insert_many with parallel writers)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=10_000)
+        parser.add_argument("--users", type=int, default=2_000)
+        parser.add_argument("--attendance-skew", choices=("zipf", "uniform"), default="zipf",
+                            help="distribution of attendees per event")
+        parser.add_argument("--zipf-s", type=float, default=1.1, help="zipf exponent (higher = more skewed)")
+        parser.add_argument("--max-attendees", type=int, default=5_000,
+                            help="attendees of the most popular event (capped at --users)")
+        parser.add_argument("--mean-attendees", type=int, default=20, help="mean attendees for uniform skew")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=1_000)
+        parser.add_argument("--workers", type=int, default=4, help="parallel insert_many writers")
+        parser.add_argument("--password", default="password", help="password shared by all seeded users")
+        parser.add_argument("--password-hash",
+                            help="precomputed Django password hash to store (skips hashing entirely)")
+        parser.add_argument("--drop", action="store_true", help="delete all users and events first")
+
+    def handle(self, *args, **opts):
+        n_users, n_events = opts["users"], opts["events"]
+        if n_users < 1 or n_events < 0:
+            raise CommandError("--users must be >= 1 and --events >= 0")
+        if opts["batch_size"] < 1 or opts["workers"] < 1:
+            raise CommandError("--batch-size and --workers must be >= 1")
+
+        self.seed = opts["seed"]
+        self.seed_tag = hashlib.sha256(str(self.seed).encode()).digest()[:3]
+        self.n_users = n_users
+        self.n_events = n_events
+        self.opts = opts
+        # One hash for every user: hashing per user would dominate runtime
+        self.password_hash = opts["password_hash"] or make_password(opts["password"], salt=f"seed{self.seed}")
+        self.max_attendees = min(opts["max_attendees"], n_users)
+        # Spread popular events over the whole set instead of the first ids
+        self.rank_step = self._coprime_step(n_events)
+
+        users_col = get_users_collection()
+        events_col = get_events_collection()
+        if opts["drop"]:
+            users_col.delete_many({})
+            events_col.delete_many({})
+        users_col.create_index("email", unique=True)
+
+        started = time.monotonic()
+        self._write("users", users_col, n_users, self._user_batch)
+        self._write("events", events_col, n_events, self._event_batch)
+        upcoming.rebuild()  # GETs never build the view
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {n_users} users and {n_events} events in {time.monotonic() - started:.1f}s (seed={self.seed})"
+        ))
+
+    def _write(self, label: str, col, total: int, make_batch) -> None:
+        batch_size = self.opts["batch_size"]
+        batches = math.ceil(total / batch_size)
+        inserted = skipped = done = 0
+
+        def write(batch: int):
+            docs = make_batch(batch, batch * batch_size, min(total, (batch + 1) * batch_size))
+            try:
+                return len(col.insert_many(docs, ordered=False).inserted_ids), 0
+            except BulkWriteError as e:
+                # Ids are deterministic, so re-running a seed skips what already exists
+                dupes = sum(1 for err in e.details.get("writeErrors", []) if err.get("code") == 11000)
+                if dupes != len(e.details.get("writeErrors", [])):
+                    raise
+                return e.details.get("nInserted", 0), dupes
+
+        with ThreadPoolExecutor(max_workers=self.opts["workers"]) as pool:
+            futures = [pool.submit(write, b) for b in range(batches)]
+            for future in as_completed(futures):
+                n_ok, n_skip = future.result()
+                inserted += n_ok
+                skipped += n_skip
+                done += 1
+                if done % 50 == 0 or done == batches:
+                    self.stdout.write(f"  {label}: {done}/{batches} batches")
+        self.stdout.write(f"{label}: inserted {inserted}, already present {skipped}")
+
+    def _user_batch(self, batch: int, start: int, stop: int):
+        rng = _batch_rng(self.seed, "users", batch)
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        docs = []
+        for i in range(start, stop):
+            # Same shape as users.models.to_mongo_user
+            docs.append({
+                "_id": seeded_id(self.seed_tag, _KIND_USER, i),
+                "email": f"user{i}@seed.example.com",
+                "password": self.password_hash,
+                "first_name": rng.choice(_FIRST_NAMES),
+                "last_name": rng.choice(_LAST_NAMES),
+                "created_at": base + timedelta(seconds=i),
+            })
+        return docs
+
+    def _event_batch(self, batch: int, start: int, stop: int):
+        rng = _batch_rng(self.seed, "events", batch)
+        first_day = date(2025, 1, 1)
+        docs = []
+        for i in range(start, stop):
+            topic, fmt = rng.choice(_TOPICS), rng.choice(_FORMATS)
+            doc = to_mongo_event({
+                "title": f"{topic} {fmt} #{i}",
+                "description": f"A {fmt} for {topic.lower()} lovers. " * rng.randint(1, 6),
+                "details": f"Doors open at {rng.randint(17, 21)}:00. " * rng.randint(1, 40),
+                "date": (first_day + timedelta(days=rng.randrange(730))).isoformat(),
+                "image": f"https://picsum.photos/seed/{self.seed}-{i}/800/600",
+            })
+            doc["_id"] = seeded_id(self.seed_tag, _KIND_EVENT, i)
+            doc["created_by"] = str(seeded_id(self.seed_tag, _KIND_USER, rng.randrange(self.n_users)))
+            doc["attendees"] = [
+                str(seeded_id(self.seed_tag, _KIND_USER, u))
+                for u in rng.sample(range(self.n_users), self._attendee_count(i, rng))
+            ]
+            docs.append(doc)
+        return docs
+
+    def _attendee_count(self, i: int, rng: random.Random) -> int:
+        if self.opts["attendance_skew"] == "uniform":
+            return min(self.n_users, rng.randint(0, 2 * self.opts["mean_attendees"]))
+        rank = (i * self.rank_step) % self.n_events + 1
+        return int(self.max_attendees / rank ** self.opts["zipf_s"])
+
+    @staticmethod
+    def _coprime_step(n: int) -> int:
+        step = 7919
+        while n and math.gcd(step, n) != 1:
+            step += 2
+        return step
@@ -1,11 +1,35 @@
 
 from datetime import datetime, date
-from typing import Dict, Any, Mapping, Optional
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Sequence, Tuple
 import re
 
+import bson
+
 MAX_TITLE_LENGTH = 200
 _ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
+# Public fields a client may select with ?fields= (name -> Mongo fields it needs)
+EVENT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "id": ("_id",),
+    "title": ("title",),
+    "description": ("description",),
+    "details": ("details",),
+    "date": ("date",),
+    "image": ("image",),
+    "image_detail": ("image_detail",),
+    "created_by": ("created_by",),
+    "attendees_count": ("attendees",),
+    "capacity": ("capacity",),
+    "waitlist_count": ("waitlist",),
+}
+
+# Default shapes for list and detail responses
+EVENT_LIST_FIELDS: Tuple[str, ...] = ("id", "title", "date", "image", "attendees_count")
+EVENT_DETAIL_FIELDS: Tuple[str, ...] = (
+    "id", "title", "date", "description", "image", "image_detail", "attendees_count", "capacity",
+)
+EVENT_ATTENDING_FIELDS: Tuple[str, ...] = ("id", "title", "date", "description", "image")
+
 
 def validate_event(d: Dict[str, Any], partial :bool =False) -> None:
     """
@@ -15,6 +39,8 @@ def validate_event(d: Dict[str, Any], partial :bool =False) -> None:
     -----
     - Ensures "title" exists and respects MAX_TITLE_LENGTH.
     - Ensures "date" exists and is a valid ISO calendar date (YYYY-MM-DD).
+    - "capacity" is optional: a positive integer, or null for unlimited.
+    - "waitlist" is optional: a boolean enabling the FIFO waitlist.
 
     Parameters
     ----------
@@ -34,12 +60,11 @@ def validate_event(d: Dict[str, Any], partial :bool =False) -> None:
     If validation fails (missing title, invalid date, etc.).
     """
     if (not partial) or ("title" in d):
-     title = str(d.get("title", "") or "").strip()
-    if not title:
-        raise ValueError("Title is required")
-    if len(title) > MAX_TITLE_LENGTH:
-        raise ValueError(f"Title max length is {MAX_TITLE_LENGTH}")
-    
+        title = str(d.get("title", "") or "").strip()
+        if not title:
+            raise ValueError("Title is required")
+        if len(title) > MAX_TITLE_LENGTH:
+            raise ValueError(f"Title max length is {MAX_TITLE_LENGTH}")
 
     if (not partial) or ("date" in d):
         if "date" not in d and not partial:
@@ -52,6 +77,39 @@ def validate_event(d: Dict[str, Any], partial :bool =False) -> None:
         except Exception:
             raise ValueError("Invalid calendar date (use real YYYY-MM-DD)")
 
+    if "capacity" in d:
+        parse_capacity(d["capacity"])
+    if "waitlist" in d:
+        parse_flag(d["waitlist"], "waitlist")
+
+
+def parse_capacity(value: Any) -> Optional[int]:
+    """
+    Parse a capacity from JSON (int/null) or form data (digits/"").
+
+    Raises
+    ------
+    ValueError
+    If the value is not a positive integer or empty.
+    """
+    if value is None or value == "":
+        return None
+    if type(value) is str and value.strip().isdigit():
+        value = int(value)
+    if type(value) is not int or value < 1:
+        raise ValueError("Capacity must be a positive integer or null")
+    return value
+
+
+def parse_flag(value: Any, name: str) -> bool:
+    """
+    Parse a boolean from JSON (true/false) or form data ("true"/"false"/"1"/"0").
+    """
+    if type(value) is bool:
+        return value
+    if type(value) is str and value.strip().lower() in ("true", "1", "false", "0", ""):
+        return value.strip().lower() in ("true", "1")
+    raise ValueError(f"{name} must be a boolean")
 
 
 def to_mongo_event(d: Mapping[str, Any], partial: bool = False) -> Dict[str, Any]:
@@ -88,6 +146,10 @@ def to_mongo_event(d: Mapping[str, Any], partial: bool = False) -> Dict[str, Any
         for k in fields:
             if k in d:
                 out[k] = clean(d.get(k))
+        if "capacity" in d:
+            out["capacity"] = parse_capacity(d["capacity"])
+        if "waitlist" in d:
+            out["waitlist_enabled"] = parse_flag(d["waitlist"], "waitlist")
         return out
 
     # full document (create)
@@ -97,6 +159,8 @@ def to_mongo_event(d: Mapping[str, Any], partial: bool = False) -> Dict[str, Any
         "details": clean(d.get("details")),
         "date": clean(d.get("date")),
         "image": clean(d.get("image")),
+        "capacity": parse_capacity(d.get("capacity")),
+        "waitlist_enabled": parse_flag(d.get("waitlist", False), "waitlist"),
         # "created_by": <to be set in the view using request.user_id>
     }
 
@@ -121,10 +185,21 @@ def event_to_public(event_doc: Mapping[str, Any]) -> Dict[str, Any]:
     dict
     Public-safe event dictionary ready for API responses.
     """
-    _id = event_doc.get("_id")
-    id_str: Optional[str] = str(_id) if _id is not None else None
+    out = EventRecord.public_from_bson(
+        event_doc, ("id", "title", "description", "details", "date", "image", "created_by")
+    )
+    attendees = event_doc.get("attendees")
+    out["attendees"] = [str(uid) for uid in attendees] if isinstance(attendees, list) else []
+    return out
+
+
+def _date_to_str(raw_date: Any) -> str:
+    """
+    Normalize a stored date (datetime/date/ISO string) to YYYY-MM-DD.
+    """
+    if type(raw_date) is str and "T" not in raw_date:
+        return raw_date.strip()  # common case: stored as YYYY-MM-DD
 
-    raw_date = event_doc.get("date")
     date_str = str(raw_date or "").strip()
 
     if isinstance(raw_date, datetime):
@@ -141,18 +216,284 @@ def event_to_public(event_doc: Mapping[str, Any]) -> Dict[str, Any]:
                 date_str = s
         else:
             date_str = s
+    return date_str
 
-    attendees = event_doc.get("attendees", [])
-    if not isinstance(attendees, list):
-        attendees = []
 
-    return {
-        "id": id_str,
-        "title": str(event_doc.get("title", "") or "").strip(),
-        "description": str(event_doc.get("description", "") or "").strip(),
-        "details": str(event_doc.get("details", "") or "").strip(),
-        "date": date_str,
-        "image": str(event_doc.get("image", "") or "").strip(),
-        "created_by": str(event_doc.get("created_by", "") or "").strip(),
-        "attendees": [str(uid) for uid in attendees],
-    }
+def _text(value: Any) -> str:
+    return value.strip() if type(value) is str else str(value or "").strip()
+
+
+class EventRecord:
+    """
+    Compact, normalized event built once from a MongoDB document.
+
+    Notes
+    -----
+    - Every view serializes events through this type (see to_public), so
+      there is one conversion path from BSON to API payloads.
+    - Text fields are stripped strings, "date" is YYYY-MM-DD, "id" is a string.
+    - "attendees" keeps the stored list as-is; ids are only stringified on demand.
+    - "capacity" is an int, or None for unlimited; "waitlist" is the FIFO queue
+      of user ids (see events.attendance).
+    - For uploaded images, "image" is the list thumbnail URL and "image_detail"
+      the detail one (see events.images); "image_detail" is "" otherwise.
+    - Picklable, so it can be stored in the events cache.
+    """
+
+    __slots__ = (
+        "id", "title", "description", "details", "date", "image", "created_by", "attendees", "image_detail",
+        "capacity", "waitlist",
+    )
+
+    def __init__(self, id: Optional[str], title: str = "", description: str = "", details: str = "",
+                 date: str = "", image: str = "", created_by: str = "", attendees: Optional[list] = None,
+                 image_detail: str = "", capacity: Optional[int] = None, waitlist: Optional[list] = None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.details = details
+        self.date = date
+        self.image = image
+        self.created_by = created_by
+        self.attendees = attendees if attendees is not None else []
+        self.image_detail = image_detail
+        self.capacity = capacity
+        self.waitlist = waitlist if waitlist is not None else []
+
+    @classmethod
+    def from_bson(cls, doc: Mapping[str, Any]) -> "EventRecord":
+        """
+        Build a record from an event document (full or projected).
+        """
+        get = doc.get
+        _id = get("_id")
+        attendees = get("attendees")
+        capacity = get("capacity")
+        waitlist = get("waitlist")
+        return cls(
+            str(_id) if _id is not None else None,
+            _text(get("title")),
+            _text(get("description")),
+            _text(get("details")),
+            _date_to_str(get("date")),
+            _text(get("image")),
+            _text(get("created_by")),
+            attendees if isinstance(attendees, list) else [],
+            _text(get("image_detail")),
+            capacity if isinstance(capacity, int) else None,
+            waitlist if isinstance(waitlist, list) else [],
+        )
+
+    @property
+    def attendees_count(self) -> int:
+        return len(self.attendees)
+
+    @property
+    def waitlist_count(self) -> int:
+        return len(self.waitlist)
+
+    def attendee_ids(self) -> List[str]:
+        """
+        Attendee user ids as strings.
+        """
+        return [str(uid) for uid in self.attendees]
+
+    def is_attending(self, user_id: Any) -> bool:
+        """
+        Return True if the given user id is in the attendee list.
+        """
+        uid = str(user_id)
+        return any(str(x) == uid for x in self.attendees)
+
+    def to_public(self, fields: Sequence[str] = EVENT_DETAIL_FIELDS) -> Dict[str, Any]:
+        """
+        Serialize the selected public fields (see EVENT_FIELDS) to a dict.
+        """
+        return {f: getattr(self, f) for f in fields}
+
+    @staticmethod
+    def public_from_bson(doc: Mapping[str, Any], fields: Sequence[str] = EVENT_DETAIL_FIELDS) -> Dict[str, Any]:
+        """
+        Serialize a document straight to its public dict.
+
+        Same result as from_bson(doc).to_public(fields), without building the
+        record; used for per-row list serialization.
+        """
+        get = doc.get
+        out: Dict[str, Any] = {}
+        for f in fields:
+            if f == "id":
+                _id = get("_id")
+                out[f] = str(_id) if _id is not None else None
+            elif f == "attendees_count":
+                attendees = get("attendees")
+                out[f] = len(attendees) if type(attendees) is list else 0
+            elif f == "date":
+                out[f] = _date_to_str(get("date"))
+            elif f == "capacity":
+                capacity = get("capacity")
+                out[f] = capacity if isinstance(capacity, int) else None
+            elif f == "waitlist_count":
+                waitlist = get("waitlist")
+                out[f] = len(waitlist) if type(waitlist) is list else 0
+            else:
+                value = get(f)
+                out[f] = value.strip() if type(value) is str else _text(value)
+        return out
+
+
+def parse_fields(raw: Optional[str], default: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Parse a ?fields= value into a tuple of whitelisted public field names.
+
+    Notes
+    -----
+    - "id" is always included.
+    - Order follows the request; duplicates are dropped.
+
+    Parameters
+    ----------
+    raw : str | None
+    Comma-separated field names (e.g. "title,date,attendees_count").
+    default : Sequence[str]
+    Fields to use when raw is missing or empty.
+
+    Returns
+    -------
+    tuple[str, ...]
+    Selected field names.
+
+    Raises
+    ------
+    ValueError
+    If a field is not in EVENT_FIELDS.
+    """
+    names = [f.strip() for f in (raw or "").split(",") if f.strip()]
+    if not names:
+        return tuple(default)
+
+    unknown = [f for f in names if f not in EVENT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    selected = ["id"]
+    for f in names:
+        if f not in selected:
+            selected.append(f)
+    return tuple(selected)
+
+
+def fields_to_projection(fields: Sequence[str]) -> Dict[str, int]:
+    """
+    Build the MongoDB projection that loads only what the given fields need.
+
+    Parameters
+    ----------
+    fields : Sequence[str]
+    Public field names (see EVENT_FIELDS).
+
+    Returns
+    -------
+    dict
+    Projection document for find()/find_one().
+    """
+    projection: Dict[str, int] = {"_id": 1}
+    for f in fields:
+        for mongo_field in EVENT_FIELDS[f]:
+            projection[mongo_field] = 1
+    return projection
+
+
+def event_to_fields(event_doc: Mapping[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Serialize a MongoDB event document to only the selected public fields.
+
+    Parameters
+    ----------
+    event_doc : Mapping[str, Any]
+    Event document, loaded with fields_to_projection(fields).
+    fields : Sequence[str]
+    Public field names (see EVENT_FIELDS).
+
+    Returns
+    -------
+    dict
+    Event payload with exactly the selected keys.
+    """
+    return EventRecord.public_from_bson(event_doc, fields)
+
+
+def fields_to_shaped_projection(fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Build a projection that makes MongoDB return rows already in public shape.
+
+    Notes
+    -----
+    - Requires MongoDB 4.4+ (aggregation expressions in find projections).
+    - "attendees_count" is computed server-side with $size, so attendee arrays
+      never leave the server; text is trimmed and missing fields default to "".
+    - Only "date" may still need normalizing (see shape_raw_batches).
+
+    Parameters
+    ----------
+    fields : Sequence[str]
+    Public field names (see EVENT_FIELDS).
+
+    Returns
+    -------
+    dict
+    Projection document for find()/find_raw_batches().
+    """
+    projection: Dict[str, Any] = {"_id": 0}
+    for f in fields:
+        if f == "id":
+            projection["id"] = {"$toString": "$_id"}
+        elif f == "attendees_count":
+            projection["attendees_count"] = {
+                "$cond": [{"$isArray": "$attendees"}, {"$size": "$attendees"}, 0]
+            }
+        elif f == "waitlist_count":
+            projection["waitlist_count"] = {
+                "$cond": [{"$isArray": "$waitlist"}, {"$size": "$waitlist"}, 0]
+            }
+        elif f == "capacity":
+            projection["capacity"] = {"$ifNull": ["$capacity", None]}
+        else:
+            # Same normalization as EventRecord: string, stripped, "" when missing
+            projection[f] = {"$trim": {"input": {"$toString": {"$ifNull": ["$" + f, ""]}}}}
+    return projection
+
+
+def shape_raw_batches(batches: Iterable[bytes], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Decode raw BSON batches (from find_raw_batches) into public event rows.
+
+    Notes
+    -----
+    - Expects documents produced with fields_to_shaped_projection(fields);
+      each decoded document is used as the output row, with no per-field copying.
+    - Whole batches are decoded in one C call (bson.decode_all).
+
+    Parameters
+    ----------
+    batches : Iterable[bytes]
+    Raw BSON batches.
+    fields : Sequence[str]
+    Public field names used to build the projection.
+
+    Returns
+    -------
+    list[dict]
+    Rows equal to event_to_fields(doc, fields) for each document.
+    """
+    rows: List[Dict[str, Any]] = []
+    fix_dates = "date" in fields
+    for batch in batches:
+        docs = bson.decode_all(batch)
+        if fix_dates:
+            for doc in docs:
+                doc["date"] = _date_to_str(doc.get("date"))
+        # The decoder allocates fresh key strings per document; re-keying onto
+        # the shared field names frees them once the batch is dropped
+        rows.extend([{f: doc[f] for f in fields} for doc in docs])
+    return rows
@@ -0,0 +1,307 @@
+import base64
+import json
+import math
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from bson import ObjectId
+
+from my_events_backend.mongo import is_standin
+from .models import event_to_fields, fields_to_projection, EVENT_LIST_FIELDS
+
+# Searchable fields and their relevance weights (title matches rank highest)
+SEARCH_WEIGHTS: Dict[str, int] = {"title": 10, "description": 3, "details": 1}
+TEXT_INDEX_NAME = "events_text"
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Any) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Parameters
+    ----------
+    text : Any
+        Raw field value.
+
+    Returns
+    -------
+    list[str]
+        Terms of at least two characters.
+    """
+    return [t for t in _TOKEN_RE.findall(str(text or "").lower()) if len(t) > 1]
+
+
+def encode_cursor(score: float, event_id: str) -> str:
+    """
+    Encode the position of the last returned hit as an opaque cursor token.
+    """
+    raw = json.dumps({"s": score, "id": event_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[float, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises
+    ------
+    ValueError
+        If the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        score, event_id = float(data["s"]), str(data["id"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not ObjectId.is_valid(event_id):
+        raise ValueError("Invalid cursor")
+    return score, event_id
+
+
+class InvertedIndex:
+    """
+    In-process inverted index over event text fields.
+
+    Notes
+    -----
+    - Used on the local stand-in, which has no MongoDB text search.
+    - Scores are weighted term frequency times inverse document frequency.
+    - Thread-safe; writers keep it current via index_event/unindex_event.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self.built = False
+
+    def build(self, docs: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Replace the index contents with the given event documents.
+        """
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            for doc in docs:
+                self._add(doc)
+            self.built = True
+
+    def add(self, doc: Mapping[str, Any]) -> None:
+        """
+        Insert or replace one event document in the index.
+        """
+        with self._lock:
+            self._remove(str(doc["_id"]))
+            self._add(doc)
+
+    def remove(self, event_id: str) -> None:
+        """
+        Drop one event from the index (no-op if absent).
+        """
+        with self._lock:
+            self._remove(str(event_id))
+
+    def search(self, query: str) -> List[Tuple[float, str]]:
+        """
+        Return (score, event_id) hits ordered by score desc, then id asc.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            total = len(self._doc_terms) or 1
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1.0 + total / len(postings))
+                for event_id, tf in postings.items():
+                    scores[event_id] = scores.get(event_id, 0.0) + tf * idf
+        hits = [(round(score, 6), event_id) for event_id, score in scores.items()]
+        hits.sort(key=lambda h: (-h[0], h[1]))
+        return hits
+
+    def _add(self, doc: Mapping[str, Any]) -> None:
+        event_id = str(doc["_id"])
+        weights: Dict[str, float] = {}
+        for field, weight in SEARCH_WEIGHTS.items():
+            for term in tokenize(doc.get(field)):
+                weights[term] = weights.get(term, 0.0) + weight
+        for term, tf in weights.items():
+            self._postings.setdefault(term, {})[event_id] = tf
+        self._doc_terms[event_id] = tuple(weights)
+
+    def _remove(self, event_id: str) -> None:
+        for term in self._doc_terms.pop(event_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(event_id, None)
+                if not postings:
+                    del self._postings[term]
+
+
+_index = InvertedIndex()
+_text_index_ready = False
+_text_index_lock = threading.Lock()
+
+
+def _use_text_index(col) -> bool:
+    """
+    Ensure the MongoDB text index exists (created once per process).
+
+    Returns
+    -------
+    bool
+        False when running on the stand-in, which has no text search.
+
+    Raises
+    ------
+    OperationFailure
+        If the index cannot be created; the next search tries again rather
+        than switching the process to the in-process fallback index.
+    """
+    global _text_index_ready
+    if is_standin():
+        return False
+    if not _text_index_ready:
+        with _text_index_lock:
+            if not _text_index_ready:
+                col.create_index(
+                    [(field, "text") for field in SEARCH_WEIGHTS],
+                    weights=SEARCH_WEIGHTS,
+                    name=TEXT_INDEX_NAME,
+                )
+                _text_index_ready = True
+    return True
+
+
+def ensure_text_index(col) -> bool:
+    """
+    Create the MongoDB text index if it is missing.
+
+    Returns
+    -------
+    bool
+        True if searches use the text index, False on the stand-in.
+
+    Raises
+    ------
+    OperationFailure
+        If the index cannot be created.
+    """
+    return _use_text_index(col)
+
+
+def index_event(doc: Optional[Mapping[str, Any]]) -> None:
+    """
+    Keep the fallback index current after an event is created or updated.
+    """
+    if doc is not None and _index.built:
+        _index.add(doc)
+
+
+def unindex_event(event_id: Any) -> None:
+    """
+    Keep the fallback index current after an event is deleted.
+    """
+    if _index.built:
+        _index.remove(str(event_id))
+
+
+def _row(doc: Mapping[str, Any], score: float) -> Dict[str, Any]:
+    row = event_to_fields(doc, EVENT_LIST_FIELDS)
+    row["score"] = score
+    return row
+
+
+_ROW_PROJECTION = fields_to_projection(EVENT_LIST_FIELDS)
+
+
+def _search_text_index(col, query: str, limit: int, after: Optional[Tuple[float, str]]) -> List[Dict[str, Any]]:
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"$text": {"$search": query}}},
+        {"$addFields": {"_score": {"$meta": "textScore"}}},
+    ]
+    if after is not None:
+        score, event_id = after
+        pipeline.append({"$match": {"$or": [
+            {"_score": {"$lt": score}},
+            {"_score": score, "_id": {"$gt": ObjectId(event_id)}},
+        ]}})
+    pipeline += [
+        {"$sort": {"_score": -1, "_id": 1}},
+        {"$limit": limit},
+        {"$project": dict(_ROW_PROJECTION, _score=1)},
+    ]
+    return [_row(doc, doc["_score"]) for doc in col.aggregate(pipeline)]
+
+
+def _search_inverted_index(col, query: str, limit: int, after: Optional[Tuple[float, str]]) -> List[Dict[str, Any]]:
+    if not _index.built:
+        _index.build(col.find({}, {"_id": 1, **{field: 1 for field in SEARCH_WEIGHTS}}))
+
+    hits = _index.search(query)
+    if after is not None:
+        score, event_id = after
+        hits = [h for h in hits if h[0] < score or (h[0] == score and h[1] > event_id)]
+    hits = hits[:limit]
+    if not hits:
+        return []
+
+    docs = {str(d["_id"]): d for d in col.find({"_id": {"$in": [ObjectId(h[1]) for h in hits]}}, _ROW_PROJECTION)}
+    return [_row(docs[event_id], score) for score, event_id in hits if event_id in docs]
+
+
+def search_events(col, query: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run a ranked full-text search over event title, description and details.
+
+    Notes
+    -----
+    - Uses the MongoDB text index; the in-process inverted index is only
+      used on the stand-in (it is per worker and misses other workers' writes).
+    - Results are ordered by relevance (score desc), ties broken by id.
+
+    Parameters
+    ----------
+    col : Collection
+        The events collection.
+    query : str
+        Search text.
+    limit : int, optional
+        Page size (clamped to MAX_PAGE_SIZE).
+    cursor : str, optional
+        Token from a previous page's "next".
+
+    Returns
+    -------
+    dict
+        {"results": [...], "next": <cursor or None>}
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed.
+    OperationFailure
+        If the text index cannot be created or queried.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    after = decode_cursor(cursor) if cursor else None
+
+    if _use_text_index(col):
+        results = _search_text_index(col, query, limit + 1, after)
+    else:
+        results = _search_inverted_index(col, query, limit + 1, after)
+
+    next_token = None
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        next_token = encode_cursor(last["score"], last["id"])
+    return {"results": results, "next": next_token}
@@ -0,0 +1,637 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest import mock
+
+import bson
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.uploadedfile import InMemoryUploadedFile, SimpleUploadedFile
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from my_events_backend import mongo
+from my_events_backend.auth import make_access_token
+from . import attendance, images, search, upcoming, views, write_behind
+from .models import EVENT_DETAIL_FIELDS, EVENT_LIST_FIELDS, event_to_fields, shape_raw_batches
+from .cache import cached_read, invalidate, invalidate_event
+from .management.commands.import_events import Command as ImportEventsCommand
+
+# Runs on the in-memory stand-in (mongomock, see requirements-dev.txt) unless
+# MONGODB_TEST_URI points at a real server
+TEST_MONGODB_URI = os.getenv("MONGODB_TEST_URI", mongo.STANDIN_SCHEME)
+
+USERS = 2000
+THREADS = 64
+
+
+class EventsCollectionTestCase(SimpleTestCase):
+    """
+    Runs each test against fresh, uniquely named events and upcoming collections.
+    """
+
+    def setUp(self):
+        name = f"events_test_{uuid.uuid4().hex}"
+        override = override_settings(
+            MONGODB_URI=TEST_MONGODB_URI, MONGODB_DB_NAME="my_events_test", MONGODB_EVENTS_COLLECTION=name,
+            MONGODB_UPCOMING_COLLECTION=f"{name}_upcoming",
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        mongo._client = mongo._db = None
+        upcoming._index_ready = False
+        cache.clear()
+        self.col = mongo.get_events_collection()
+        self.view = mongo.get_upcoming_collection()
+
+    def tearDown(self):
+        self.col.drop()
+        self.view.drop()
+        mongo._client = mongo._db = None
+
+    def _event(self, capacity, waitlist=False):
+        return self.col.insert_one({
+            "title": "Launch", "date": "2030-01-01", "attendees": [],
+            "capacity": capacity, "waitlist_enabled": waitlist,
+        }).inserted_id
+
+    def _run(self, fn, oid, user_ids):
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            return list(pool.map(lambda uid: fn(self.col, oid, uid)[0], user_ids))
+
+
+class ConcurrentTestCase(EventsCollectionTestCase):
+    """
+    Switches threads as often as possible to maximize interleaving.
+
+    On the stand-in every command runs under one lock (mongo._standin_lock),
+    so concurrent threads interleave between commands but never inside one.
+    Those runs check the compare-and-set logic of join/leave/promote, not
+    that it is atomic against a real server's concurrent updates. Set
+    MONGODB_TEST_URI (e.g. mongodb://localhost:27017) to run the same tests
+    against a real mongod for that.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self._switch = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self._switch)
+        super().tearDown()
+
+
+class CapacityConcurrencyTests(ConcurrentTestCase):
+    """
+    Thousands of concurrent attends against one capacity-limited event.
+    """
+
+    def test_concurrent_attends_never_overbook(self):
+        oid = self._event(capacity=50)
+        users = [str(ObjectId()) for _ in range(USERS)]
+
+        outcomes = self._run(attendance.join, oid, users)
+
+        attendees = self.col.find_one({"_id": oid})["attendees"]
+        self.assertEqual(outcomes.count(attendance.JOINED), 50)
+        self.assertEqual(outcomes.count(attendance.FULL), USERS - 50)
+        self.assertEqual(len(attendees), 50)
+        self.assertEqual(len(set(attendees)), 50)
+
+    def test_repeated_attends_by_same_users_join_once(self):
+        oid = self._event(capacity=None)
+        users = [str(ObjectId()) for _ in range(100)] * 10
+
+        outcomes = self._run(attendance.join, oid, users)
+
+        attendees = self.col.find_one({"_id": oid})["attendees"]
+        self.assertEqual(outcomes.count(attendance.JOINED), 100)
+        self.assertEqual(sorted(attendees), sorted(set(users)))
+
+    def test_waitlist_fills_in_order_and_promotes_fifo(self):
+        oid = self._event(capacity=50, waitlist=True)
+        users = [str(ObjectId()) for _ in range(USERS)]
+
+        outcomes = self._run(attendance.join, oid, users)
+
+        doc = self.col.find_one({"_id": oid})
+        self.assertEqual(outcomes.count(attendance.JOINED), 50)
+        self.assertEqual(outcomes.count(attendance.WAITLISTED), USERS - 50)
+        self.assertEqual(len(doc["attendees"]), 50)
+        self.assertEqual(len(set(doc["waitlist"])), USERS - 50)
+        self.assertFalse(set(doc["attendees"]) & set(doc["waitlist"]))
+
+        # Free 20 seats concurrently: the head of the queue takes them, in order
+        leaving = doc["attendees"][:20]
+        outcomes = self._run(attendance.leave, oid, leaving)
+
+        after = self.col.find_one({"_id": oid})
+        self.assertEqual(outcomes.count(attendance.LEFT), 20)
+        self.assertEqual(len(after["attendees"]), 50)
+        self.assertEqual(set(after["attendees"]), set(doc["attendees"][20:]) | set(doc["waitlist"][:20]))
+        self.assertEqual(after["waitlist"], doc["waitlist"][20:])
+
+
+class WriteBehindTests(ConcurrentTestCase):
+    """
+    The same guarantees with attends merged by the write-behind batcher.
+    """
+
+    @staticmethod
+    def _batched(kind):
+        return lambda col, oid, uid: write_behind.submit(kind, oid, uid)
+
+    def test_concurrent_batched_attends_never_overbook(self):
+        oid = self._event(capacity=50, waitlist=True)
+        users = [str(ObjectId()) for _ in range(USERS)]
+
+        outcomes = self._run(self._batched(write_behind.JOIN), oid, users)
+
+        doc = self.col.find_one({"_id": oid})
+        self.assertEqual(outcomes.count(attendance.JOINED), 50)
+        self.assertEqual(outcomes.count(attendance.WAITLISTED), USERS - 50)
+        self.assertEqual(len(set(doc["attendees"])), len(doc["attendees"]))
+        self.assertEqual(len(doc["attendees"]), 50)
+        self.assertEqual(len(set(doc["waitlist"])), USERS - 50)
+
+        leaving = doc["attendees"][:20]
+        outcomes = self._run(self._batched(write_behind.LEAVE), oid, leaving)
+
+        after = self.col.find_one({"_id": oid})
+        self.assertEqual(outcomes.count(attendance.LEFT), 20)
+        self.assertEqual(set(after["attendees"]), set(doc["attendees"][20:]) | set(doc["waitlist"][:20]))
+        self.assertEqual(after["waitlist"], doc["waitlist"][20:])
+
+    def test_operations_in_one_batch_apply_in_order(self):
+        oid = self._event(capacity=None)
+        user = str(ObjectId())
+        batcher = write_behind.AttendBatcher(interval=0.05, max_batch=100)
+
+        kinds = [write_behind.JOIN, write_behind.LEAVE, write_behind.JOIN, write_behind.JOIN, write_behind.LEAVE,
+                 write_behind.LEAVE]
+        futures = [batcher.submit(kind, oid, user) for kind in kinds]
+        outcomes = [f.result(timeout=5)[0] for f in futures]
+
+        self.assertEqual(outcomes, [
+            attendance.JOINED, attendance.LEFT, attendance.JOINED, attendance.ALREADY_ATTENDING,
+            attendance.LEFT, attendance.NOT_ATTENDING,
+        ])
+        self.assertEqual(self.col.find_one({"_id": oid})["attendees"], [])
+
+    def test_unknown_event_is_not_found(self):
+        batcher = write_behind.AttendBatcher(interval=0.001, max_batch=100)
+        outcome, added = batcher.submit(write_behind.JOIN, ObjectId(), str(ObjectId())).result(timeout=5)
+        self.assertEqual((outcome, added), (attendance.NOT_FOUND, []))
+
+    @override_settings(EVENTS_ATTEND_WRITE_BEHIND=True)
+    def test_timed_out_attend_is_accepted_and_replayed(self):
+        oid = self._event(capacity=None)
+        token = make_access_token(str(ObjectId()), "user@example.com")
+
+        def attend():
+            request = RequestFactory().post(
+                f"/events/{oid}/attend/", HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_IDEMPOTENCY_KEY="attend-1",
+            )
+            return views.attend_event_view(request, str(oid))
+
+        with mock.patch.object(write_behind, "submit", side_effect=TimeoutError) as submit:
+            first = attend()
+            retry = attend()
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(retry.status_code, 202)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(submit.call_count, 1)
+
+
+class CacheGenerationTests(SimpleTestCase):
+    """
+    Event-scoped invalidation leaves other cached reads alone.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidate_event_only_reloads_that_event(self):
+        loads = []
+
+        def loader(name):
+            return lambda: loads.append(name) or name
+
+        for _ in range(2):
+            cached_read("list", loader("list"))
+            cached_read("detail:a", loader("a"), event_id="a")
+            cached_read("detail:b", loader("b"), event_id="b")
+        self.assertEqual(loads, ["list", "a", "b"])
+
+        invalidate_event("a")
+        cached_read("list", loader("list"))
+        cached_read("detail:a", loader("a"), event_id="a")
+        cached_read("detail:b", loader("b"), event_id="b")
+        self.assertEqual(loads, ["list", "a", "b", "a"])
+
+        invalidate()
+        cached_read("list", loader("list"))
+        cached_read("detail:b", loader("b"), event_id="b")
+        self.assertEqual(loads, ["list", "a", "b", "a", "list", "b"])
+
+    def test_misses_load_from_the_primary(self):
+        modes = []
+        token = mongo.set_read_mode("secondaryPreferred")
+        try:
+            cached_read("list", lambda: modes.append(mongo._read_mode.get()))
+            invalidate()
+            cached_read("list", lambda: modes.append(mongo._read_mode.get()))
+            after = mongo._read_mode.get()
+        finally:
+            mongo.reset_read_mode(token)
+
+        self.assertEqual(modes, [None, None])
+        self.assertEqual(after, "secondaryPreferred")
+
+
+class ImageUploadTests(EventsCollectionTestCase):
+    """
+    Image uploads: size limit and ownership.
+    """
+
+    def _request(self, oid, user_id, data=b"\x89PNG"):
+        token = make_access_token(user_id, "user@example.com")
+        upload = SimpleUploadedFile("image.png", data, content_type="image/png")
+        return RequestFactory().post(
+            f"/events/{oid}/image/", {"image": upload}, HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+
+    def test_only_the_owner_may_replace_the_image(self):
+        owner = str(ObjectId())
+        oid = self.col.insert_one({"title": "Launch", "date": "2030-01-01", "created_by": owner,
+                                   "image": "https://example.com/a.png"}).inserted_id
+
+        request = self._request(oid, str(ObjectId()))
+        with mock.patch.object(images, "save_image") as save_image:
+            response = views.event_image_upload_view(request, str(oid))
+
+        self.assertEqual(response.status_code, 403)
+        save_image.assert_not_called()
+        self.assertEqual(self.col.find_one({"_id": oid})["image"], "https://example.com/a.png")
+
+    @override_settings(EVENT_IMAGE_MAX_BYTES=16)
+    def test_oversized_image_is_413_without_reading_it(self):
+        oid = ObjectId()
+        request = self._request(oid, str(ObjectId()), b"\x89PNG" + b"0" * 64)
+        with mock.patch.object(InMemoryUploadedFile, "read") as read:
+            response = views.event_image_upload_view(request, str(oid))
+
+        self.assertEqual(response.status_code, 413)
+        read.assert_not_called()
+
+
+class ExportTests(EventsCollectionTestCase):
+    """
+    Attendee ids are only exported for the caller's own events.
+    """
+
+    def _export(self, user_id, query):
+        token = make_access_token(user_id, "user@example.com")
+        request = RequestFactory().get("/events/export/", query, HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = views.events_export_view(request)
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_attendees_only_for_own_events(self):
+        owner, other = str(ObjectId()), str(ObjectId())
+        mine = self.col.insert_one({"title": "Mine", "date": "2030-01-01", "created_by": owner,
+                                    "attendees": [str(ObjectId())]}).inserted_id
+        self.col.insert_one({"title": "Theirs", "date": "2030-01-01", "created_by": other,
+                             "attendees": [str(ObjectId())]})
+
+        rows = self._export(owner, {"attendees": "true"})
+        self.assertEqual([row["id"] for row in rows], [str(mine)])
+        self.assertEqual(len(rows[0]["attendees"]), 1)
+
+        rows = self._export(owner, {})
+        self.assertEqual(len(rows), 2)
+        self.assertFalse(any("attendees" in row for row in rows))
+
+
+class ImportEventsTests(EventsCollectionTestCase):
+    """
+    manage.py import_events: empty input, rejects and resuming from a checkpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def _file(self, name, lines):
+        path = os.path.join(self.dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + ("\n" if lines else ""))
+        return path
+
+    def _import(self, path, *args):
+        out = io.StringIO()
+        call_command("import_events", path, "--workers", "1", *args, stdout=out)
+        return out.getvalue()
+
+    def test_empty_inputs_import_nothing(self):
+        for path in (
+            self._file("empty.ndjson", []),
+            self._file("blank.ndjson", ["", "   "]),
+            self._file("header.csv", ["title,date"]),
+        ):
+            out = self._import(path)
+            self.assertIn("0 inserted", out)
+            self.assertFalse(os.path.exists(path + ".checkpoint"))
+        self.assertEqual(self.col.count_documents({}), 0)
+
+    def test_rejected_rows_are_written(self):
+        path = self._file("events.ndjson", [
+            json.dumps({"title": "Launch", "date": "2030-01-01"}),
+            json.dumps({"title": "No date"}),
+            "{not json",
+        ])
+        out = self._import(path)
+
+        self.assertIn("1 inserted", out)
+        self.assertIn("2 rejected", out)
+        with open(path + ".rejects.ndjson", encoding="utf-8") as f:
+            rejects = [json.loads(line) for line in f]
+        self.assertEqual([r["record"] for r in rejects], [2, 3])
+        self.assertEqual(rejects[1]["row"], "{not json")
+
+    def test_resumes_after_checkpoint(self):
+        path = self._file("events.ndjson", [
+            json.dumps({"title": f"Event {n}", "date": "2030-01-01"}) for n in range(1, 6)
+        ])
+        command = ImportEventsCommand()
+        command.checkpoint_path = path + ".checkpoint"
+        command.mode = "upsert"
+        command._save_checkpoint(command._fingerprint(path), 3)
+
+        out = self._import(path)
+
+        self.assertIn("Resuming after record 3", out)
+        self.assertEqual(sorted(d["title"] for d in self.col.find()), ["Event 4", "Event 5"])
+        self.assertFalse(os.path.exists(path + ".checkpoint"))
+
+
+class EventDetailTests(EventsCollectionTestCase):
+    """
+    The cached detail holds public fields only; "attending" is looked up per request.
+    """
+
+    def _get(self, oid, user_id=None):
+        headers = {}
+        if user_id:
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {make_access_token(user_id, 'user@example.com')}"
+        request = RequestFactory().get(f"/events/{oid}/", **headers)
+        return json.loads(views.event_detail_view(request, str(oid)).content)
+
+    def test_attending_is_not_cached(self):
+        oid = self._event(capacity=None)
+        user = str(ObjectId())
+
+        self.assertEqual(self._get(oid, user)["attending"], False)
+        attendance.join(self.col, oid, user)  # no cache invalidation
+        data = self._get(oid, user)
+
+        self.assertEqual(data["attending"], True)
+        self.assertEqual(data["attendees_count"], 0)  # still the cached copy
+        self.assertNotIn("attending", self._get(oid))
+
+    def test_cache_entry_has_no_attendee_list(self):
+        oid = self.col.insert_one({"title": "Launch", "date": "2030-01-01",
+                                   "attendees": [str(ObjectId()) for _ in range(1000)]}).inserted_id
+        self._get(oid)
+
+        name = f"detail:{oid}:" + ",".join(EVENT_DETAIL_FIELDS)
+        cached = cached_read(name, lambda: self.fail("not cached"), event_id=str(oid))
+        self.assertEqual(cached["attendees_count"], 1000)
+        self.assertFalse(any(isinstance(v, list) for v in cached.values()))
+
+
+class EventListTests(EventsCollectionTestCase):
+    """
+    The raw BSON batch path of the events list returns the same rows as the dict path.
+    """
+
+    DOCS = [
+        {"_id": ObjectId(), "title": " Launch ", "date": datetime(2030, 1, 1, 18, 30), "image": "a.jpg",
+         "attendees": ["u1", "u2"], "capacity": 10},
+        {"_id": ObjectId(), "title": "Meetup", "date": "2030-02-01T10:00:00", "waitlist": ["u3"]},
+        {"_id": ObjectId(), "title": "Talk", "date": " 2030-03-01 ", "capacity": None},
+        {"_id": ObjectId(), "date": "2030-04-01"},
+    ]
+
+    def test_shaped_batches_match_event_to_fields(self):
+        # What fields_to_shaped_projection makes the server return; dates arrive raw
+        shaped = [dict(event_to_fields(d, EVENT_LIST_FIELDS), date=d["date"]) for d in self.DOCS]
+        batches = [b"".join(bson.encode(d) for d in shaped[:2]), b"".join(bson.encode(d) for d in shaped[2:])]
+
+        rows = shape_raw_batches(batches, EVENT_LIST_FIELDS)
+
+        expected = [event_to_fields(d, EVENT_LIST_FIELDS) for d in self.DOCS]
+        self.assertEqual(rows, expected)
+        self.assertEqual([list(r) for r in rows], [list(r) for r in expected])  # key order too
+
+    def test_raw_batch_list_matches_dict_list(self):
+        if mongo.is_standin():
+            self.skipTest("the stand-in has no find_raw_batches or expression projections")
+        self.col.insert_many([dict(d) for d in self.DOCS])
+
+        bodies = []
+        for raw in (True, False):
+            with self.settings(EVENTS_LIST_RAW_BATCHES=raw):
+                invalidate()
+                bodies.append(json.loads(views._cached_list(EVENT_LIST_FIELDS)))
+        self.assertEqual(bodies[0], bodies[1])
+        self.assertEqual(len(bodies[0]), len(self.DOCS))
+
+
+class UpcomingViewTests(EventsCollectionTestCase):
+    """
+    Incremental refresh, full rebuild and the read of the upcoming-events view.
+    """
+
+    def _insert(self, title, date, attendees=0):
+        return self.col.insert_one({
+            "title": f" {title} ", "date": date, "image": "", "attendees": [str(ObjectId()) for _ in range(attendees)],
+        }).inserted_id
+
+    def test_refresh_adds_updates_and_drops_rows(self):
+        oid = self._insert("Launch", "2030-01-01", attendees=2)
+        upcoming.refresh_event(oid)
+        self.assertEqual(upcoming.read_upcoming(), [
+            {"id": str(oid), "title": "Launch", "date": "2030-01-01", "image": "", "attendees_count": 2},
+        ])
+
+        upcoming.adjust_attendees(oid, 1)
+        self.assertEqual(upcoming.read_upcoming()[0]["attendees_count"], 3)
+
+        self.col.update_one({"_id": oid}, {"$set": {"date": "2000-01-01"}})
+        upcoming.refresh_event(oid)
+        self.assertEqual(self.view.count_documents({}), 0)
+
+    def test_rebuild_keeps_only_upcoming_sorted_by_date(self):
+        later = self._insert("Later", "2031-01-01")
+        sooner = self._insert("Sooner", "2030-01-01")
+        self._insert("Past", "2000-01-01")
+        self.view.insert_one({"_id": ObjectId(), "date": "2030-06-01", "title": "Gone", "_v": 0})
+
+        self.assertEqual(upcoming.rebuild(), 2)
+        self.assertEqual([r["id"] for r in upcoming.read_upcoming()], [str(sooner), str(later)])
+        self.assertEqual([r["id"] for r in upcoming.read_upcoming(limit=1)], [str(sooner)])
+
+    def test_rebuild_keeps_rows_refreshed_meanwhile(self):
+        # An event created after the rebuild read the events collection,
+        # written by its refresh_events() with a newer stamp
+        oid = ObjectId()
+        self.view.insert_one({"_id": oid, "date": "2030-01-01", "title": "Launch", "_v": time.time_ns() * 2})
+
+        upcoming.rebuild()
+        self.assertEqual(self.view.count_documents({"_id": oid}), 1)
+
+    def test_read_does_not_build_the_view(self):
+        self._insert("Launch", "2030-01-01")
+
+        self.assertEqual(upcoming.read_upcoming(), [])
+        self.assertEqual(upcoming.ensure_built(), 1)
+        self.assertEqual(len(upcoming.read_upcoming()), 1)
+
+    def test_read_is_covered_by_the_index(self):
+        if mongo.is_standin():
+            self.skipTest("the stand-in has no query planner")
+        upcoming.refresh_event(self._insert("Launch", "2030-01-01"))
+
+        plan = self.view.find({"date": {"$gte": "2030-01-01"}}, upcoming._ROW_PROJECTION) \
+            .sort(upcoming._ROW_INDEX[:2]).explain()
+        self.assertEqual(plan["executionStats"]["totalDocsExamined"], 0)
+
+
+class SearchTests(EventsCollectionTestCase):
+    """
+    Ranking and paging (text index on MongoDB, inverted index on the stand-in).
+    """
+
+    def setUp(self):
+        super().setUp()
+        search._index = search.InvertedIndex()
+        search._text_index_ready = False
+
+    def _insert(self, title, description=""):
+        doc = {"title": title, "description": description, "date": "2030-01-01", "attendees": []}
+        self.col.insert_one(doc)
+        return doc
+
+    def _search(self, query, limit=20, cursor=None):
+        return search.search_events(self.col, query, limit, cursor)
+
+    def test_title_matches_rank_first(self):
+        in_description = self._insert("Meetup", "A jazz evening")
+        in_title = self._insert("Jazz night")
+
+        ids = [row["id"] for row in self._search("jazz")["results"]]
+        self.assertEqual(ids, [str(in_title["_id"]), str(in_description["_id"])])
+
+    def test_cursor_pages_through_all_hits_once(self):
+        docs = [self._insert(f"Jazz {n}", "jazz " * (n % 3)) for n in range(7)]
+
+        seen, cursor = [], None
+        while True:
+            page = self._search("jazz", limit=3, cursor=cursor)
+            seen += [row["id"] for row in page["results"]]
+            cursor = page["next"]
+            if cursor is None:
+                break
+        self.assertEqual(sorted(seen), sorted(str(d["_id"]) for d in docs))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_writes_keep_the_fallback_index_current(self):
+        if not mongo.is_standin():
+            self.skipTest("the in-process index is only used on the stand-in")
+        doc = self._insert("Jazz night")
+        self.assertEqual(len(self._search("jazz")["results"]), 1)  # builds the index
+
+        self.col.update_one({"_id": doc["_id"]}, {"$set": {"title": "Blues night"}})
+        search.index_event(self.col.find_one({"_id": doc["_id"]}))
+        self.assertEqual(self._search("jazz")["results"], [])
+        self.assertEqual(len(self._search("blues")["results"]), 1)
+
+        search.unindex_event(doc["_id"])
+        self.assertEqual(self._search("blues")["results"], [])
+
+    def test_text_index_failure_is_503(self):
+        request = RequestFactory().get("/events/search/", {"q": "jazz"})
+        with mock.patch.object(search, "_use_text_index", side_effect=OperationFailure("index conflict")), \
+                self.assertLogs("events.views", "ERROR"):
+            response = views.search_events_view(request)
+
+        self.assertEqual(response.status_code, 503)
+
+
+class BulkCreateTests(EventsCollectionTestCase):
+    """
+    POST /events/bulk/ with per-item validation.
+    """
+
+    def _post(self, body, content_type="application/json"):
+        token = make_access_token(str(ObjectId()), "user@example.com")
+        request = RequestFactory().post(
+            "/events/bulk/", body, content_type=content_type, HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        response = views.bulk_create_events_view(request)
+        return response.status_code, json.loads(response.content)
+
+    def test_valid_items_are_created_and_invalid_reported(self):
+        status, data = self._post(json.dumps([
+            {"title": "Launch", "date": "2030-01-01"},
+            {"title": "No date"},
+            "not an object",
+            {"title": "Party", "date": "2030-02-30"},
+            {"title": "Party", "date": "2030-02-01"},
+        ]))
+
+        self.assertEqual(status, 200)
+        self.assertEqual((data["created"], data["failed"]), (2, 3))
+        self.assertEqual([r["index"] for r in data["results"]], [0, 1, 2, 3, 4])
+        self.assertEqual(["id" in r for r in data["results"]], [True, False, False, False, True])
+        self.assertEqual(self.col.count_documents({}), 2)
+
+    def test_ndjson_skips_blank_lines_and_reports_bad_ones(self):
+        body = "\n".join([
+            json.dumps({"title": "Launch", "date": "2030-01-01"}),
+            "",
+            "{not json",
+            "   ",
+            json.dumps({"title": "Party", "date": "2030-02-01"}),
+        ])
+        status, data = self._post(body, "application/x-ndjson")
+
+        self.assertEqual(status, 200)
+        self.assertEqual((data["created"], data["failed"]), (2, 1))
+        self.assertTrue(data["results"][1]["error"].startswith("Invalid JSON"))
+
+    def test_non_array_body_is_400(self):
+        status, data = self._post(json.dumps({"title": "Launch", "date": "2030-01-01"}))
+
+        self.assertEqual(status, 400)
+        self.assertEqual(self.col.count_documents({}), 0)
+
+    def test_created_events_reach_the_upcoming_view(self):
+        status, data = self._post(json.dumps([
+            {"title": "Launch", "date": "2030-01-01"},
+            {"title": "Past", "date": "2000-01-01"},
+        ]))
+
+        self.assertEqual(status, 200)
+        self.assertEqual([r["id"] for r in upcoming.read_upcoming()], [data["results"][0]["id"]])
@@ -0,0 +1,51 @@
+"""
+Thumbnail rendering, run in worker processes (see events.images).
+
+Kept free of Django and MongoDB imports so spawned workers start quickly.
+Requires Pillow.
+"""
+import io
+from typing import Dict, Tuple
+
+# Bounding boxes (width, height); aspect ratio is preserved
+THUMBNAIL_SIZES: Dict[str, Tuple[int, int]] = {
+    "list": (400, 300),
+    "detail": (1200, 900),
+}
+
+
+def render_thumbnails(data: bytes) -> Dict[str, bytes]:
+    """
+    Render every THUMBNAIL_SIZES variant of an image.
+
+    Notes
+    -----
+    - Output keeps the original format, so one content type serves all variants.
+    - Images already smaller than a box are re-encoded, never upscaled.
+
+    Parameters
+    ----------
+    data : bytes
+    Original image bytes.
+
+    Returns
+    -------
+    dict
+    Variant name -> encoded image bytes.
+    """
+    from PIL import Image, ImageOps
+
+    out: Dict[str, bytes] = {}
+    with Image.open(io.BytesIO(data)) as original:
+        fmt = original.format
+        # Apply EXIF rotation once so thumbnails are upright
+        source = ImageOps.exif_transpose(original)
+        if fmt == "JPEG" and source.mode not in ("RGB", "L"):
+            source = source.convert("RGB")
+        for variant, box in THUMBNAIL_SIZES.items():
+            img = source.copy()
+            img.thumbnail(box)
+            buf = io.BytesIO()
+            img.save(buf, format=fmt, optimize=True)
+            out[variant] = buf.getvalue()
+    return out
@@ -0,0 +1,185 @@
+import time
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from django.utils import timezone
+
+from my_events_backend.mongo import get_events_collection, get_upcoming_collection, is_standin
+from .models import EventRecord, EVENT_LIST_FIELDS
+
+# Fields of a materialized row, in index order (the landing read is a covered scan)
+_ROW_INDEX = [("date", 1), ("_id", 1), ("title", 1), ("image", 1), ("attendees_count", 1)]
+_ROW_PROJECTION = {"_id": 1, "date": 1, "title": 1, "image": 1, "attendees_count": 1}
+UPCOMING_INDEX_NAME = "upcoming_covered"
+
+# Server-side equivalent of the "date" formatting of EventRecord (models._date_to_str):
+# BSON dates and ISO datetime strings become YYYY-MM-DD, other values stripped strings
+_DATE_STRING = {"$trim": {"input": {"$toString": {"$ifNull": ["$date", ""]}}}}
+_ROW_DATE = {"$switch": {
+    "branches": [
+        {"case": {"$eq": [{"$type": "$date"}, "date"]},
+         "then": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}}},
+        {"case": {"$regexMatch": {"input": _DATE_STRING, "regex": r"^\d{4}-\d{2}-\d{2}T"}},
+         "then": {"$substrCP": [_DATE_STRING, 0, 10]}},
+    ],
+    "default": _DATE_STRING,
+}}
+
+_index_ready = False
+
+
+def _today() -> str:
+    return timezone.localdate().isoformat()
+
+
+def _ensure_index(view) -> None:
+    global _index_ready
+    if not _index_ready:
+        view.create_index(_ROW_INDEX, name=UPCOMING_INDEX_NAME)
+        _index_ready = True
+
+
+def ensure_index() -> None:
+    """
+    Create the covered index of the upcoming view if it is missing.
+    """
+    _ensure_index(get_upcoming_collection())
+
+
+def _merge_pipeline(match: Dict[str, Any], stamp: int) -> List[Dict[str, Any]]:
+    """
+    Aggregation that shapes matching events into list rows and $merges them.
+    """
+    view = get_upcoming_collection()
+    return [
+        {"$match": match},
+        {"$project": {
+            "_id": 1,
+            "date": _ROW_DATE,
+            "title": {"$trim": {"input": {"$toString": {"$ifNull": ["$title", ""]}}}},
+            "image": {"$trim": {"input": {"$toString": {"$ifNull": ["$image", ""]}}}},
+            "attendees_count": {"$cond": [{"$isArray": "$attendees"}, {"$size": "$attendees"}, 0]},
+            "_v": {"$literal": stamp},
+        }},
+        {"$merge": {"into": view.name, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+def _materialize(match: Dict[str, Any], stamp: int) -> None:
+    """
+    Write shaped rows for events matching `match` into the view.
+
+    Uses $merge on MongoDB; the stand-in has no $merge, so rows are shaped
+    with EventRecord and upserted one by one.
+    """
+    if not is_standin():
+        get_events_collection().aggregate(_merge_pipeline(match, stamp))
+        return
+
+    view = get_upcoming_collection()
+    projection = {"_id": 1, "date": 1, "title": 1, "image": 1, "attendees": 1}
+    for doc in get_events_collection().find(match, projection):
+        row = EventRecord.public_from_bson(doc, EVENT_LIST_FIELDS)
+        del row["id"]
+        row["_v"] = stamp
+        view.replace_one({"_id": doc["_id"]}, row, upsert=True)
+
+
+def refresh_event(oid: ObjectId) -> None:
+    """
+    Incrementally refresh one event's row after it was created or updated.
+
+    Notes
+    -----
+    - Events dated in the past (or deleted) lose their row.
+    """
+    refresh_events([oid])
+
+
+def refresh_events(oids: List[ObjectId]) -> None:
+    """
+    Refresh the rows of several events at once (e.g. after a bulk insert).
+    """
+    view = get_upcoming_collection()
+    _ensure_index(view)
+    stamp = time.time_ns()
+    _materialize({"_id": {"$in": oids}, "date": {"$gte": _today()}}, stamp)
+    # No fresh row was written: the event is gone or no longer upcoming
+    view.delete_many({"_id": {"$in": oids}, "_v": {"$ne": stamp}})
+
+
+def adjust_attendees(oid: ObjectId, delta: int) -> None:
+    """
+    Apply an attend (+1) / unattend (-1) to the event's row without re-shaping it.
+
+    Notes
+    -----
+    - Not ordered with a concurrent refresh/rebuild: a re-shaped row that
+      counted attendees before this change can replace the row after the
+      $inc, so the count may be off until the event's next refresh or the
+      next rebuild (manage.py refresh_upcoming_events).
+    """
+    get_upcoming_collection().update_one({"_id": oid}, {"$inc": {"attendees_count": delta}})
+
+
+def remove_event(oid: ObjectId) -> None:
+    """
+    Drop a deleted event's row.
+    """
+    get_upcoming_collection().delete_one({"_id": oid})
+
+
+def rebuild() -> int:
+    """
+    Fully rebuild the view: re-shape all upcoming events and drop stale rows.
+
+    Returns
+    -------
+    int
+        Number of rows in the view afterwards.
+    """
+    view = get_upcoming_collection()
+    _ensure_index(view)
+    stamp = time.time_ns()
+    _materialize({"date": {"$gte": _today()}}, stamp)
+    # Rows refreshed concurrently carry a newer stamp and are kept
+    view.delete_many({"_v": {"$lt": stamp}})
+    return view.count_documents({})
+
+
+def ensure_built() -> int:
+    """
+    Build the view if it is empty (startup warm-up, see events.apps).
+
+    Returns
+    -------
+    int
+        Number of rows in the view.
+    """
+    view = get_upcoming_collection()
+    if view.estimated_document_count() == 0:
+        return rebuild()
+    return view.count_documents({})
+
+
+def read_upcoming(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Read the landing list: upcoming events sorted by date, in list-row shape.
+
+    Notes
+    -----
+    - A covered index scan over small pre-shaped rows; rows whose date has
+      passed since the last rebuild are filtered out here.
+    - Never writes: the view is built by the startup warm-up (ensure_built)
+      and manage.py refresh_upcoming_events; until then this returns [].
+    """
+    cursor = get_upcoming_collection().find({"date": {"$gte": _today()}}, _ROW_PROJECTION).sort(_ROW_INDEX[:2])
+    if limit:
+        cursor = cursor.limit(limit)
+    return [{
+        "id": str(row["_id"]),
+        "title": row.get("title", ""),
+        "date": row.get("date", ""),
+        "image": row.get("image", ""),
+        "attendees_count": row.get("attendees_count", 0),
+    } for row in cursor]
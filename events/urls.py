@@ -5,12 +5,36 @@ urlpatterns = [
     # List (GET) + Create (POST)
     path("", views.events_view, name="events-list-create"),
 
+    # Bulk create from a JSON array or NDJSON (POST)
+    path("bulk/", views.bulk_create_events_view, name="events-bulk-create"),
+
+    # Streaming NDJSON/CSV export (GET)
+    path("export/", views.events_export_view, name="events-export"),
+
+    # Upcoming events landing list (GET)
+    path("upcoming/", views.upcoming_events_view, name="events-upcoming"),
+
+    # Stored event images and thumbnails (GET)
+    path("images/<str:key>/<str:variant>/", views.event_image_view, name="event-image"),
+
+    # Live attendee counts as Server-Sent Events (GET, ASGI only)
+    path("live/", views.events_live_view, name="events-live"),
+
+    # Full-text search (GET)
+    path("search/", views.search_events_view, name="events-search"),
+
     # Retrieve (GET) + Update (PUT) + Delete (DELETE)
     path("<str:event_id>/", views.event_detail_view, name="event-detail"),
 
+    # Upload an event image (POST multipart)
+    path("<str:event_id>/image/", views.event_image_upload_view, name="event-image-upload"),
+
     # Attend an event (POST)
     path("<str:event_id>/attend/", views.attend_event_view, name="event-attend"),
 
+    # Attendee roster, owner only (GET)
+    path("<str:event_id>/attendees/", views.event_attendees_view, name="event-attendees"),
+
     # Unattend an event (POST)
     path("<str:event_id>/unattend/", views.unattend_event_view, name="event-unattend"),
 ]
@@ -1,11 +1,116 @@
 import json
+import logging
 from bson import ObjectId
-from django.http import JsonResponse, HttpRequest, HttpResponse
+from pymongo.errors import OperationFailure, BulkWriteError
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, HttpRequest, HttpResponse, FileResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_http_methods, condition
 
-from my_events_backend.mongo import get_events_collection
+from my_events_backend.mongo import (
+    get_events_collection, get_users_collection, is_standin, set_read_mode, reset_read_mode, UNAVAILABLE_ERRORS,
+)
 from my_events_backend.auth import require_jwt, optional_jwt
+from my_events_backend.idempotency import idempotent
+from .models import (
+    parse_fields, fields_to_projection, event_to_fields, EVENT_LIST_FIELDS, EVENT_DETAIL_FIELDS,
+    fields_to_shaped_projection, shape_raw_batches, EventRecord, validate_event, to_mongo_event, parse_flag,
+)
+from .cache import cached_read, invalidate, invalidate_event, served_stale
+from .search import search_events, index_event, unindex_event, DEFAULT_PAGE_SIZE
+from . import upcoming, images, attendance, write_behind, export, live
+from users.models import user_to_public
+
+ROSTER_PAGE_SIZE = 50
+ROSTER_MAX_PAGE_SIZE = 500
+# Cache lifetime of a thumbnail URL that is still serving the original
+IMAGE_PENDING_MAX_AGE = 60
+
+logger = logging.getLogger(__name__)
+
+
+def _sync_upcoming(action, *args) -> None:
+    """
+    Apply an incremental change to the upcoming-events view.
+
+    A failure here must not fail the write that triggered it; the periodic
+    rebuild (manage.py refresh_upcoming_events) repairs the view.
+    """
+    try:
+        action(*args)
+    except Exception:
+        logger.exception("Upcoming events view update failed")
+
+
+def _mark_stale(response: HttpResponse) -> HttpResponse:
+    """
+    Flag a response served from the last-known-good cache while MongoDB is
+    unavailable (see events.cache.cached_read).
+    """
+    if served_stale():
+        response["Warning"] = '110 - "Response is Stale"'
+    return response
+
+
+def _change_attendance(kind: str, col, oid: ObjectId, user_id: str):
+    """
+    Join or leave an event, directly or through the write-behind batcher.
+
+    Returns
+    -------
+    tuple
+    (outcome, added, synced) where outcome/added are as in events.attendance
+    and synced is True if the upcoming view was already adjusted. outcome is
+    write_behind.PENDING if a batched change was not applied within
+    EVENTS_ATTEND_TIMEOUT (it stays queued).
+    """
+    if write_behind.enabled():
+        try:
+            return write_behind.submit(kind, oid, user_id) + (True,)
+        except TimeoutError:
+            return write_behind.PENDING, [], True
+    action = attendance.join if kind == write_behind.JOIN else attendance.leave
+    return action(col, oid, user_id) + (False,)
+
+
+def _image_too_large(upload) -> JsonResponse | None:
+    """
+    413 response if an uploaded image exceeds EVENT_IMAGE_MAX_BYTES.
+
+    Checked on the upload's size, before its content is read into memory.
+    """
+    if upload is not None and upload.size > images.max_bytes():
+        return JsonResponse({"error": f"Image max size is {images.max_bytes()} bytes"}, status=413)
+    return None
+
+
+def _is_attending(oid: ObjectId, user_id: str) -> bool:
+    """
+    Return True if the user attends the event.
+
+    Not cached (one indexed lookup per request) and read from the primary,
+    so the caller sees their own attend/unattend right away.
+    """
+    ids = [str(user_id)] + ([ObjectId(user_id)] if ObjectId.is_valid(str(user_id)) else [])
+    token = set_read_mode(None)
+    try:
+        return get_events_collection().count_documents({"_id": oid, "attendees": {"$in": ids}}, limit=1) > 0
+    finally:
+        reset_read_mode(token)
+
+
+def _list_fast_path_enabled() -> bool:
+    """
+    Return True if the events list may use the raw BSON batch path.
+
+    The stand-in has no find_raw_batches/expression projections, so it always
+    uses the regular dict path.
+    """
+    return getattr(settings, "EVENTS_LIST_RAW_BATCHES", True) and not is_standin()
 
 
 def _is_json(request: HttpRequest) -> bool:
@@ -15,6 +120,60 @@ def _is_json(request: HttpRequest) -> bool:
     return (request.content_type or "").split(";")[0].strip() == "application/json"
 
 
+def _is_ndjson(request: HttpRequest) -> bool:
+    """
+    Return True if Content-Type is newline-delimited JSON.
+    """
+    return (request.content_type or "").split(";")[0].strip() in ("application/x-ndjson", "application/jsonl")
+
+
+def _is_multipart(request: HttpRequest) -> bool:
+    """
+    Return True if Content-Type is multipart/form-data.
+    """
+    return (request.content_type or "").split(";")[0].strip() == "multipart/form-data"
+
+
+def _cached_list(fields) -> bytes:
+    """
+    JSON body of the events list with the given fields, through the read cache.
+    """
+    def load() -> bytes:
+        col = get_events_collection()
+        events = None
+        if _list_fast_path_enabled():
+            try:
+                batches = col.find_raw_batches({}, fields_to_shaped_projection(fields)).sort("date", 1)
+                events = shape_raw_batches(batches, fields)
+            except OperationFailure:
+                events = None  # server too old for expression projections
+        if events is None:
+            cursor = col.find({}, fields_to_projection(fields)).sort("date", 1)
+            events = [event_to_fields(doc, fields) for doc in cursor]
+        return json.dumps(events, cls=DjangoJSONEncoder).encode("utf-8")
+
+    return cached_read("list:" + ",".join(fields), load)
+
+
+def _cached_upcoming(limit: int) -> bytes:
+    """
+    JSON body of the upcoming events list (limit 0 = all), through the read cache.
+    """
+    def load() -> bytes:
+        return json.dumps(upcoming.read_upcoming(limit or None), cls=DjangoJSONEncoder).encode("utf-8")
+
+    return cached_read(f"upcoming:{limit}", load)
+
+
+def prime_read_cache() -> None:
+    """
+    Load the default events list and the upcoming list into the read cache
+    (startup warm-up, see my_events_backend.warmup).
+    """
+    _cached_list(parse_fields(None, EVENT_LIST_FIELDS))
+    _cached_upcoming(0)
+
+
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
 def events_view(request: HttpRequest) -> JsonResponse:
@@ -24,6 +183,9 @@ def events_view(request: HttpRequest) -> JsonResponse:
     GET
     ---
     Public endpoint. Returns all events sorted by date.
+    Optional ?fields=title,date,... selects the returned fields (see EVENT_FIELDS).
+    Served through the events read cache (see events.cache.cached_read); while
+    MongoDB is unavailable the last-known-good copy is served with a Warning header.
 
     POST
     ----
@@ -41,23 +203,17 @@ def events_view(request: HttpRequest) -> JsonResponse:
         200 OK: List of events (GET).
         201 Created: Created event (POST).
         415 Unsupported Media Type: If Content-Type is not JSON.
-        400 Bad Request: For validation or other errors.
+        400 Bad Request: For validation or other errors (including unknown fields).
+        503 Service Unavailable: MongoDB is down and nothing is cached (GET); see Retry-After.
     """
-    col = get_events_collection()
-
     if request.method == "GET":
-        cursor = col.find({}, {"_id": 1, "title": 1, "date": 1, "image": 1, "attendees": 1}).sort("date", 1)
-        events = []
-        for doc in cursor:
-            attendees = doc.get("attendees", [])
-            events.append({
-                "id": str(doc["_id"]),
-                "title": doc.get("title", ""),
-                "date": doc.get("date", ""),
-                "image": doc.get("image", ""),
-                "attendees_count": len(attendees) if isinstance(attendees, list) else 0,
-            })
-        return JsonResponse(events, safe=False, status=200)
+        try:
+            fields = parse_fields(request.GET.get("fields"), EVENT_LIST_FIELDS)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        body = _cached_list(fields)
+        return _mark_stale(HttpResponse(body, content_type="application/json", status=200))
 
     # POST → create event (protected)
     return create_event(request)
@@ -65,6 +221,7 @@ def events_view(request: HttpRequest) -> JsonResponse:
 
 @require_http_methods(["POST"])
 @require_jwt
+@idempotent
 def create_event(request: HttpRequest) -> JsonResponse:
     """
     Create a new event.
@@ -72,6 +229,12 @@ def create_event(request: HttpRequest) -> JsonResponse:
     POST
     ----
     Protected endpoint. Requires JWT token.
+    Accepts JSON, or multipart/form-data with the same fields plus an
+    optional "image" file (stored and thumbnailed, see events.images).
+    Optional "capacity" (positive int or null) and "waitlist" (bool).
+
+    Retries with the same Idempotency-Key header get the first response
+    replayed (see my_events_backend.idempotency).
 
     Parameters
     ----------
@@ -82,14 +245,23 @@ def create_event(request: HttpRequest) -> JsonResponse:
     -------
     JsonResponse
         201 Created: Created event.
-        415 Unsupported Media Type: If Content-Type is not JSON.
+        413 Content Too Large: Image larger than EVENT_IMAGE_MAX_BYTES.
+        415 Unsupported Media Type: If Content-Type is not JSON or multipart.
         400 Bad Request: For validation or other errors.
     """
-    if not _is_json(request):
-        return JsonResponse({"error": "Content-Type must be application/json"}, status=415)
+    upload = None
+    if _is_multipart(request):
+        data = request.POST
+        upload = request.FILES.get("image")
+    elif not _is_json(request):
+        return JsonResponse({"error": "Content-Type must be application/json or multipart/form-data"}, status=415)
+    too_large = _image_too_large(upload)
+    if too_large:
+        return too_large
 
     try:
-        data = json.loads(request.body.decode("utf-8") or "{}")
+        if not _is_multipart(request):
+            data = json.loads(request.body.decode("utf-8") or "{}")
         title = (data.get("title") or "").strip()
         date = (data.get("date") or "").strip()
         description = (data.get("description") or "").strip()
@@ -98,6 +270,9 @@ def create_event(request: HttpRequest) -> JsonResponse:
         if not title or not date:
             return JsonResponse({"error": "title and date are required"}, status=400)
 
+        limits = {k: data[k] for k in ("capacity", "waitlist") if k in data}
+        validate_event(limits, partial=True)
+
         col = get_events_collection()
         doc = {
             "title": title,
@@ -106,25 +281,148 @@ def create_event(request: HttpRequest) -> JsonResponse:
             "image": image,
             "attendees": [],
             "created_by": str(getattr(request, "user_id", "")),
+            **to_mongo_event(limits, partial=True),
         }
+        if upload is not None:
+            doc.update(images.save_image(upload.read()))
         res = col.insert_one(doc)
         saved = col.find_one({"_id": res.inserted_id})
+        index_event(saved)
+        _sync_upcoming(upcoming.refresh_event, res.inserted_id)
+        invalidate()
 
-        return JsonResponse({
-            "id": str(saved["_id"]),
-            "title": saved.get("title", ""),
-            "date": saved.get("date", ""),
-            "description": saved.get("description", ""),
-            "image": saved.get("image", ""),
-            "attendees_count": 0,
-        }, status=201)
+        return JsonResponse(EventRecord.from_bson(saved).to_public(EVENT_DETAIL_FIELDS), status=201)
 
+    except UNAVAILABLE_ERRORS:
+        raise  # 503 from DatabaseAvailabilityMiddleware
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
 
+def _parse_bulk_items(request: HttpRequest) -> list:
+    """
+    Read bulk items from a JSON array or NDJSON body.
+
+    Returns a list with one entry per item: the decoded value, or a
+    ValueError for an NDJSON line that is not valid JSON.
+
+    Raises
+    ------
+    ValueError
+    If a JSON body is not an array.
+    """
+    body = request.body.decode("utf-8")
+    if _is_ndjson(request):
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(ValueError(f"Invalid JSON: {e}"))
+        return items
+
+    items = json.loads(body or "[]")
+    if not isinstance(items, list):
+        raise ValueError("Body must be a JSON array of events")
+    return items
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@require_jwt
+@idempotent
+def bulk_create_events_view(request: HttpRequest) -> JsonResponse:
+    """
+    Create many events in one request.
+
+    POST
+    ----
+    Protected endpoint. Requires JWT token.
+    Body is a JSON array of events, or NDJSON (application/x-ndjson) with
+    one event per line. Each item is validated with validate_event and
+    converted with to_mongo_event; valid items are written with a single
+    unordered insert_many, so one bad item does not block the others.
+
+    Retries with the same Idempotency-Key header get the first response
+    replayed (see my_events_backend.idempotency).
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Django request object.
+
+    Returns
+    -------
+    JsonResponse
+        200 OK: { "created": int, "failed": int, "results": [
+                  {"index": int, "id": str} | {"index": int, "error": str}, ...] }
+        400 Bad Request: Body is not a JSON array or has too many items.
+        415 Unsupported Media Type: If Content-Type is not JSON or NDJSON.
+    """
+    if not (_is_json(request) or _is_ndjson(request)):
+        return JsonResponse({"error": "Content-Type must be application/json or application/x-ndjson"}, status=415)
+
+    try:
+        items = _parse_bulk_items(request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    max_items = getattr(settings, "EVENTS_BULK_MAX_ITEMS", 1000)
+    if len(items) > max_items:
+        return JsonResponse({"error": f"At most {max_items} events per request"}, status=400)
+
+    created_by = str(getattr(request, "user_id", ""))
+    results = [None] * len(items)
+    docs, positions = [], []
+    for i, item in enumerate(items):
+        try:
+            if isinstance(item, ValueError):
+                raise item
+            if not isinstance(item, dict):
+                raise ValueError("Event must be a JSON object")
+            validate_event(item)
+            doc = to_mongo_event(item)
+        except ValueError as e:
+            results[i] = {"index": i, "error": str(e)}
+            continue
+        doc["attendees"] = []
+        doc["created_by"] = created_by
+        docs.append(doc)
+        positions.append(i)
+
+    inserted = []
+    if docs:
+        col = get_events_collection()
+        failed_at = {}
+        try:
+            col.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            failed_at = {err["index"]: err.get("errmsg", "Insert failed") for err in e.details.get("writeErrors", [])}
+        for n, (i, doc) in enumerate(zip(positions, docs)):
+            if n in failed_at:
+                results[i] = {"index": i, "error": failed_at[n]}
+            else:
+                results[i] = {"index": i, "id": str(doc["_id"])}
+                inserted.append(doc)
+
+    if inserted:
+        for doc in inserted:
+            index_event(doc)
+        _sync_upcoming(upcoming.refresh_events, [doc["_id"] for doc in inserted])
+        invalidate()
+
+    return JsonResponse({
+        "created": len(inserted),
+        "failed": len(items) - len(inserted),
+        "results": results,
+    }, status=200)
+
+
 @csrf_exempt
 @require_http_methods(["GET", "PUT", "DELETE"])
+@optional_jwt
 def event_detail_view(request: HttpRequest, event_id: str) -> JsonResponse:
     """
     Retrieve, update or delete a single event.
@@ -132,7 +430,11 @@ def event_detail_view(request: HttpRequest, event_id: str) -> JsonResponse:
     GET
     ---
     Public endpoint. Returns one event by ID.
-    If Authorization (JWT) is present & valid, adds `attending: true/false`.
+    Optional ?fields=title,date,... selects the returned fields (see EVENT_FIELDS).
+    Served through the events read cache (see events.cache.cached_read); while
+    MongoDB is unavailable the last-known-good copy is served with a Warning header.
+    If Authorization (JWT) is present & valid, adds `attending: true/false`
+    (looked up per request, not cached; left out while MongoDB is unavailable).
 
     PUT
     ---
@@ -153,49 +455,44 @@ def event_detail_view(request: HttpRequest, event_id: str) -> JsonResponse:
     -------
     JsonResponse
         200 OK: Event payload (with attendees_count, and attending if JWT).
-        400 Bad Request: Invalid ID.
+        400 Bad Request: Invalid ID or unknown fields.
         404 Not Found: If event does not exist.
         415 Unsupported Media Type: If Content-Type is not JSON (PUT).
+        503 Service Unavailable: MongoDB is down and nothing is cached (GET); see Retry-After.
     """
     if not ObjectId.is_valid(event_id):
         return JsonResponse({"error": "Invalid event id"}, status=400)
 
-    col = get_events_collection()
     oid = ObjectId(event_id)
 
     if request.method == "GET":
-        doc = col.find_one({"_id": oid})
-        if not doc:
-            return JsonResponse({"error": "Not found"}, status=404)
+        try:
+            fields = parse_fields(request.GET.get("fields"), EVENT_DETAIL_FIELDS)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
 
-        raw_attendees = doc.get("attendees") or []
-        if not isinstance(raw_attendees, list):
-            raw_attendees = []
-        attendees = [str(x) for x in raw_attendees]
-
-        data = {
-            "id": str(doc["_id"]),
-            "title": doc.get("title", ""),
-            "date": doc.get("date", ""),
-            "description": doc.get("description", ""),
-            "image": doc.get("image", ""),
-            "attendees_count": len(attendees),
-        }
+        def load():
+            # Only the public fields are cached, not the attendee list
+            doc = get_events_collection().find_one({"_id": oid}, fields_to_projection(fields))
+            return EventRecord.public_from_bson(doc, fields) if doc else None
 
-        try:
-            if optional_jwt:
-                user = optional_jwt(request)  # expected dict with "id"
-                if user and user.get("id"):
-                    data["attending"] = str(user["id"]) in attendees
-        except Exception:
-            pass
+        data = cached_read(f"detail:{event_id}:" + ",".join(fields), load, event_id=event_id)
+        if data is None:
+            return _mark_stale(JsonResponse({"error": "Not found"}, status=404))
+
+        data = dict(data)
+        user_id = getattr(request, "user_id", None)
+        if user_id and not served_stale():
+            try:
+                data["attending"] = _is_attending(oid, user_id)
+            except UNAVAILABLE_ERRORS:
+                pass  # served from the last-known-good copy without "attending"
 
-        return JsonResponse(data, status=200)
+        return _mark_stale(JsonResponse(data, status=200))
 
     if request.method == "PUT":
         return update_event(request, oid)
 
-    return delete_event(request, oid)
     # DELETE
     return delete_event(request, oid)
 
@@ -209,6 +506,8 @@ def update_event(request: HttpRequest, oid: ObjectId) -> JsonResponse:
     PUT
     ---
     Protected endpoint. Requires JWT token.
+    Updatable: title, date, description, image, capacity, waitlist.
+    Raising capacity promotes waitlisted users into the new seats.
 
     Parameters
     ----------
@@ -234,26 +533,34 @@ def update_event(request: HttpRequest, oid: ObjectId) -> JsonResponse:
         for k in ("title", "date", "description", "image"):
             if k in data:
                 updates[k] = (data[k] or "").strip()
+        limits = {k: data[k] for k in ("capacity", "waitlist") if k in data}
+        validate_event(limits, partial=True)
+        updates.update(to_mongo_event(limits, partial=True))
 
         if not updates:
             return JsonResponse({"error": "No fields to update"}, status=400)
 
+        update = {"$set": updates}
+        if "image" in updates:
+            # A plain URL replaces any uploaded image and its thumbnails
+            update["$unset"] = {"image_detail": "", "image_key": ""}
+
         col = get_events_collection()
-        col.update_one({"_id": oid}, {"$set": updates})
+        col.update_one({"_id": oid}, update)
+        if "capacity" in updates:
+            # A raised capacity admits waitlisted users right away
+            attendance.promote(col, oid)
         doc = col.find_one({"_id": oid})
         if not doc:
             return JsonResponse({"error": "Not found"}, status=404)
+        index_event(doc)
+        _sync_upcoming(upcoming.refresh_event, oid)
+        invalidate()
 
-        attendees = [str(x) for x in (doc.get("attendees") or []) if isinstance(doc.get("attendees"), list)]
-        return JsonResponse({
-            "id": str(doc["_id"]),
-            "title": doc.get("title", ""),
-            "date": doc.get("date", ""),
-            "description": doc.get("description", ""),
-            "image": doc.get("image", ""),
-            "attendees_count": len(attendees),
-        }, status=200)
+        return JsonResponse(EventRecord.from_bson(doc).to_public(EVENT_DETAIL_FIELDS), status=200)
 
+    except UNAVAILABLE_ERRORS:
+        raise  # 503 from DatabaseAvailabilityMiddleware
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
@@ -282,12 +589,238 @@ def delete_event(request: HttpRequest, oid: ObjectId) -> HttpResponse:
     """
     col = get_events_collection()
     col.delete_one({"_id": oid})
+    unindex_event(oid)
+    _sync_upcoming(upcoming.remove_event, oid)
+    invalidate()
+    live.publish(oid, None)
     return HttpResponse(status=204)
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
 @require_jwt
+def event_image_upload_view(request: HttpRequest, event_id: str) -> JsonResponse:
+    """
+    Upload or replace an event's image.
+
+    POST
+    ----
+    Protected endpoint. Requires JWT token; only the event owner may call it.
+    multipart/form-data with an "image" file (JPEG, PNG, GIF or WebP).
+    The original is stored and list/detail thumbnails are rendered in the
+    background; "image" and "image_detail" point at the thumbnails.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Django request object.
+    event_id : str
+        Mongo ObjectId.
+
+    Returns
+    -------
+    JsonResponse
+        200 OK: Updated event.
+        400 Bad Request: Invalid ID, missing file or unsupported image.
+        403 Forbidden: Caller is not the event owner.
+        404 Not Found: Event not found.
+        413 Content Too Large: Image larger than EVENT_IMAGE_MAX_BYTES.
+        415 Unsupported Media Type: If Content-Type is not multipart/form-data.
+    """
+    if not ObjectId.is_valid(event_id):
+        return JsonResponse({"error": "Invalid event id"}, status=400)
+    if not _is_multipart(request):
+        return JsonResponse({"error": "Content-Type must be multipart/form-data"}, status=415)
+
+    upload = request.FILES.get("image")
+    if upload is None:
+        return JsonResponse({"error": "image file is required"}, status=400)
+    too_large = _image_too_large(upload)
+    if too_large:
+        return too_large
+
+    col = get_events_collection()
+    oid = ObjectId(event_id)
+    event = col.find_one({"_id": oid}, {"created_by": 1})
+    if not event:
+        return JsonResponse({"error": "Not found"}, status=404)
+    if str(event.get("created_by", "")) != str(getattr(request, "user_id", "")):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+
+    try:
+        fields = images.save_image(upload.read())
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    col.update_one({"_id": oid}, {"$set": fields})
+    doc = col.find_one({"_id": oid})
+    if not doc:
+        return JsonResponse({"error": "Not found"}, status=404)
+    _sync_upcoming(upcoming.refresh_event, oid)
+    invalidate()
+
+    return JsonResponse(EventRecord.from_bson(doc).to_public(EVENT_DETAIL_FIELDS), status=200)
+
+
+def _image_etag(request: HttpRequest, key: str, variant: str):
+    """
+    ETag of the file currently served for an image variant (None if missing).
+    """
+    if variant not in images.VARIANTS or not images.is_valid_key(key):
+        return None
+    path, _ = images.resolve_variant(key, variant)
+    if path is None:
+        return None
+    return f"{key}-{path.rsplit('/', 1)[1]}"
+
+
+@require_http_methods(["GET", "HEAD"])
+@condition(etag_func=_image_etag)
+def event_image_view(request: HttpRequest, key: str, variant: str) -> HttpResponse:
+    """
+    Serve a stored event image (original, list or detail thumbnail).
+
+    GET
+    ---
+    Public endpoint. URLs are content-addressed, so a served thumbnail is
+    cached for EVENT_IMAGE_CACHE_SECONDS as immutable. While a thumbnail is
+    still being rendered the original is served with a short max-age.
+    Honors If-None-Match (304).
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Django request object.
+    key : str
+        Image key (from the event's image URLs).
+    variant : str
+        "original", "list" or "detail".
+
+    Returns
+    -------
+    HttpResponse
+        200 OK: Image bytes with ETag and Cache-Control.
+        304 Not Modified: ETag matches.
+        404 Not Found: Unknown image or variant.
+    """
+    if variant not in images.VARIANTS or not images.is_valid_key(key):
+        return JsonResponse({"error": "Not found"}, status=404)
+    path, final = images.resolve_variant(key, variant)
+    if path is None:
+        return JsonResponse({"error": "Not found"}, status=404)
+
+    f = default_storage.open(path, "rb")
+    content_type = images.sniff_content_type(f.read(12))
+    f.seek(0)
+    response = FileResponse(f, content_type=content_type)
+    if final:
+        max_age = getattr(settings, "EVENT_IMAGE_CACHE_SECONDS", 365 * 24 * 3600)
+        patch_cache_control(response, public=True, max_age=max_age, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=IMAGE_PENDING_MAX_AGE)
+    return response
+
+
+@require_http_methods(["GET"])
+def search_events_view(request: HttpRequest) -> JsonResponse:
+    """
+    Full-text search over events.
+
+    GET
+    ---
+    Public endpoint. Searches title, description and details.
+    Query params: q (required), limit (optional), cursor (optional, from "next").
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Django request object.
+
+    Returns
+    -------
+    JsonResponse
+        200 OK: {"results": [...], "next": <cursor or null>}, ranked by relevance.
+        400 Bad Request: Missing query, bad limit or invalid cursor.
+        503 Service Unavailable: The MongoDB text index cannot be created or queried.
+    """
+    query = (request.GET.get("q") or "").strip()
+    if not query:
+        return JsonResponse({"error": "q is required"}, status=400)
+
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer"}, status=400)
+
+    try:
+        page = search_events(get_events_collection(), query, limit, request.GET.get("cursor"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except OperationFailure:
+        # e.g. another text index already exists on the events collection
+        logger.exception("Text search failed")
+        return JsonResponse({"error": "Search is unavailable, try again later"}, status=503)
+
+    return JsonResponse(page, status=200)
+
+
+@require_http_methods(["GET"])
+@require_jwt
+def events_export_view(request: HttpRequest) -> HttpResponse:
+    """
+    Stream all events for analytics.
+
+    GET
+    ---
+    Protected endpoint. Requires JWT token.
+    Streams every event in id order straight from a MongoDB cursor (see
+    events.export), with constant memory.
+    Query params: format (ndjson | csv, default ndjson), attendees (bool,
+    include attendee ids), gzip (bool), batch_size (cursor batch size),
+    cursor (resume after this event id: the "id" of the last row received).
+    With attendees, only the caller's own events are exported, as for the
+    attendee roster; the full export is `manage.py export_events`.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Django request object.
+
+    Returns
+    -------
+    HttpResponse
+        200 OK: Streamed NDJSON/CSV attachment (application/gzip if gzip).
+        400 Bad Request: Invalid format, flag, batch size or cursor.
+    """
+    fmt = request.GET.get("format", "ndjson")
+    try:
+        attendees = parse_flag(request.GET.get("attendees", ""), "attendees")
+        gzip = parse_flag(request.GET.get("gzip", ""), "gzip")
+        batch_size = request.GET.get("batch_size", str(export.DEFAULT_BATCH_SIZE))
+        if not batch_size.isdigit():
+            raise ValueError("batch_size must be a positive integer")
+        batch_size = int(batch_size)
+        after = export.parse_cursor(request.GET.get("cursor"))
+        owner = str(getattr(request, "user_id", "")) if attendees else None
+        chunks = export.export_events(
+            get_events_collection(), fmt, attendees, after, batch_size, gzip, created_by=owner,
+        )
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    filename = f"events.{fmt}" + (".gz" if gzip else "")
+    response = StreamingHttpResponse(
+        chunks, content_type="application/gzip" if gzip else export.CONTENT_TYPES[fmt],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@require_jwt
+@idempotent
 def attend_event_view(request: HttpRequest, event_id: str) -> JsonResponse:
     """
     Attend an event.
@@ -295,7 +828,16 @@ def attend_event_view(request: HttpRequest, event_id: str) -> JsonResponse:
     POST
     ----
     Protected endpoint. Requires JWT token.
-    Adds the authenticated user to the event's attendee list.
+    Adds the authenticated user to the event's attendee list, enforcing
+    the event's capacity atomically (see events.attendance). When the event
+    is full and has a waitlist, the user is queued instead.
+    With EVENTS_ATTEND_WRITE_BEHIND, the change is batched with concurrent
+    attends (see events.write_behind).
+    Only this event's cached detail is invalidated; cached lists show the
+    new count once their entry expires (EVENTS_CACHE_TTL).
+
+    Retries with the same Idempotency-Key header get the first response
+    replayed (see my_events_backend.idempotency).
 
     Parameters
     ----------
@@ -308,9 +850,13 @@ def attend_event_view(request: HttpRequest, event_id: str) -> JsonResponse:
     -------
     JsonResponse
         200 OK: { "message": "Joined", "attendees_count": int }
+        202 Accepted: { "message": "Waitlisted", "position": int }, or
+                      { "message": "Pending" } if a write-behind change is
+                      still queued after EVENTS_ATTEND_TIMEOUT (a retry with
+                      the same Idempotency-Key replays this response).
         400 Bad Request: Invalid ID.
         404 Not Found: Event not found.
-        409 Conflict: Already attending.
+        409 Conflict: Already attending, already waitlisted, or event full.
     """
     if not ObjectId.is_valid(event_id):
         return JsonResponse({"error": "Invalid event id"}, status=400)
@@ -319,21 +865,36 @@ def attend_event_view(request: HttpRequest, event_id: str) -> JsonResponse:
     col = get_events_collection()
     oid = ObjectId(event_id)
 
-    doc = col.find_one({"_id": oid}, {"_id": 1, "attendees": 1})
-    if not doc:
-        return JsonResponse({"error": "Not found"}, status=404)
+    outcome, added, synced = _change_attendance(write_behind.JOIN, col, oid, user_id)
+    if outcome == write_behind.PENDING:
+        return JsonResponse({"message": "Pending"}, status=202)
+    if added:
+        if not synced:
+            _sync_upcoming(upcoming.adjust_attendees, oid, len(added))
+        invalidate_event(event_id)
 
-    res = col.update_one({"_id": oid}, {"$addToSet": {"attendees": user_id}})
-    if res.modified_count == 0:
+    if outcome == attendance.NOT_FOUND:
+        return JsonResponse({"error": "Not found"}, status=404)
+    if outcome == attendance.ALREADY_ATTENDING:
         return JsonResponse({"error": "Already attending"}, status=409)
+    if outcome == attendance.ALREADY_WAITLISTED:
+        return JsonResponse({"error": "Already on the waitlist"}, status=409)
+    if outcome == attendance.FULL:
+        return JsonResponse({"error": "Event is full"}, status=409)
+    if outcome == attendance.WAITLISTED:
+        position = attendance.waitlist_position(col, oid, user_id)
+        return JsonResponse({"message": "Waitlisted", "position": position}, status=202)
 
     fresh = col.find_one({"_id": oid}, {"attendees": 1})
-    return JsonResponse({"message": "Joined", "attendees_count": len(fresh.get("attendees", []))}, status=200)
+    count = len(fresh.get("attendees", []))
+    live.publish(oid, count)
+    return JsonResponse({"message": "Joined", "attendees_count": count}, status=200)
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
 @require_jwt
+@idempotent
 def unattend_event_view(request: HttpRequest, event_id: str) -> JsonResponse:
     """
     Unattend an event.
@@ -341,7 +902,12 @@ def unattend_event_view(request: HttpRequest, event_id: str) -> JsonResponse:
     POST
     ----
     Protected endpoint. Requires JWT token.
-    Removes the authenticated user from the event's attendee list.
+    Removes the authenticated user from the event's attendee list (the
+    freed seat goes to the head of the waitlist), or from the waitlist.
+    Only this event's cached detail is invalidated, as for attend.
+
+    Retries with the same Idempotency-Key header get the first response
+    replayed (see my_events_backend.idempotency).
 
     Parameters
     ----------
@@ -353,7 +919,8 @@ def unattend_event_view(request: HttpRequest, event_id: str) -> JsonResponse:
     Returns
     -------
     JsonResponse
-        200 OK: { "message": "Left", "attendees_count": int }
+        200 OK: { "message": "Left" | "Left waitlist", "attendees_count": int }
+        202 Accepted: { "message": "Pending" }, as for attend.
         400 Bad Request: Invalid ID.
         404 Not Found: Event not found.
         409 Conflict: Not attending.
@@ -365,13 +932,164 @@ def unattend_event_view(request: HttpRequest, event_id: str) -> JsonResponse:
     col = get_events_collection()
     oid = ObjectId(event_id)
 
-    doc = col.find_one({"_id": oid}, {"_id": 1, "attendees": 1})
-    if not doc:
+    outcome, promoted, synced = _change_attendance(write_behind.LEAVE, col, oid, user_id)
+    if outcome == write_behind.PENDING:
+        return JsonResponse({"message": "Pending"}, status=202)
+    if outcome == attendance.NOT_FOUND:
         return JsonResponse({"error": "Not found"}, status=404)
-
-    res = col.update_one({"_id": oid}, {"$pull": {"attendees": user_id}})
-    if res.modified_count == 0:
+    if outcome == attendance.NOT_ATTENDING:
         return JsonResponse({"error": "Not attending"}, status=409)
 
+    delta = len(promoted) - (1 if outcome == attendance.LEFT else 0)
+    if delta and not synced:
+        _sync_upcoming(upcoming.adjust_attendees, oid, delta)
+    invalidate_event(event_id)
+    message = "Left" if outcome == attendance.LEFT else "Left waitlist"
+
     fresh = col.find_one({"_id": oid}, {"attendees": 1})
-    return JsonResponse({"message": "Left", "attendees_count": len(fresh.get("attendees", []))}, status=200)
+    count = len(fresh.get("attendees", []))
+    live.publish(oid, count)
+    return JsonResponse({"message": message, "attendees_count": count}, status=200)
+
+
+@require_http_methods(["GET"])
+def upcoming_events_view(request: HttpRequest) -> HttpResponse:
+    """
+    Landing list of upcoming events.
+
+    GET
+    ---
+    Public endpoint. Returns events dated today or later, sorted by date,
+    in the list shape (id, title, date, image, attendees_count).
+    Read from the materialized view in events.upcoming.
+    Query params: limit (optional).
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Django request object.
+
+    Returns
+    -------
+    HttpResponse
+        200 OK: JSON list of events.
+        400 Bad Request: Invalid limit.
+        503 Service Unavailable: MongoDB is down and nothing is cached (GET); see Retry-After.
+    """
+    try:
+        limit = int(request.GET.get("limit") or 0)
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer"}, status=400)
+    if limit < 0:
+        return JsonResponse({"error": "limit must be >= 0"}, status=400)
+
+    body = _cached_upcoming(limit)
+    return _mark_stale(HttpResponse(body, content_type="application/json", status=200))
+
+
+@require_http_methods(["GET"])
+async def events_live_view(request: HttpRequest) -> HttpResponse:
+    """
+    Stream live attendee counts as Server-Sent Events.
+
+    GET
+    ---
+    Public endpoint, served by the ASGI app (my_events_backend.asgi) only:
+    under WSGI every open stream would hold a worker thread.
+    Query params: ids (comma-separated event ids, required).
+    Sends the current counts, then `event: attendees` with
+    {"id", "attendees_count"} on every change and `event: deleted` with
+    {"id"} when an event is removed (see events.live).
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Django request object.
+
+    Returns
+    -------
+    HttpResponse
+        200 OK: text/event-stream.
+        400 Bad Request: Missing, invalid or too many ids.
+        501 Not Implemented: Not running under ASGI.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "Live updates are only served by the ASGI app"}, status=501)
+    try:
+        ids = live.parse_ids(request.GET.get("ids"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    response = StreamingHttpResponse(live.stream(ids), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # stop nginx from buffering the stream
+    return response
+
+
+@require_http_methods(["GET"])
+@require_jwt
+def event_attendees_view(request: HttpRequest, event_id: str) -> JsonResponse:
+    """
+    List the attendees of an event, one page at a time.
+
+    GET
+    ---
+    Protected endpoint. Requires JWT token; only the event owner may call it.
+    Query params: limit (optional), cursor (optional, from "next").
+    Loads only the requested slice of the attendee ids and resolves it with
+    a single $in query against users, so cost is bounded by the page size.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Django request object.
+    event_id : str
+        Mongo ObjectId.
+
+    Returns
+    -------
+    JsonResponse
+        200 OK: {"attendees": [<public_user>, ...], "next": <cursor or null>}
+        400 Bad Request: Invalid ID, limit or cursor.
+        403 Forbidden: Caller is not the event owner.
+        404 Not Found: Event not found.
+    """
+    if not ObjectId.is_valid(event_id):
+        return JsonResponse({"error": "Invalid event id"}, status=400)
+
+    try:
+        limit = int(request.GET.get("limit", ROSTER_PAGE_SIZE))
+        offset = int(request.GET.get("cursor") or 0)
+    except ValueError:
+        return JsonResponse({"error": "limit and cursor must be integers"}, status=400)
+    if offset < 0:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
+    limit = max(1, min(limit, ROSTER_MAX_PAGE_SIZE))
+
+    col = get_events_collection()
+    # Fetch one extra id to know whether another page exists
+    doc = col.find_one(
+        {"_id": ObjectId(event_id)},
+        {"created_by": 1, "attendees": {"$slice": [offset, limit + 1]}},
+    )
+    if not doc:
+        return JsonResponse({"error": "Not found"}, status=404)
+    if str(doc.get("created_by", "")) != str(getattr(request, "user_id", "")):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+
+    page_ids = doc.get("attendees") or []
+    if not isinstance(page_ids, list):
+        page_ids = []
+    has_more = len(page_ids) > limit
+    page_ids = [str(x) for x in page_ids[:limit]]
+
+    oids = [ObjectId(x) for x in page_ids if ObjectId.is_valid(x)]
+    users = {}
+    if oids:
+        for user in get_users_collection().find({"_id": {"$in": oids}}, {"password": 0}):
+            users[str(user["_id"])] = user_to_public(user)
+
+    return JsonResponse({
+        "attendees": [users[x] for x in page_ids if x in users],
+        "next": str(offset + limit) if has_more else None,
+    }, status=200)
@@ -0,0 +1,376 @@
+"""
+Write-behind batching for attend/unattend (opt-in: EVENTS_ATTEND_WRITE_BEHIND).
+
+Requests enqueue their operation and wait; a per-process flusher thread
+collects operations for EVENTS_ATTEND_FLUSH_MS, merges those on the same
+event into one conditional update and sends the updates for all events in
+one bulk_write. Callers get the same (outcome, added) results as
+events.attendance.join/leave, so responses keep their 404/409 semantics.
+
+Notes
+-----
+- Merged updates are compare-and-swap: the filter pins the attendee and
+  waitlist sizes, capacity and membership observed when the batch was
+  planned. If another process changed the event meanwhile, the update
+  matches nothing and the batch is re-planned from fresh state.
+- Operations of one user on one event are applied in arrival order.
+- The upcoming-events view is adjusted once per merged update here, so
+  views must not adjust it again for batched operations.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from django.conf import settings
+from pymongo import UpdateOne
+
+from my_events_backend.mongo import get_events_collection, is_standin
+from . import attendance, upcoming
+
+JOIN = "join"
+LEAVE = "leave"
+
+# Outcome reported by views when a queued operation outlives EVENTS_ATTEND_TIMEOUT
+PENDING = "pending"
+
+# Re-plan attempts before falling back to one attendance call per operation
+MAX_ROUNDS = 5
+
+logger = logging.getLogger(__name__)
+
+
+class _Op:
+    __slots__ = ("kind", "oid", "user_id", "future")
+
+    def __init__(self, kind: str, oid: ObjectId, user_id: str):
+        self.kind = kind
+        self.oid = oid
+        self.user_id = user_id
+        self.future: Future = Future()
+
+
+class _Segment:
+    """
+    Consecutive operations of one kind on one event, each user at most once.
+    """
+
+    def __init__(self, kind: str, oid: ObjectId):
+        self.kind = kind
+        self.oid = oid
+        self.ops: List[_Op] = []
+        self.users = set()
+        self.results: Dict[str, Tuple[str, List[str]]] = {}
+        self.admit: List[str] = []
+        self.queue: List[str] = []
+        self.present: List[str] = []
+        self.waiting: List[str] = []
+
+    def plan(self, state: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Decide every operation's outcome against `state` and build the merged update.
+
+        Returns (filter, update), or None when nothing needs writing (all
+        outcomes are final).
+        """
+        present = set(state.get("present") or [])
+        waiting = set(state.get("waiting") or [])
+        self.results = {}
+
+        if self.kind == LEAVE:
+            self.present = [u for u in self.users if u in present]
+            self.waiting = [u for u in self.users if u in waiting]
+            for op in self.ops:
+                if op.user_id in present:
+                    self.results[op.user_id] = (attendance.LEFT, [])
+                elif op.user_id in waiting:
+                    self.results[op.user_id] = (attendance.LEFT_WAITLIST, [])
+                else:
+                    self.results[op.user_id] = (attendance.NOT_ATTENDING, [])
+            if not self.present and not self.waiting:
+                return None
+            filt: Dict[str, Any] = {"_id": self.oid}
+            pull: Dict[str, Any] = {}
+            if self.present:
+                filt["attendees"] = {"$all": self.present}
+                pull["attendees"] = {"$in": self.present}
+            if self.waiting:
+                filt["waitlist"] = {"$all": self.waiting}
+                pull["waitlist"] = {"$in": self.waiting}
+            return filt, {"$pull": pull}
+
+        capacity = state.get("capacity")
+        size, waiting_size = state["size"], state["waiting_size"]
+        # Seats are only taken directly while nobody is waiting (FIFO)
+        if waiting_size:
+            seats = 0
+        else:
+            seats = len(self.ops) if capacity is None else max(0, capacity - size)
+        self.admit, self.queue = [], []
+        for op in self.ops:
+            uid = op.user_id
+            if uid in present:
+                self.results[uid] = (attendance.ALREADY_ATTENDING, [])
+            elif uid in waiting:
+                self.results[uid] = (attendance.ALREADY_WAITLISTED, [])
+            elif len(self.admit) < seats:
+                self.admit.append(uid)
+                self.results[uid] = (attendance.JOINED, [uid])
+            elif state.get("waitlist_enabled") is True:
+                self.queue.append(uid)
+                self.results[uid] = (attendance.WAITLISTED, [])
+            else:
+                self.results[uid] = (attendance.FULL, [])
+        if not self.admit and not self.queue:
+            return None
+        new = self.admit + self.queue
+        return (
+            {
+                "_id": self.oid,
+                "capacity": capacity,
+                "waitlist_enabled": state.get("waitlist_enabled"),
+                "attendees": {"$nin": new},
+                "waitlist": {"$nin": new},
+                "$expr": {"$and": [
+                    {"$eq": [{"$size": {"$ifNull": ["$attendees", []]}}, size]},
+                    {"$eq": [{"$size": {"$ifNull": ["$waitlist", []]}}, waiting_size]},
+                ]},
+            },
+            {"$push": {"attendees": {"$each": self.admit}, "waitlist": {"$each": self.queue}}},
+        )
+
+    def applied(self, state: Optional[Dict[str, Any]]) -> bool:
+        """
+        Return True if this segment's planned update is reflected in `state`.
+        """
+        if state is None:
+            return False
+        present = set(state.get("present") or [])
+        waiting = set(state.get("waiting") or [])
+        if self.kind == LEAVE:
+            return not (present & set(self.present)) and not (waiting & set(self.waiting))
+        return set(self.admit) <= present and set(self.queue) <= waiting
+
+    def finish(self, col) -> None:
+        """
+        Promote from the waitlist where the applied update freed or left seats, then resolve futures.
+        """
+        promoted: List[str] = []
+        if (self.kind == LEAVE and self.present) or (self.kind == JOIN and self.queue):
+            promoted = attendance.promote(col, self.oid)
+        others = [uid for uid in promoted if uid not in self.results]
+        for uid in promoted:
+            if uid in self.results:
+                self.results[uid] = (attendance.JOINED, [uid])
+        if others:
+            # Count other users' promotions once, on the first operation
+            outcome, added = self.results[self.ops[0].user_id]
+            self.results[self.ops[0].user_id] = (outcome, added + others)
+
+        delta = len(self.admit) + len(promoted) - (len(self.present) if self.kind == LEAVE else 0)
+        if delta:
+            try:
+                upcoming.adjust_attendees(self.oid, delta)
+            except Exception:
+                logger.exception("Upcoming events view update failed")
+        self.resolve()
+
+    def resolve(self, outcome: Optional[str] = None) -> None:
+        for op in self.ops:
+            result = (outcome, []) if outcome else self.results[op.user_id]
+            if not op.future.done():
+                op.future.set_result(result)
+
+
+def _segments(batch: List[_Op]) -> Dict[ObjectId, List[_Segment]]:
+    """
+    Split a batch into per-event segments, preserving arrival order.
+    """
+    by_event: Dict[ObjectId, List[_Segment]] = {}
+    for op in batch:
+        segs = by_event.setdefault(op.oid, [])
+        if not segs or segs[-1].kind != op.kind or op.user_id in segs[-1].users:
+            segs.append(_Segment(op.kind, op.oid))
+        seg = segs[-1]
+        seg.ops.append(op)
+        seg.users.add(op.user_id)
+    return by_event
+
+
+def _members(users: List[str], array: str) -> Dict[str, Any]:
+    """
+    Expression for the given users that are in an array field ($setIntersection
+    equivalent; the stand-in has no set operators).
+    """
+    return {"$filter": {
+        "input": {"$literal": users},
+        "as": "u",
+        "cond": {"$in": ["$$u", {"$ifNull": [array, []]}]},
+    }}
+
+
+def _read_states(col, segments: List[_Segment]) -> Dict[ObjectId, Dict[str, Any]]:
+    """
+    Load sizes, limits and the batch users' membership for the segments' events in one query.
+    """
+    users = sorted({u for seg in segments for u in seg.users})
+    pipeline = [
+        {"$match": {"_id": {"$in": [seg.oid for seg in segments]}}},
+        {"$project": {
+            "capacity": 1,
+            "waitlist_enabled": 1,
+            "size": {"$size": {"$ifNull": ["$attendees", []]}},
+            "waiting_size": {"$size": {"$ifNull": ["$waitlist", []]}},
+            "present": _members(users, "$attendees"),
+            "waiting": _members(users, "$waitlist"),
+        }},
+    ]
+    return {doc["_id"]: doc for doc in col.aggregate(pipeline)}
+
+
+def _write(col, writes: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+    """
+    Send the merged updates in one bulk_write and return how many modified a document.
+
+    The stand-in's bulk_write does not accept current pymongo operations, so
+    there the updates are sent one by one.
+    """
+    if is_standin():
+        return sum(col.update_one(filt, update).modified_count for filt, update in writes)
+    return col.bulk_write([UpdateOne(filt, update) for filt, update in writes], ordered=False).modified_count
+
+
+def flush(batch: List[_Op]) -> None:
+    """
+    Apply a batch of queued operations and resolve their futures.
+    """
+    col = get_events_collection()
+    pending = _segments(batch)
+
+    for _ in range(MAX_ROUNDS):
+        if not pending:
+            return
+        heads = [segs[0] for segs in pending.values()]
+        states = _read_states(col, heads)
+
+        writes: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        planned: List[_Segment] = []
+        for seg in heads:
+            state = states.get(seg.oid)
+            if state is None:
+                seg.resolve(attendance.NOT_FOUND)
+                pending[seg.oid].pop(0)
+                continue
+            update = seg.plan(state)
+            if update is None:
+                seg.resolve()
+                pending[seg.oid].pop(0)
+                continue
+            writes.append(update)
+            planned.append(seg)
+
+        if writes:
+            if _write(col, writes) == len(writes):
+                done = planned
+            else:
+                # Some compare-and-swaps lost to another writer: see which applied
+                fresh = _read_states(col, planned)
+                done = [seg for seg in planned if seg.applied(fresh.get(seg.oid))]
+            for seg in done:
+                seg.finish(col)
+                pending[seg.oid].pop(0)
+
+        pending = {oid: segs for oid, segs in pending.items() if segs}
+
+    # Persistent contention: apply what is left one operation at a time
+    for segs in pending.values():
+        for seg in segs:
+            for op in seg.ops:
+                action = attendance.join if op.kind == JOIN else attendance.leave
+                outcome, added = action(col, op.oid, op.user_id)
+                delta = len(added) - (1 if outcome == attendance.LEFT else 0)
+                if delta:
+                    try:
+                        upcoming.adjust_attendees(op.oid, delta)
+                    except Exception:
+                        logger.exception("Upcoming events view update failed")
+                op.future.set_result((outcome, added))
+
+
+class AttendBatcher:
+    """
+    Per-process queue of attend/unattend operations with a background flusher.
+    """
+
+    def __init__(self, interval: float, max_batch: int):
+        self.interval = interval
+        self.max_batch = max_batch
+        self._pending: List[_Op] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, kind: str, oid: ObjectId, user_id: str) -> Future:
+        op = _Op(kind, oid, user_id)
+        with self._cond:
+            self._pending.append(op)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="attend-write-behind", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return op.future
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            # Collect a window of operations unless the batch is already full
+            deadline = time.monotonic() + self.interval
+            with self._cond:
+                while len(self._pending) < self.max_batch and time.monotonic() < deadline:
+                    self._cond.wait(deadline - time.monotonic())
+                batch = self._pending[:self.max_batch]
+                self._pending = self._pending[self.max_batch:]
+            try:
+                flush(batch)
+            except Exception as e:
+                for op in batch:
+                    if not op.future.done():
+                        op.future.set_exception(e)
+
+
+_batcher: Optional[AttendBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return getattr(settings, "EVENTS_ATTEND_WRITE_BEHIND", False)
+
+
+def submit(kind: str, oid: ObjectId, user_id: str) -> Tuple[str, List[str]]:
+    """
+    Queue a join/leave and wait for the flusher to apply it.
+
+    Returns
+    -------
+    tuple
+    Same as attendance.join / attendance.leave.
+
+    Raises
+    ------
+    TimeoutError
+    If the batch was not applied within EVENTS_ATTEND_TIMEOUT seconds; the
+    operation stays queued and may still be applied.
+    """
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = AttendBatcher(
+                    getattr(settings, "EVENTS_ATTEND_FLUSH_MS", 5) / 1000.0,
+                    getattr(settings, "EVENTS_ATTEND_MAX_BATCH", 500),
+                )
+    future = _batcher.submit(kind, oid, user_id)
+    return future.result(timeout=getattr(settings, "EVENTS_ATTEND_TIMEOUT", 5.0))
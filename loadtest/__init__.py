@@ -0,0 +1,7 @@
+"""
+End-to-end load-test harness for the events API.
+
+Run with ``python -m loadtest --help``. Boots the Django app in-process
+against a local mongod or the mongomock:// stand-in, seeds a dataset and
+drives a weighted mix of API calls at a fixed concurrency.
+"""
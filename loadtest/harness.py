@@ -0,0 +1,336 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_MIX: Dict[str, int] = {
+    "list": 35,
+    "detail": 30,
+    "login": 5,
+    "attend": 10,
+    "unattend": 10,
+    "profile": 10,
+}
+LOGIN_PASSWORD = "loadtest-password"
+SEED_BATCH_SIZE = 1000
+
+
+def parse_mix(raw: Optional[str]) -> Dict[str, int]:
+    """
+    Parse "list=40,detail=30,..." into operation weights.
+
+    Raises
+    ------
+    ValueError
+        If an operation is unknown or a weight is not a non-negative integer.
+    """
+    if not raw:
+        return dict(DEFAULT_MIX)
+    mix: Dict[str, int] = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation in mix: {name}")
+        mix[name] = int(weight)
+        if mix[name] < 0:
+            raise ValueError("Mix weights must be >= 0")
+    if not any(mix.values()):
+        raise ValueError("Mix must have at least one positive weight")
+    return mix
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an already sorted sequence.
+    """
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def boot(mongodb_uri: str, db_name: str) -> None:
+    """
+    Configure and set up Django against the given MongoDB before any client is created.
+    """
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ["MONGODB_URI"] = mongodb_uri
+    os.environ["MONGODB_DB_NAME"] = db_name
+    os.environ.setdefault("DEBUG", "False")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "my_events_backend.settings")
+
+    import django
+    import logging
+    django.setup()
+    # 4xx responses (e.g. 409 on repeated attend) are expected under load
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+
+
+def seed(n_events: int, n_users: int, rng: random.Random) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Drop the load-test database and insert a fresh dataset.
+
+    Notes
+    -----
+    - All users share one precomputed password hash (LOGIN_PASSWORD).
+    - Attendance is skewed: a few events get most attendees.
+
+    Returns
+    -------
+    tuple
+        (event ids, [(user id, email), ...])
+    """
+    from django.conf import settings
+    from django.contrib.auth.hashers import make_password
+    from my_events_backend.mongo import get_client, get_events_collection, get_users_collection
+
+    get_client().drop_database(settings.MONGODB_DB_NAME)
+    users_col = get_users_collection()
+    events_col = get_events_collection()
+    users_col.create_index("email", unique=True)
+
+    password = make_password(LOGIN_PASSWORD)
+    now = datetime.now(timezone.utc)
+    users: List[Tuple[str, str]] = []
+    for start in range(0, n_users, SEED_BATCH_SIZE):
+        docs = [{
+            "email": f"user{i}@loadtest.local",
+            "password": password,
+            "first_name": f"User{i}",
+            "last_name": "Load",
+            "created_at": now,
+        } for i in range(start, min(start + SEED_BATCH_SIZE, n_users))]
+        res = users_col.insert_many(docs, ordered=False)
+        users.extend((str(oid), d["email"]) for oid, d in zip(res.inserted_ids, docs))
+
+    user_ids = [u[0] for u in users]
+    first_day = date.today()
+    event_ids: List[str] = []
+    for start in range(0, n_events, SEED_BATCH_SIZE):
+        docs = []
+        for i in range(start, min(start + SEED_BATCH_SIZE, n_events)):
+            size = min(len(user_ids), int(rng.paretovariate(1.2)) - 1)
+            docs.append({
+                "title": f"Event {i}",
+                "description": "Load test event " * 8,
+                "details": "Details " * 32,
+                "date": (first_day + timedelta(days=i % 365)).isoformat(),
+                "image": "",
+                "attendees": rng.sample(user_ids, size) if size > 0 else [],
+                "created_by": rng.choice(user_ids) if user_ids else "",
+            })
+        res = events_col.insert_many(docs, ordered=False)
+        event_ids.extend(str(oid) for oid in res.inserted_ids)
+    return event_ids, users
+
+
+def build_plan(n_requests: int, mix: Dict[str, int], rng: random.Random,
+               event_ids: List[str], users: List[Tuple[str, str]]) -> List[Tuple[str, str, int]]:
+    """
+    Pre-compute a deterministic request sequence of (operation, event id, user index).
+    """
+    ops = [op for op, w in mix.items() if w > 0]
+    weights = [mix[op] for op in ops]
+    plan = []
+    for _ in range(n_requests):
+        op = rng.choices(ops, weights)[0]
+        plan.append((op, rng.choice(event_ids), rng.randrange(len(users))))
+    return plan
+
+
+def _issue(client, op: str, event_id: str, user: Tuple[str, str], token: str) -> int:
+    auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+    if op == "list":
+        return client.get("/events/").status_code
+    if op == "detail":
+        return client.get(f"/events/{event_id}/").status_code
+    if op == "login":
+        body = json.dumps({"email": user[1], "password": LOGIN_PASSWORD})
+        return client.post("/auth/login/", body, content_type="application/json").status_code
+    if op == "attend":
+        return client.post(f"/events/{event_id}/attend/", **auth).status_code
+    if op == "unattend":
+        return client.post(f"/events/{event_id}/unattend/", **auth).status_code
+    if op == "profile":
+        return client.get("/auth/profile/", **auth).status_code
+    raise ValueError(f"Unknown operation: {op}")
+
+
+def run(plan: List[Tuple[str, str, int]], users: List[Tuple[str, str]], concurrency: int) -> Tuple[List[Tuple[str, float, int, int]], float]:
+    """
+    Drive the plan with `concurrency` worker threads through the full WSGI stack.
+
+    Returns
+    -------
+    tuple
+        ([(operation, latency ms, status, db ops), ...], elapsed seconds)
+    """
+    from django.test import Client
+    from my_events_backend.auth import make_access_token
+    from my_events_backend.mongo import track_commands
+
+    tokens = [make_access_token(uid, email) for uid, email in users]
+    samples: List[Tuple[str, float, int, int]] = []
+    lock = threading.Lock()
+    position = iter(range(len(plan)))
+
+    def worker() -> None:
+        client = Client(HTTP_HOST="localhost")
+        local = []
+        while True:
+            with lock:
+                i = next(position, None)
+            if i is None:
+                break
+            op, event_id, user_idx = plan[i]
+            with track_commands() as commands:
+                start = time.perf_counter()
+                try:
+                    status = _issue(client, op, event_id, users[user_idx], tokens[user_idx])
+                except Exception:
+                    status = 599
+                latency = (time.perf_counter() - start) * 1000.0
+            local.append((op, latency, status, len(commands)))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples, time.perf_counter() - started
+
+
+def _stats(rows: List[Tuple[str, float, int, int]], elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(r[1] for r in rows)
+    statuses: Dict[str, int] = {}
+    for r in rows:
+        statuses[str(r[2])] = statuses.get(str(r[2]), 0) + 1
+    return {
+        "requests": len(rows),
+        "throughput_rps": round(len(rows) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50), 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 3) if latencies else None,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else None,
+        "db_ops_per_request": round(sum(r[3] for r in rows) / len(rows), 3) if rows else None,
+        "server_errors": sum(1 for r in rows if r[2] >= 500),
+        "statuses": statuses,
+    }
+
+
+def summarize(samples: List[Tuple[str, float, int, int]], elapsed: float) -> Dict[str, Any]:
+    """
+    Aggregate samples into overall and per-operation latency/throughput stats.
+    """
+    by_op: Dict[str, List[Tuple[str, float, int, int]]] = {}
+    for s in samples:
+        by_op.setdefault(s[0], []).append(s)
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "overall": _stats(samples, elapsed),
+        "operations": {op: _stats(rows, elapsed) for op, rows in sorted(by_op.items())},
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Render per-operation p95 and throughput deltas against a previous result file.
+    """
+    lines = [f"{'operation':<10} {'p95 ms':>10} {'base':>10} {'delta':>8} {'rps':>10} {'base':>10}"]
+    base_ops = baseline.get("results", {}).get("operations", {})
+    for op, cur in current["results"]["operations"].items():
+        base = base_ops.get(op, {})
+        p95, b95 = cur.get("p95_ms"), base.get("p95_ms")
+        delta = f"{(p95 - b95) / b95 * 100:+.1f}%" if p95 and b95 else "n/a"
+        lines.append(f"{op:<10} {p95 or 0:>10.3f} {b95 or 0:>10.3f} {delta:>8} "
+                     f"{cur.get('throughput_rps') or 0:>10.1f} {base.get('throughput_rps') or 0:>10.1f}")
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Load-test the events API in-process.")
+    parser.add_argument("--mongodb-uri", default=os.environ.get("LOADTEST_MONGODB_URI", "mongomock://localhost"),
+                        help="local mongod URI or mongomock:// (default) for the in-memory stand-in")
+    parser.add_argument("--db-name", default="loadtest", help="database to (re)create; it is dropped on every run")
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", help="weights, e.g. list=35,detail=30,login=5,attend=10,unattend=10,profile=10")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=200, help="requests run (and discarded) before measuring")
+    parser.add_argument("--output", help="write JSON results here")
+    parser.add_argument("--compare", help="previous JSON result to compare against")
+    args = parser.parse_args(argv)
+
+    if args.users < 1 or args.events < 1:
+        parser.error("--users and --events must be >= 1")
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    boot(args.mongodb_uri, args.db_name)
+    rng = random.Random(args.seed)
+
+    t0 = time.perf_counter()
+    event_ids, users = seed(args.events, args.users, rng)
+    seed_s = time.perf_counter() - t0
+
+    if args.warmup:
+        run(build_plan(args.warmup, mix, rng, event_ids, users), users, args.concurrency)
+    samples, elapsed = run(build_plan(args.requests, mix, rng, event_ids, users), users, args.concurrency)
+
+    import django
+    result = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "backend": "stand-in" if args.mongodb_uri.startswith("mongomock://") else "mongod",
+            "seed_s": round(seed_s, 3),
+        },
+        "params": {
+            "events": args.events, "users": args.users, "requests": args.requests,
+            "concurrency": args.concurrency, "mix": mix, "seed": args.seed, "warmup": args.warmup,
+        },
+        "results": summarize(samples, elapsed),
+    }
+
+    overall = result["results"]["overall"]
+    print(f"{overall['requests']} requests in {result['results']['elapsed_s']}s "
+          f"({overall['throughput_rps']} req/s), p50={overall['p50_ms']}ms "
+          f"p95={overall['p95_ms']}ms p99={overall['p99_ms']}ms, "
+          f"db ops/request={overall['db_ops_per_request']}")
+    for op, st in result["results"]["operations"].items():
+        print(f"  {op:<10} n={st['requests']:<6} p50={st['p50_ms']}ms p95={st['p95_ms']}ms "
+              f"p99={st['p99_ms']}ms db_ops={st['db_ops_per_request']} statuses={st['statuses']}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+    if args.compare:
+        print("\n".join(compare(result, json.loads(Path(args.compare).read_text()))))
+    return result
@@ -0,0 +1,247 @@
+"""
+Structured access log with request ids, written off the request thread.
+
+AccessLogMiddleware gives every request an id (X-Request-ID) and logs one
+JSON line per request to the "my_events_backend.access" logger: route,
+status, latency, user id and MongoDB command count.
+
+settings.LOGGING routes all logging through QueuedStreamHandler: records
+are queued on the calling thread and written by a background thread, so a
+slow or blocked log sink never stalls a request. JsonFormatter renders
+them, and RequestIdFilter tags every record logged while a request is
+being handled with that request's id.
+"""
+import json
+import logging
+import os
+import queue
+import random
+import re
+import time
+import uuid
+import weakref
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest
+
+from my_events_backend.mongo import count_commands
+
+access_logger = logging.getLogger("my_events_backend.access")
+
+HEADER = "HTTP_X_REQUEST_ID"
+# Incoming ids are echoed back and logged, so only accept tame ones
+_VALID_ID = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    """
+    Return the id of the request being handled in this context, if any.
+    """
+    return _request_id.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Set `record.request_id` to the current request id (None outside requests).
+
+    django.request records are logged after the middleware has returned, so
+    they take the id from the request they carry.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            request_id = getattr(getattr(record, "request", None), "request_id", None)
+            record.request_id = request_id or _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Render records as one JSON object per line.
+
+    Access-log records contribute their fields (`extra={"access": {...}}`);
+    other records contribute "message" and, inside a request, "request_id".
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        access = getattr(record, "access", None)
+        if access is not None:
+            data.update(access)
+        else:
+            data["message"] = record.getMessage()
+            if getattr(record, "request_id", None):
+                data["request_id"] = record.request_id
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(data, default=str)
+
+
+# Live handlers, restarted in forked children
+_handlers: "weakref.WeakSet[QueuedStreamHandler]" = weakref.WeakSet()
+
+
+class QueuedStreamHandler(QueueHandler):
+    """
+    Log to a stream (stderr by default) from a background thread.
+
+    Notes
+    -----
+    - Records are formatted on the calling thread (QueueHandler.prepare), so
+      messages keep the values their arguments had when logged; only the
+      I/O is deferred.
+    - The queue holds at most `queue_size` records. When the writer falls
+      that far behind, new records are dropped rather than blocking the
+      request; the number dropped is logged once the queue has room again.
+    - The writer thread is restarted in forked workers, and drained when the
+      handler is closed (logging.shutdown() at exit).
+    """
+
+    def __init__(self, stream=None, queue_size: int = 10_000):
+        super().__init__(queue.Queue(queue_size))
+        self.target = logging.StreamHandler(stream)
+        self.dropped = 0
+        self._listener: Optional[QueueListener] = None
+        self._start()
+        _handlers.add(self)
+
+    def _start(self) -> None:
+        self._listener = QueueListener(self.queue, self.target)
+        self._listener.start()
+
+    def _restart_after_fork(self) -> None:
+        # The writer thread did not survive the fork, and the queue's lock may
+        # have been held by another thread; records queued in the parent are
+        # the parent's to write
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.dropped = 0
+        if self._listener is not None:
+            self._start()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            notice = logging.makeLogRecord({
+                "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": "Log queue full: dropped %d records", "args": (dropped,),
+            })
+            try:
+                self.queue.put_nowait(self.prepare(notice))
+            except queue.Full:
+                self.dropped += dropped
+
+    def close(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()  # writes out what is still queued
+        self.target.close()
+        super().close()
+
+
+def _after_fork() -> None:
+    for handler in list(_handlers):
+        handler._restart_after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+class AccessLogMiddleware:
+    """
+    Assign a request id and write one structured access-log line per request.
+
+    Behavior
+    --------
+    - The id is the incoming X-Request-ID header if it is tame (up to 64 of
+      `A-Za-z0-9._:-`), else a new uuid4 hex. It is set as
+      `request.request_id`, returned as X-Request-ID, and attached to every
+      record logged while the request is handled.
+    - Fields: request_id, parent_id (the batch request, for /batch/
+      sub-requests), method, path (without the query string, which may carry
+      tokens), route (URL name), status, duration_ms, bytes, user_id (set by
+      require_jwt / optional_jwt), db_ops, db_ms and sample_rate.
+    - Sampling: a request is logged with probability
+      ACCESS_LOG_SAMPLE_RATES[route] (default ACCESS_LOG_SAMPLE_RATE), so
+      counts can be reconstructed by weighting lines with 1 / sample_rate.
+      5xx responses and requests slower than ACCESS_LOG_SLOW_MS are always
+      logged (sample_rate 1).
+    - For streaming responses, duration and db_ops cover the time until the
+      response starts, not the body.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "ACCESS_LOG_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = float(getattr(settings, "ACCESS_LOG_SAMPLE_RATE", 1.0))
+        self.route_rates = {
+            route: float(rate) for route, rate in (getattr(settings, "ACCESS_LOG_SAMPLE_RATES", {}) or {}).items()
+        }
+        self.slow_ms = float(getattr(settings, "ACCESS_LOG_SLOW_MS", 1000))
+
+    def __call__(self, request: HttpRequest):
+        incoming = request.META.get(HEADER, "")
+        request_id = incoming if _VALID_ID.fullmatch(incoming) else uuid.uuid4().hex
+        request.request_id = request_id
+        parent_id = _request_id.get()
+
+        token = _request_id.set(request_id)
+        started = time.perf_counter()
+        try:
+            with count_commands() as db:
+                response = self.get_response(request)
+        finally:
+            _request_id.reset(token)
+        duration_ms = (time.perf_counter() - started) * 1000.0
+
+        response["X-Request-ID"] = request_id
+        if access_logger.isEnabledFor(logging.INFO):
+            route = getattr(request.resolver_match, "url_name", None)
+            rate = self._sample(route, response.status_code, duration_ms)
+            if rate:
+                access_logger.info("%s %s %s", request.method, request.path, response.status_code, extra={"access": {
+                    "request_id": request_id,
+                    "parent_id": parent_id,
+                    "method": request.method,
+                    "path": request.path,
+                    "route": route,
+                    "status": response.status_code,
+                    "duration_ms": round(duration_ms, 3),
+                    "bytes": None if response.streaming else len(response.content),
+                    "user_id": getattr(request, "user_id", None),
+                    "db_ops": db.count,
+                    "db_ms": round(db.duration_ms, 3),
+                    "sample_rate": rate,
+                }})
+        return response
+
+    def _sample(self, route: Optional[str], status: int, duration_ms: float) -> float:
+        """
+        Return the sample rate the request was logged at, or 0 if it is skipped.
+        """
+        if status >= 500 or duration_ms >= self.slow_ms:
+            return 1.0
+        rate = self.route_rates.get(route, self.sample_rate)
+        if rate >= 1.0:
+            return 1.0
+        return rate if rate > 0 and random.random() < rate else 0.0
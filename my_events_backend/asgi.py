@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'my_events_backend.settings')
 
 application = get_asgi_application()
+
+# Connect to MongoDB and prime caches before the first request (see GET /ready/)
+from my_events_backend import warmup  # noqa: E402
+
+warmup.start()
@@ -85,6 +85,47 @@ def _get_token_from_request(request: HttpRequest) -> str | None:
     return None
 
 
+def verify_request(request: HttpRequest) -> tuple[dict | None, jwt.InvalidTokenError | None]:
+    """
+    Verify the request's Bearer token, once per request.
+
+    Notes
+    -----
+    - The result is cached on the request; sub-requests of a batch
+      (my_events_backend.batch) inherit the batch's result via
+      inherit_verification() instead of decoding the token again.
+
+    Parameters
+    ----------
+    request : HttpRequest
+    The Django request object.
+
+    Returns
+    -------
+    tuple
+    (claims, error): claims if the token is valid, the decoding error if it
+    is not, (None, None) if there is no token.
+    """
+    result = getattr(request, "_jwt_result", None)
+    if result is None:
+        token = _get_token_from_request(request)
+        claims, error = None, None
+        if token:
+            try:
+                claims = decode_token(token)
+            except jwt.InvalidTokenError as e:
+                error = e
+        result = request._jwt_result = (claims, error)
+    return result
+
+
+def inherit_verification(request: HttpRequest, parent: HttpRequest) -> None:
+    """
+    Reuse the parent's token verification for a request carrying the same token.
+    """
+    request._jwt_result = verify_request(parent)
+
+
 def require_jwt(view_func):
     """
     Require a valid JWT token.
@@ -110,11 +151,10 @@ def require_jwt(view_func):
         if not token:
             return JsonResponse({"error": "Missing Bearer token"}, status=401)
 
-        try:
-            claims = decode_token(token)
-        except jwt.ExpiredSignatureError:
+        claims, error = verify_request(request)
+        if isinstance(error, jwt.ExpiredSignatureError):
             return JsonResponse({"error": "Token has expired"}, status=401)
-        except jwt.InvalidTokenError:
+        if error is not None:
             return JsonResponse({"error": "Invalid token"}, status=401)
 
         request.user_id = claims.get("sub")
@@ -148,15 +188,11 @@ def optional_jwt(view_func):
         request.user_id = None
         request.user_email = None
 
-        token = _get_token_from_request(request)
-        if token:
-            try:
-                claims = decode_token(token)
-                request.user_id = claims.get("sub")
-                request.user_email = claims.get("email")
-            except jwt.InvalidTokenError:
-                # Ignore invalid/expired token for public routes
-                pass
+        # Invalid/expired tokens are ignored for public routes
+        claims, _ = verify_request(request)
+        if claims is not None:
+            request.user_id = claims.get("sub")
+            request.user_email = claims.get("email")
 
         return view_func(request, *args, **kwargs)
 
@@ -0,0 +1,93 @@
+"""
+MongoDB availability: fail-fast 503s while the circuit breaker is open, the
+/health/ endpoint that reports the breaker state, and the /ready/ endpoint
+that reports startup warm-up.
+"""
+import math
+
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse
+from django.views.decorators.http import require_http_methods
+from pymongo.errors import ConnectionFailure
+
+from my_events_backend import warmup
+from my_events_backend.mongo import CircuitBreaker, DatabaseUnavailable, get_breaker
+
+
+def _unavailable(retry_after: float) -> JsonResponse:
+    response = JsonResponse({"error": "Database unavailable, try again later"}, status=503)
+    response["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+class DatabaseAvailabilityMiddleware:
+    """
+    Turn MongoDB outages into 503 responses with Retry-After.
+
+    Behavior
+    --------
+    - DatabaseUnavailable (breaker open) becomes a 503 right away.
+    - Connection failures (server selection timeouts, network errors) are
+      counted by the circuit breaker and also become a 503.
+    - Other errors are left to Django.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        return self.get_response(request)
+
+    def process_exception(self, request: HttpRequest, exception: Exception):
+        breaker = get_breaker()
+        if isinstance(exception, DatabaseUnavailable):
+            return _unavailable(exception.retry_after)
+        if isinstance(exception, ConnectionFailure):
+            breaker.record_failure()
+            return _unavailable(breaker.retry_after())
+        return None
+
+
+@require_http_methods(["GET"])
+def health_view(request: HttpRequest) -> JsonResponse:
+    """
+    Report process health and the MongoDB circuit breaker state.
+
+    GET
+    ---
+    Public endpoint. Does not contact MongoDB.
+
+    Returns
+    -------
+    JsonResponse
+        200 OK: {"status": "ok" | "degraded", "mongodb": {"breaker": {...}}}.
+        "degraded" means the breaker is not closed: writes fail fast with 503
+        and public event reads may be served from the last-known-good cache.
+    """
+    breaker = get_breaker().snapshot()
+    status = "ok" if breaker["state"] == CircuitBreaker.CLOSED else "degraded"
+    return JsonResponse({"status": status, "mongodb": {"breaker": breaker}}, status=200)
+
+
+@require_http_methods(["GET"])
+def readiness_view(request: HttpRequest) -> JsonResponse:
+    """
+    Report whether this worker has finished its startup warm-up.
+
+    GET
+    ---
+    Public endpoint. Does not contact MongoDB.
+
+    Returns
+    -------
+    JsonResponse
+        200 OK: Warm-up done (or disabled): {"status": "ready", "warmup": {...}}.
+        503 Service Unavailable: Still warming up or retrying after a failed
+        step; "warmup" lists the steps and the error. See Retry-After.
+    """
+    state = warmup.status()
+    if warmup.is_ready():
+        return JsonResponse({"status": "ready", "warmup": state}, status=200)
+    response = JsonResponse({"status": state["state"], "warmup": state}, status=503)
+    response["Retry-After"] = str(max(1, math.ceil(float(getattr(settings, "WARMUP_RETRY_SECONDS", 5)))))
+    return response
@@ -0,0 +1,178 @@
+"""
+POST /batch/: several API calls in one round trip.
+
+Sub-requests are dispatched in-process through the normal middleware chain
+and URL patterns, so they behave exactly like separate requests. They share
+the batch's Authorization header, and its token is verified only once.
+"""
+import base64
+import contextvars
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from my_events_backend.auth import inherit_verification
+
+METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+# Request META a sub-request must not inherit from the batch request
+_PER_REQUEST_META = (
+    "PATH_INFO", "QUERY_STRING", "REQUEST_METHOD", "CONTENT_TYPE", "CONTENT_LENGTH",
+    "HTTP_IDEMPOTENCY_KEY", "HTTP_X_PROFILE", "HTTP_IF_NONE_MATCH", "HTTP_X_REQUEST_ID",
+)
+# Headers a sub-request may not set itself
+_SHARED_HEADERS = ("authorization", "cookie", "host")
+
+_handler = None
+_handler_lock = threading.Lock()
+
+
+def _get_handler() -> BaseHandler:
+    global _handler
+    if _handler is None:
+        with _handler_lock:
+            if _handler is None:
+                handler = BaseHandler()
+                handler.load_middleware()
+                _handler = handler
+    return _handler
+
+
+def _parse(request: HttpRequest) -> Dict[str, Any]:
+    """
+    Validate the batch envelope.
+
+    Raises
+    ------
+    ValueError
+    If the body is not {"requests": [...], "parallel": bool} with valid items.
+    """
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        raise ValueError("Invalid JSON body")
+    if not isinstance(data, dict) or not isinstance(data.get("requests"), list) or not data["requests"]:
+        raise ValueError("Body must be an object with a non-empty 'requests' list")
+    max_requests = int(getattr(settings, "BATCH_MAX_REQUESTS", 20))
+    if len(data["requests"]) > max_requests:
+        raise ValueError(f"At most {max_requests} requests per batch")
+    if not isinstance(data.get("parallel", False), bool):
+        raise ValueError("'parallel' must be a boolean")
+
+    batch_path = reverse("batch")
+    for i, item in enumerate(data["requests"]):
+        if not isinstance(item, dict):
+            raise ValueError(f"requests[{i}] must be an object")
+        method = str(item.get("method", "GET")).upper()
+        path = item.get("path")
+        if method not in METHODS:
+            raise ValueError(f"requests[{i}].method must be one of: {', '.join(METHODS)}")
+        if not isinstance(path, str) or not path.startswith("/"):
+            raise ValueError(f"requests[{i}].path must be an absolute path")
+        if urlsplit(path).path == batch_path:
+            raise ValueError(f"requests[{i}]: batches cannot be nested")
+        headers = item.get("headers", {})
+        if not isinstance(headers, dict) or any(k.lower() in _SHARED_HEADERS for k in headers):
+            raise ValueError(f"requests[{i}].headers must be an object without {', '.join(_SHARED_HEADERS)}")
+        item["method"] = method
+    return data
+
+
+def _sub_request(parent: HttpRequest, item: Dict[str, Any]) -> WSGIRequest:
+    parts = urlsplit(item["path"])
+    body = b"" if item.get("body") is None else json.dumps(item["body"]).encode("utf-8")
+    environ = {k: v for k, v in parent.META.items() if k not in _PER_REQUEST_META}
+    environ.update({
+        "REQUEST_METHOD": item["method"],
+        "PATH_INFO": parts.path,
+        "QUERY_STRING": parts.query,
+        "SCRIPT_NAME": parent.META.get("SCRIPT_NAME", ""),
+        "wsgi.input": io.BytesIO(body),
+        "CONTENT_LENGTH": str(len(body)),
+    })
+    if body:
+        environ["CONTENT_TYPE"] = "application/json"
+    for name, value in item.get("headers", {}).items():
+        key = name.upper().replace("-", "_")
+        environ[key if key == "CONTENT_TYPE" else f"HTTP_{key}"] = str(value)
+    sub = WSGIRequest(environ)
+    inherit_verification(sub, parent)
+    return sub
+
+
+def _encode(item: Dict[str, Any], response: HttpResponse) -> Dict[str, Any]:
+    result = {"status": response.status_code, "headers": dict(response.items())}
+    if "id" in item:
+        result["id"] = item["id"]
+    if response.streaming:
+        response.close()
+        result.update(status=501, error="Streaming responses are not supported in a batch")
+        return result
+    content = response.content
+    response.close()
+    content_type = response.get("Content-Type", "")
+    if content_type.startswith("application/json"):
+        result["body"] = json.loads(content) if content else None
+    elif content_type.startswith("text/"):
+        result["body"] = content.decode(response.charset or "utf-8", errors="replace")
+    elif content:
+        result["body_base64"] = base64.b64encode(content).decode("ascii")
+    return result
+
+
+def _dispatch(parent: HttpRequest, item: Dict[str, Any]) -> Dict[str, Any]:
+    return _encode(item, _get_handler().get_response(_sub_request(parent, item)))
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def batch_view(request: HttpRequest) -> JsonResponse:
+    """
+    Run several API requests in one round trip.
+
+    POST
+    ----
+    Body: {"requests": [{"id"?, "method", "path", "body"?, "headers"?}, ...],
+    "parallel"?: bool}. Each item is dispatched to the regular URL patterns
+    with the batch's Authorization header; "body" is sent as JSON. With
+    "parallel": true, items run concurrently (only for independent
+    requests); otherwise they run in order.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        Django request object.
+
+    Returns
+    -------
+    JsonResponse
+        200 OK: {"responses": [{"id"?, "status", "headers", "body" | "body_base64"}, ...]}
+                in request order, whatever the individual statuses.
+        400 Bad Request: Invalid envelope or too many requests.
+    """
+    try:
+        data = _parse(request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    items: List[Dict[str, Any]] = data["requests"]
+    workers = min(int(getattr(settings, "BATCH_MAX_WORKERS", 4)), len(items))
+    if data.get("parallel") and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each item keeps the batch's context (e.g. command tracking while profiled)
+            futures = [pool.submit(contextvars.copy_context().run, _dispatch, request, item) for item in items]
+            responses = [f.result() for f in futures]
+    else:
+        responses = [_dispatch(request, item) for item in items]
+    return JsonResponse({"responses": responses}, status=200)
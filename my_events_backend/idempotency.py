@@ -0,0 +1,195 @@
+"""
+Idempotency-Key support for retried POSTs.
+
+The first response for a (user, key) pair is stored in a TTL-indexed
+MongoDB collection; retries with the same key get that response replayed
+(with `Idempotent-Replayed: true`) instead of running the write again.
+"""
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from typing import Any, Dict, Optional, Tuple
+
+from bson import Binary
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from my_events_backend.mongo import get_idempotency_collection
+
+HEADER = "HTTP_IDEMPOTENCY_KEY"
+MAX_KEY_LENGTH = 255
+
+PENDING = "pending"
+DONE = "done"
+
+TTL_INDEX_NAME = "idempotency_ttl"
+
+logger = logging.getLogger(__name__)
+
+_index_ready = False
+
+
+def _ttl() -> timedelta:
+    return timedelta(seconds=int(getattr(settings, "IDEMPOTENCY_TTL_SECONDS", 24 * 3600)))
+
+
+def _lock_timeout() -> timedelta:
+    return timedelta(seconds=int(getattr(settings, "IDEMPOTENCY_LOCK_SECONDS", 60)))
+
+
+def _ensure_index(col) -> None:
+    """
+    Create the TTL index, or update its expiry after IDEMPOTENCY_TTL_SECONDS changed.
+
+    Failures are logged, not raised: _is_stale() already enforces the TTL,
+    the index only keeps the collection from growing.
+    """
+    global _index_ready
+    if _index_ready:
+        return
+    ttl = int(_ttl().total_seconds())
+    try:
+        existing = col.index_information().get(TTL_INDEX_NAME)
+        if existing is None:
+            col.create_index("created_at", expireAfterSeconds=ttl, name=TTL_INDEX_NAME)
+        elif existing.get("expireAfterSeconds") != ttl:
+            # create_index would raise IndexOptionsConflict for a changed expiry
+            col.database.command("collMod", col.name, index={"name": TTL_INDEX_NAME, "expireAfterSeconds": ttl})
+    except OperationFailure:
+        logger.exception("Could not create or update the idempotency TTL index")
+    _index_ready = True
+
+
+def _valid_key(key: str) -> bool:
+    return 0 < len(key) <= MAX_KEY_LENGTH and key.isascii() and key.isprintable()
+
+
+def _fingerprint(request: HttpRequest) -> Optional[str]:
+    # Multipart bodies differ between retries (random boundary) and may be
+    # too large to read twice, so they are not compared
+    if request.content_type == "multipart/form-data":
+        return None
+    return hashlib.sha256(request.body).hexdigest()
+
+
+def _as_aware(value: datetime) -> datetime:
+    # MongoDB returns naive UTC datetimes unless the client is tz_aware
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _is_stale(record: Dict[str, Any], now: datetime) -> bool:
+    """
+    Expired (the TTL monitor only runs once a minute) or abandoned by a crashed worker.
+    """
+    age = now - _as_aware(record["created_at"])
+    return age >= _ttl() or (record["state"] == PENDING and age >= _lock_timeout())
+
+
+def _claim(col, record_id: str, request: HttpRequest, fingerprint: Optional[str]) -> Tuple[bool, Optional[Dict]]:
+    """
+    Claim the key for this request.
+
+    Returns
+    -------
+    tuple
+    (True, None) if this request should run the view, else (False, record).
+    """
+    now = datetime.now(timezone.utc)
+    claim = {
+        "_id": record_id, "state": PENDING, "created_at": now,
+        "method": request.method, "path": request.path, "fingerprint": fingerprint,
+    }
+    existing = col.find_one({"_id": record_id})
+    if existing is None:
+        try:
+            col.insert_one(claim)
+            return True, None
+        except DuplicateKeyError:
+            return False, col.find_one({"_id": record_id})
+    if not _is_stale(existing, now):
+        return False, existing
+    # Take over only if nobody else did since we read it
+    replaced = col.replace_one({"_id": record_id, "created_at": existing["created_at"]}, claim)
+    if replaced.matched_count:
+        return True, None
+    return False, col.find_one({"_id": record_id})
+
+
+def _replay(record: Optional[Dict[str, Any]], request: HttpRequest, fingerprint: Optional[str]) -> HttpResponse:
+    if record is None or record["state"] == PENDING:
+        response = JsonResponse({"error": "A request with this Idempotency-Key is still in progress"}, status=409)
+        response["Retry-After"] = "1"
+        return response
+    if (record["method"], record["path"]) != (request.method, request.path) or (
+        fingerprint is not None and record["fingerprint"] not in (None, fingerprint)
+    ):
+        return JsonResponse({"error": "Idempotency-Key was already used for a different request"}, status=422)
+
+    response = HttpResponse(bytes(record["body"]), status=record["status"], content_type=record["content_type"])
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(view_func):
+    """
+    Replay the first response for requests that repeat an Idempotency-Key.
+
+    Behavior
+    --------
+    - Without the header the view runs as usual.
+    - Keys are scoped to the authenticated user: place below @require_jwt.
+    - The first request claims the key, runs the view and stores its
+      response (status < 500) for IDEMPOTENCY_TTL_SECONDS. Retries get the
+      stored response back without running the view.
+    - Retries while the first request is still running get 409 with
+      Retry-After. Reusing a key for another path or body gets 422.
+    - 5xx responses and exceptions release the key, so the retry runs the
+      view again.
+
+    Parameters
+    ----------
+    view_func : callable
+    The Django view function to wrap.
+
+    Returns
+    -------
+    callable
+    Wrapped view function.
+    """
+    @wraps(view_func)
+    def wrapper(request: HttpRequest, *args, **kwargs):
+        key = request.META.get(HEADER)
+        if key is None:
+            return view_func(request, *args, **kwargs)
+        if not _valid_key(key):
+            return JsonResponse(
+                {"error": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} printable ASCII characters"}, status=400,
+            )
+
+        col = get_idempotency_collection()
+        _ensure_index(col)
+        record_id = f"{getattr(request, 'user_id', None) or ''}:{key}"
+        fingerprint = _fingerprint(request)
+        claimed, record = _claim(col, record_id, request, fingerprint)
+        if not claimed:
+            return _replay(record, request, fingerprint)
+
+        try:
+            response = view_func(request, *args, **kwargs)
+        except BaseException:
+            col.delete_one({"_id": record_id, "state": PENDING})
+            raise
+        if response.status_code >= 500 or response.streaming:
+            col.delete_one({"_id": record_id, "state": PENDING})
+        else:
+            col.update_one({"_id": record_id}, {"$set": {
+                "state": DONE,
+                "status": response.status_code,
+                "content_type": response.get("Content-Type", "application/json"),
+                "body": Binary(response.content),
+            }})
+        return response
+
+    return wrapper
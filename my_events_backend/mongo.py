@@ -1,16 +1,363 @@
 import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
 import certifi
 from pymongo import MongoClient
+from pymongo import monitoring
+from pymongo.errors import ConnectionFailure
+from pymongo.read_preferences import (
+    Primary, PrimaryPreferred, Secondary, SecondaryPreferred, Nearest,
+)
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 _client = None
 _db = None
+_breaker = None
+
+# MONGODB_URI scheme that selects the in-memory stand-in (requires mongomock)
+STANDIN_SCHEME = "mongomock://"
+
+
+# Commands issued in the current context, when tracking is active (see track_commands)
+_commands: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("mongo_commands", default=None)
+
+
+class CommandCounter:
+    """
+    Number and total duration of the MongoDB commands issued in a block (see count_commands).
+    """
+    __slots__ = ("count", "duration_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.duration_ms = 0.0
+
+
+_counter: ContextVar[Optional[CommandCounter]] = ContextVar("mongo_command_counter", default=None)
+
+
+class _CommandTimeline(monitoring.CommandListener):
+    """
+    Record MongoDB commands into the active track_commands() list.
+
+    Notes
+    -----
+    - Listener callbacks run on the thread issuing the command, so the
+      context variable identifies the request. Costs one lookup when idle.
+    """
+
+    def started(self, event) -> None:
+        counter = _counter.get()
+        if counter is not None:
+            counter.count += 1
+        records = _commands.get()
+        if records is not None:
+            records.append({
+                "command": event.command_name,
+                "request_id": event.request_id,
+                "start": time.perf_counter(),
+                "duration_ms": None,
+                "ok": None,
+            })
+
+    def succeeded(self, event) -> None:
+        get_breaker().record_success()
+        self._finish(event, True)
+
+    def failed(self, event) -> None:
+        self._finish(event, False)
+
+    def _finish(self, event, ok: bool) -> None:
+        counter = _counter.get()
+        if counter is not None:
+            counter.duration_ms += event.duration_micros / 1000.0
+        records = _commands.get()
+        if records:
+            for rec in reversed(records):
+                if rec["request_id"] == event.request_id and rec["ok"] is None:
+                    rec["duration_ms"] = event.duration_micros / 1000.0
+                    rec["ok"] = ok
+                    break
+
+
+_command_listener = _CommandTimeline()
+
+
+@contextmanager
+def track_commands():
+    """
+    Collect the MongoDB commands issued inside the block.
+
+    Yields
+    ------
+    list[dict]
+    Records with "command", "start" (perf_counter), "duration_ms" and "ok".
+    """
+    records: List[Dict[str, Any]] = []
+    token = _commands.set(records)
+    try:
+        yield records
+    finally:
+        _commands.reset(token)
+
+
+@contextmanager
+def count_commands():
+    """
+    Count the MongoDB commands issued inside the block.
+
+    Yields
+    ------
+    CommandCounter
+    Cheaper than track_commands() (no per-command record), and unaffected
+    by a track_commands() block nested inside it.
+    """
+    counter = CommandCounter()
+    token = _counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _counter.reset(token)
+
+
+def record_command(name: str, duration_ms: Optional[float] = None, start: Optional[float] = None) -> None:
+    """
+    Manually record a command (for clients without command monitoring, e.g. the stand-in).
+    """
+    counter = _counter.get()
+    if counter is not None:
+        counter.count += 1
+        counter.duration_ms += duration_ms or 0.0
+    records = _commands.get()
+    if records is not None:
+        records.append({
+            "command": name,
+            "request_id": None,
+            "start": time.perf_counter() if start is None else start,
+            "duration_ms": duration_ms,
+            "ok": True,
+        })
+
+
+class DatabaseUnavailable(Exception):
+    """
+    Raised instead of contacting MongoDB while the circuit breaker is open.
+
+    Attributes
+    ----------
+    retry_after : float
+    Seconds until the breaker lets a probe request through.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__("MongoDB is unavailable")
+        self.retry_after = retry_after
+
+
+# Half-open probe slot (breaker id, claim time) held by the current context
+_probe_slot: ContextVar[Optional[tuple]] = ContextVar("mongo_breaker_probe", default=None)
+
+
+class CircuitBreaker:
+    """
+    Fail fast while MongoDB is unreachable.
+
+    Notes
+    -----
+    - Closed: everything goes through. `failure_threshold` consecutive
+      connection failures (record_failure) open the breaker.
+    - Open: before_call() raises DatabaseUnavailable without waiting for
+      server selection, for `reset_timeout` seconds.
+    - Half-open: one caller at a time is let through as a probe; a
+      successful command (record_success) closes the breaker, a failure
+      opens it again. A probe that reports nothing frees its slot after
+      another `reset_timeout`.
+    - The probe slot belongs to the context (request) that claimed it, so
+      every later before_call() of that request goes through too; a request
+      that needs several collections is not cut off halfway.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_at = 0.0
+        self._trips = 0
+
+    def before_call(self) -> None:
+        """
+        Raise DatabaseUnavailable if MongoDB must not be contacted right now.
+        """
+        if self._state == self.CLOSED:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+                self._set_state(self.HALF_OPEN)
+                self._probe_at = 0.0
+            if self._state == self.HALF_OPEN:
+                if _probe_slot.get() == (id(self), self._probe_at):
+                    return
+                if now - self._probe_at >= self.reset_timeout:
+                    self._probe_at = now
+                    _probe_slot.set((id(self), now))
+                    return
+            if self._state != self.CLOSED:
+                raise DatabaseUnavailable(self._retry_after(now))
+
+    def record_success(self) -> None:
+        if self._state == self.CLOSED and not self._failures:
+            return
+        with self._lock:
+            if self._state != self.CLOSED:
+                self._set_state(self.CLOSED)
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._trips += 1
+                self._set_state(self.OPEN)
+
+    def retry_after(self) -> float:
+        """
+        Seconds until a probe is allowed (0 while closed).
+        """
+        with self._lock:
+            return self._retry_after(time.monotonic())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current state for health checks and logs.
+        """
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "retry_after": round(self._retry_after(time.monotonic()), 3),
+                "trips": self._trips,
+            }
+
+    def _retry_after(self, now: float) -> float:
+        if self._state == self.OPEN:
+            return max(self._opened_at + self.reset_timeout - now, 0.0)
+        if self._state == self.HALF_OPEN:
+            return max(self._probe_at + self.reset_timeout - now, 0.0)
+        return 0.0
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            log = logger.info if state == self.CLOSED else logger.warning
+            log("MongoDB circuit breaker %s -> %s (%d consecutive failures)", self._state, state, self._failures)
+            self._state = state
+
+
+# Errors that mean "MongoDB is unreachable" (turned into 503 by
+# my_events_backend.availability); views re-raise them from catch-all handlers
+UNAVAILABLE_ERRORS = (DatabaseUnavailable, ConnectionFailure)
+
+
+def get_breaker() -> CircuitBreaker:
+    """
+    Get (and cache) the process-wide MongoDB circuit breaker.
+    """
+    global _breaker
+    if _breaker is None:
+        _breaker = CircuitBreaker(
+            failure_threshold=int(getattr(settings, "MONGODB_BREAKER_FAILURES", 5)),
+            reset_timeout=float(getattr(settings, "MONGODB_BREAKER_RESET_SECONDS", 10)),
+        )
+    return _breaker
+
+
+# Stand-in collection methods that map to one server command each
+_STANDIN_COMMANDS = {
+    "find_one": "find", "find": "find", "aggregate": "aggregate",
+    "count_documents": "aggregate", "insert_one": "insert", "insert_many": "insert",
+    "update_one": "update", "update_many": "update", "replace_one": "update",
+    "delete_one": "delete", "delete_many": "delete", "bulk_write": "bulkWrite",
+    "find_one_and_update": "findAndModify", "create_index": "createIndexes",
+}
+
+
+_standin_nested: ContextVar[bool] = ContextVar("mongo_standin_nested", default=False)
+
+# The stand-in mutates documents in plain Python; serializing its commands
+# gives the per-operation atomicity that conditional updates rely on
+_standin_lock = threading.RLock()
+
+
+def _instrument_standin(collection_cls) -> None:
+    """
+    Make each stand-in command atomic, like on the server, and report it to
+    track_commands(), count_commands() and the circuit breaker like command
+    monitoring does.
+    """
+    if getattr(collection_cls, "_commands_instrumented", False):
+        return
+
+    def wrap(method, command):
+        def tracked(self, *args, **kwargs):
+            with _standin_lock:
+                # Skip when idle, and for stand-in methods that call each other internally
+                if (_commands.get() is None and _counter.get() is None) or _standin_nested.get():
+                    result = method(self, *args, **kwargs)
+                else:
+                    token = _standin_nested.set(True)
+                    start = time.perf_counter()
+                    try:
+                        result = method(self, *args, **kwargs)
+                    finally:
+                        _standin_nested.reset(token)
+                        record_command(command, (time.perf_counter() - start) * 1000.0, start)
+            get_breaker().record_success()
+            return result
+        return tracked
+
+    for name, command in _STANDIN_COMMANDS.items():
+        method = getattr(collection_cls, name, None)
+        if method is not None:
+            setattr(collection_cls, name, wrap(method, command))
+    collection_cls._commands_instrumented = True
+
+
+def is_standin() -> bool:
+    """
+    Return True if the configured MongoDB is the local in-memory stand-in.
+    """
+    uri = getattr(settings, "MONGODB_URI", None) or ""
+    return uri.startswith(STANDIN_SCHEME)
 
 
 def get_client() -> MongoClient:
     """
     Get (and cache) a MongoDB client instance.
 
+    Notes
+    -----
+    - A MONGODB_URI of "mongomock://" uses an in-memory stand-in (local dev/tests).
+
     Returns
     -------
     MongoClient
@@ -21,10 +368,20 @@ def get_client() -> MongoClient:
         uri = getattr(settings, "MONGODB_URI", None)
         if not uri:
             raise RuntimeError("MONGODB_URI is missing from settings/.env")
+        if is_standin():
+            try:
+                import mongomock
+            except ImportError:
+                raise RuntimeError("mongomock is required for MONGODB_URI=mongomock://")
+            _instrument_standin(mongomock.collection.Collection)
+            _client = mongomock.MongoClient()
+            return _client
         _client = MongoClient(
             uri,
             tlsCAFile=certifi.where(),
-            serverSelectionTimeoutMS=5000
+            serverSelectionTimeoutMS=int(getattr(settings, "MONGODB_SERVER_SELECTION_TIMEOUT_MS", 5000)),
+            minPoolSize=int(getattr(settings, "MONGODB_MIN_POOL_SIZE", 0)),
+            event_listeners=[_command_listener],
         )
     return _client
 
@@ -46,6 +403,90 @@ def get_db():
     return _db
 
 
+_READ_MODES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+_read_preferences = {}
+
+# Read preference mode for the current request (None = primary)
+_read_mode: ContextVar[Optional[str]] = ContextVar("mongo_read_mode", default=None)
+
+
+def get_read_preference(mode: str):
+    """
+    Build (and cache) a read preference for a mode name like "secondaryPreferred".
+
+    Notes
+    -----
+    - Non-primary modes use MONGODB_MAX_STALENESS_SECONDS (-1 disables the bound).
+
+    Parameters
+    ----------
+    mode : str
+    One of primary, primaryPreferred, secondary, secondaryPreferred, nearest.
+
+    Returns
+    -------
+    ServerMode
+    The PyMongo read preference object.
+
+    Raises
+    ------
+    ValueError
+    If the mode name is unknown.
+    """
+    pref = _read_preferences.get(mode)
+    if pref is None:
+        if mode not in _READ_MODES:
+            raise ValueError(f"Unknown read preference mode: {mode}")
+        if mode == "primary":
+            pref = Primary()
+        else:
+            max_staleness = int(getattr(settings, "MONGODB_MAX_STALENESS_SECONDS", -1))
+            pref = _READ_MODES[mode](max_staleness=max_staleness)
+        _read_preferences[mode] = pref
+    return pref
+
+
+def set_read_mode(mode: Optional[str]):
+    """
+    Route reads for the current request/context to the given mode.
+
+    Returns
+    -------
+    Token
+    Pass to reset_read_mode() when the request finishes.
+    """
+    return _read_mode.set(mode)
+
+
+def reset_read_mode(token) -> None:
+    """
+    Restore the read mode that was active before set_read_mode().
+    """
+    _read_mode.reset(token)
+
+
+def _routed(col):
+    """
+    Apply the current context's read preference to a collection.
+
+    Raises
+    ------
+    DatabaseUnavailable
+    While the circuit breaker is open.
+    """
+    get_breaker().before_call()
+    mode = _read_mode.get()
+    if not mode or mode == "primary":
+        return col
+    return col.with_options(read_preference=get_read_preference(mode))
+
+
 def get_events_collection():
     """
     Get the events collection from the database.
@@ -53,10 +494,36 @@ def get_events_collection():
     Returns
     -------
     Collection
-    The MongoDB collection for events.
+    The MongoDB collection for events (honours the request's read policy).
     """
     name = getattr(settings, "MONGODB_EVENTS_COLLECTION", "events")
-    return get_db()[name]
+    return _routed(get_db()[name])
+
+
+def get_upcoming_collection():
+    """
+    Get the materialized upcoming-events collection (see events.upcoming).
+
+    Returns
+    -------
+    Collection
+    The MongoDB collection of pre-shaped upcoming event rows.
+    """
+    name = getattr(settings, "MONGODB_UPCOMING_COLLECTION", "upcoming_events")
+    return _routed(get_db()[name])
+
+
+def get_idempotency_collection():
+    """
+    Get the collection of stored Idempotency-Key responses (see my_events_backend.idempotency).
+
+    Returns
+    -------
+    Collection
+    The MongoDB collection of idempotency records (TTL-indexed).
+    """
+    name = getattr(settings, "MONGODB_IDEMPOTENCY_COLLECTION", "idempotency_keys")
+    return _routed(get_db()[name])
 
 
 def get_users_collection():
@@ -66,10 +533,23 @@ def get_users_collection():
     Returns
     -------
     Collection
-    The MongoDB collection for users.
+    The MongoDB collection for users (honours the request's read policy).
     """
     name = getattr(settings, "MONGODB_USERS_COLLECTION", "users")
-    return get_db()[name]
+    return _routed(get_db()[name])
+
+
+def _forget_client() -> None:
+    """
+    Drop a MongoClient inherited across fork(); the child opens its own.
+    (The in-memory stand-in is kept: its data lives in the process.)
+    """
+    global _client, _db
+    if _client is not None and not is_standin():
+        _client = _db = None
+
+
+os.register_at_fork(after_in_child=_forget_client)
 
 
 @atexit.register
@@ -0,0 +1,264 @@
+"""
+On-demand profiling of single requests.
+
+An administrator mints a signed token (`manage.py profile_token`) and sends
+it as the X-Profile header or the `_profile` query parameter. That request
+alone runs under a profiler; the result is written to PROFILING_DIR as
+collapsed stacks (flamegraph.pl / speedscope input) plus a JSON file with
+the MongoDB command timeline. The response carries X-Profile-Id and a
+Server-Timing summary.
+
+Modes
+-----
+- "sample": a helper thread snapshots the request thread's stack every
+  PROFILING_INTERVAL_MS; counts are samples. Low overhead, wall-clock view
+  (time blocked on MongoDB shows up under pymongo frames).
+- "trace": deterministic sys.setprofile() on the request thread; counts are
+  microseconds of self time per stack, including C calls. Exact, but slows
+  the profiled request down many times over.
+
+Unprofiled requests cost a header lookup and a substring check; with
+PROFILING_ENABLED=False (the default) the middleware removes itself from the
+chain. Tokens are signed with SECRET_KEY, so profiling refuses to run while
+SECRET_KEY is the public DEV_SECRET_KEY placeholder.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.http import HttpRequest
+
+from my_events_backend.mongo import track_commands
+
+MODES = ("sample", "trace")
+HEADER = "HTTP_X_PROFILE"
+QUERY_PARAM = "_profile"
+
+_SALT = "my_events_backend.profiling"
+
+
+def check_enabled() -> bool:
+    """
+    Return True if profiling is enabled (PROFILING_ENABLED).
+
+    Raises
+    ------
+    ImproperlyConfigured
+    If profiling is enabled while SECRET_KEY is the public DEV_SECRET_KEY,
+    since anyone could then sign profiling tokens.
+    """
+    if not getattr(settings, "PROFILING_ENABLED", False):
+        return False
+    if settings.SECRET_KEY == getattr(settings, "DEV_SECRET_KEY", None):
+        raise ImproperlyConfigured("PROFILING_ENABLED requires SECRET_KEY to be set to a private value")
+    return True
+
+
+def make_token(mode: str = "sample") -> str:
+    """
+    Create a signed profiling token (valid for PROFILING_TOKEN_MAX_AGE seconds).
+
+    Raises
+    ------
+    ValueError
+    If the mode is unknown.
+    ImproperlyConfigured
+    If profiling is disabled or SECRET_KEY is the development default.
+    """
+    if not check_enabled():
+        raise ImproperlyConfigured("Profiling is disabled (set PROFILING_ENABLED=True)")
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of: {', '.join(MODES)}")
+    return signing.TimestampSigner(salt=_SALT).sign(mode)
+
+
+def read_token(token: str) -> Optional[str]:
+    """
+    Return the profiling mode for a valid, unexpired token, else None.
+    """
+    max_age = getattr(settings, "PROFILING_TOKEN_MAX_AGE", 3600)
+    try:
+        mode = signing.TimestampSigner(salt=_SALT).unsign(token, max_age=max_age)
+    except signing.BadSignature:
+        return None
+    return mode if mode in MODES else None
+
+
+def _label(code, module: Optional[str]) -> str:
+    # Collapsed-stack frames must not contain ";" or spaces
+    return f"{module or '?'}:{code.co_qualname}".replace(" ", "_")
+
+
+def _frame_stack(frame) -> Tuple[str, ...]:
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame.f_code, frame.f_globals.get("__name__")))
+        frame = frame.f_back
+    return tuple(reversed(labels))
+
+
+class _Sampler:
+    """
+    Periodically record the stack of one thread.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_frame_stack(frame)] += 1
+
+
+class _Tracer:
+    """
+    Attribute self time to every call stack of the current thread.
+    """
+
+    def __init__(self):
+        self.stacks: Counter = Counter()
+        self._stack: List[str] = []
+        self._last = 0
+
+    def __enter__(self):
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._event)
+        return self
+
+    def __exit__(self, *exc):
+        sys.setprofile(None)
+        self._charge(time.perf_counter_ns())
+
+    def _charge(self, now: int) -> None:
+        if self._stack:
+            self.stacks[tuple(self._stack)] += (now - self._last) // 1000
+        self._last = now
+
+    def _event(self, frame, event, arg) -> None:
+        self._charge(time.perf_counter_ns())
+        if event == "call":
+            self._stack.append(_label(frame.f_code, frame.f_globals.get("__name__")))
+        elif event == "c_call":
+            self._stack.append(f"{getattr(arg, '__module__', None) or 'builtins'}:{arg.__qualname__}")
+        elif self._stack:  # return, c_return, c_exception
+            self._stack.pop()
+        # Leave the profiler's own bookkeeping out of the next charge
+        self._last = time.perf_counter_ns()
+
+
+def collapse(stacks: Counter) -> str:
+    """
+    Render stack counts in the collapsed format ("a;b;c 42" per line).
+    """
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks.most_common() if count > 0)
+
+
+def _timeline(commands: List[Dict[str, Any]], started: float) -> List[Dict[str, Any]]:
+    return [
+        {
+            "command": c["command"],
+            "offset_ms": round((c["start"] - started) * 1000.0, 3),
+            "duration_ms": None if c["duration_ms"] is None else round(c["duration_ms"], 3),
+            "ok": c["ok"],
+        }
+        for c in commands
+    ]
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests that carry a valid signed profiling token.
+
+    Behavior
+    --------
+    - The token comes from the X-Profile header or the `_profile` query
+      parameter; missing, invalid or expired tokens are ignored silently.
+    - Writes `<id>.folded` (collapsed stacks) and `<id>.json` (request,
+      status, duration, MongoDB command timeline) to PROFILING_DIR and keeps
+      the newest PROFILING_KEEP profiles.
+    - Only the request thread is profiled: work on other threads or
+      processes (image thumbnails, attend write-behind) is not included.
+    """
+
+    def __init__(self, get_response):
+        if not check_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.directory = Path(getattr(settings, "PROFILING_DIR", "profiles"))
+        self.interval = getattr(settings, "PROFILING_INTERVAL_MS", 1.0) / 1000.0
+        self.keep = getattr(settings, "PROFILING_KEEP", 100)
+
+    def __call__(self, request: HttpRequest):
+        token = request.META.get(HEADER)
+        if not token and QUERY_PARAM in request.META.get("QUERY_STRING", ""):
+            token = request.GET.get(QUERY_PARAM)
+        mode = read_token(token) if token else None
+        if mode is None:
+            return self.get_response(request)
+        return self._profile(request, mode)
+
+    def _profile(self, request: HttpRequest, mode: str):
+        profiler = _Sampler(threading.get_ident(), self.interval) if mode == "sample" else _Tracer()
+        started = time.perf_counter()
+        with track_commands() as commands:
+            with profiler:
+                response = self.get_response(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        db_ms = sum(c["duration_ms"] or 0.0 for c in commands)
+        self._store(profile_id, profiler.stacks, {
+            "id": profile_id,
+            "mode": mode,
+            "unit": "samples" if mode == "sample" else "microseconds",
+            "interval_ms": self.interval * 1000.0 if mode == "sample" else None,
+            "method": request.method,
+            "path": request.get_full_path(),
+            "route": getattr(request.resolver_match, "url_name", None),
+            "status": response.status_code,
+            "duration_ms": round(elapsed_ms, 3),
+            "db_ms": round(db_ms, 3),
+            "commands": _timeline(commands, started),
+        })
+        response["X-Profile-Id"] = profile_id
+        response["Server-Timing"] = (
+            f"app;dur={elapsed_ms:.1f}, db;dur={db_ms:.1f};desc=\"{len(commands)} commands\""
+        )
+        return response
+
+    def _store(self, profile_id: str, stacks: Counter, meta: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{profile_id}.folded").write_text(collapse(stacks), encoding="utf-8")
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+        # Prune the oldest profiles (names sort by time)
+        metas = sorted(self.directory.glob("*.json"))
+        for old in metas[:max(len(metas) - self.keep, 0)]:
+            for path in (old, old.with_suffix(".folded")):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
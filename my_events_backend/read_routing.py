@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.http import HttpRequest
+
+from my_events_backend.mongo import set_read_mode, reset_read_mode, get_read_preference
+
+_SAFE_METHODS = ("GET", "HEAD")
+
+
+class ReadPreferenceMiddleware:
+    """
+    Apply per-route MongoDB read preferences from settings.
+
+    Behavior
+    --------
+    - Looks up the resolved URL name in settings.MONGODB_READ_POLICIES.
+    - Only GET/HEAD requests are routed; writes and unlisted routes stay on the primary,
+      so read-your-writes paths (attend/unattend responses, profile) are unaffected.
+    - The policy is held in a context variable and read by get_events_collection /
+      get_users_collection, so views need no changes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.policies = dict(getattr(settings, "MONGODB_READ_POLICIES", {}) or {})
+        for mode in self.policies.values():
+            get_read_preference(mode)  # fail fast on typos
+
+    def __call__(self, request: HttpRequest):
+        token = set_read_mode(None)
+        try:
+            return self.get_response(request)
+        finally:
+            reset_read_mode(token)
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs):
+        if request.method in _SAFE_METHODS and request.resolver_match is not None:
+            mode = self.policies.get(request.resolver_match.url_name)
+            if mode:
+                set_read_mode(mode)
+        return None
@@ -10,7 +10,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(str(BASE_DIR / ".env"))
 
 # Core Django settings
-SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-do-not-use-in-prod")
+# Public placeholder: features that sign tokens with SECRET_KEY refuse to run with it
+DEV_SECRET_KEY = "dev-secret-key-do-not-use-in-prod"
+SECRET_KEY = os.getenv("SECRET_KEY", DEV_SECRET_KEY)
 DEBUG = os.getenv("DEBUG", "True") == "True"
 
 # Add your frontend dev hosts here
@@ -54,14 +56,18 @@ TEMPLATES = [
 
 # Middleware: CORS must come before CommonMiddleware
 MIDDLEWARE = [
+    "my_events_backend.access_log.AccessLogMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "my_events_backend.profiling.ProfilingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "my_events_backend.read_routing.ReadPreferenceMiddleware",
+    "my_events_backend.availability.DatabaseAvailabilityMiddleware",
 ]
 
 ROOT_URLCONF = "my_events_backend.urls"
@@ -116,6 +122,118 @@ MONGODB_URI = os.getenv("MONGODB_URI")
 MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "my_events_db")
 MONGODB_EVENTS_COLLECTION = os.getenv("MONGODB_EVENTS_COLLECTION", "events")
 MONGODB_USERS_COLLECTION = os.getenv("MONGODB_USERS_COLLECTION", "users")
+MONGODB_UPCOMING_COLLECTION = os.getenv("MONGODB_UPCOMING_COLLECTION", "upcoming_events")
+MONGODB_IDEMPOTENCY_COLLECTION = os.getenv("MONGODB_IDEMPOTENCY_COLLECTION", "idempotency_keys")
+
+# Read routing for staleness-tolerant public GETs (route name -> read preference mode).
+# Routes not listed here, and all non-GET requests, read from the primary.
+MONGODB_PUBLIC_READ_MODE = os.getenv("MONGODB_PUBLIC_READ_MODE", "secondaryPreferred")
+MONGODB_READ_POLICIES = {
+    "events-list-create": MONGODB_PUBLIC_READ_MODE,
+    "event-detail": MONGODB_PUBLIC_READ_MODE,
+    "events-search": MONGODB_PUBLIC_READ_MODE,
+    "events-upcoming": MONGODB_PUBLIC_READ_MODE,
+    "events-export": MONGODB_PUBLIC_READ_MODE,
+}
+# Max replication lag tolerated on secondaries (>= 90, or -1 for no bound)
+MONGODB_MAX_STALENESS_SECONDS = int(os.getenv("MONGODB_MAX_STALENESS_SECONDS", 120))
+
+# Circuit breaker (my_events_backend.mongo): after MONGODB_BREAKER_FAILURES
+# consecutive connection failures, fail fast with 503 for MONGODB_BREAKER_RESET_SECONDS
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", 5000))
+MONGODB_BREAKER_FAILURES = int(os.getenv("MONGODB_BREAKER_FAILURES", 5))
+MONGODB_BREAKER_RESET_SECONDS = float(os.getenv("MONGODB_BREAKER_RESET_SECONDS", 10))
+# Connections kept open per worker (opened at startup by the warm-up)
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", 2))
+
+# Startup warm-up (my_events_backend.warmup): connect, check indexes and prime
+# the read cache before GET /ready/ reports ready; BLOCKING delays serving instead
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "True") == "True"
+WARMUP_BLOCKING = os.getenv("WARMUP_BLOCKING", "False") == "True"
+WARMUP_VERIFY_INDEXES = os.getenv("WARMUP_VERIFY_INDEXES", "True") == "True"
+WARMUP_PRIME_CACHE = os.getenv("WARMUP_PRIME_CACHE", "True") == "True"
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", 5))
+
+# Events read cache (events.cache): fresh TTL, stale-while-revalidate window
+# and XFetch early-refresh aggressiveness (higher beta = refresh earlier).
+# The default LocMemCache is per process, so invalidations only reach the
+# worker that made the write; set CACHE_URL (redis://...) to share the cache
+# and its generations across workers.
+CACHE_URL = os.getenv("CACHE_URL")
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_URL,
+    } if CACHE_URL else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+EVENTS_CACHE_TTL = int(os.getenv("EVENTS_CACHE_TTL", 30))
+EVENTS_CACHE_STALE_TTL = int(os.getenv("EVENTS_CACHE_STALE_TTL", 60))
+EVENTS_CACHE_BETA = float(os.getenv("EVENTS_CACHE_BETA", 1.0))
+# Last-known-good copies of cached reads, served while MongoDB is unavailable
+EVENTS_CACHE_LKG_TTL = int(os.getenv("EVENTS_CACHE_LKG_TTL", 24 * 3600))
+
+# Max events per POST /events/bulk/ request
+EVENTS_BULK_MAX_ITEMS = int(os.getenv("EVENTS_BULK_MAX_ITEMS", 1000))
+
+# Write-behind attend/unattend (events.write_behind): merge concurrent changes
+# into one bulk_write every EVENTS_ATTEND_FLUSH_MS (opt-in, for flash crowds)
+EVENTS_ATTEND_WRITE_BEHIND = os.getenv("EVENTS_ATTEND_WRITE_BEHIND", "False") == "True"
+EVENTS_ATTEND_FLUSH_MS = float(os.getenv("EVENTS_ATTEND_FLUSH_MS", 5))
+EVENTS_ATTEND_MAX_BATCH = int(os.getenv("EVENTS_ATTEND_MAX_BATCH", 500))
+EVENTS_ATTEND_TIMEOUT = float(os.getenv("EVENTS_ATTEND_TIMEOUT", 5))
+
+# Live attendee counts over SSE (events.live, ASGI only): cross-process changes
+# come from a change stream ("auto" falls back to polling without a replica set)
+EVENTS_LIVE_SOURCE = os.getenv("EVENTS_LIVE_SOURCE", "auto")
+EVENTS_LIVE_POLL_SECONDS = float(os.getenv("EVENTS_LIVE_POLL_SECONDS", 2))
+EVENTS_LIVE_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_LIVE_HEARTBEAT_SECONDS", 15))
+EVENTS_LIVE_MAX_IDS = int(os.getenv("EVENTS_LIVE_MAX_IDS", 50))
+
+# Serve the events list from raw BSON batches with server-shaped rows (MongoDB 4.4+)
+EVENTS_LIST_RAW_BATCHES = os.getenv("EVENTS_LIST_RAW_BATCHES", "True") == "True"
+
+# Uploaded event images (events.images): stored through default_storage under
+# MEDIA_ROOT; thumbnails are rendered on a process pool (requires Pillow)
+MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", BASE_DIR / "media"))
+EVENT_IMAGE_MAX_BYTES = int(os.getenv("EVENT_IMAGE_MAX_BYTES", 10 * 1024 * 1024))
+EVENT_IMAGE_WORKERS = int(os.getenv("EVENT_IMAGE_WORKERS", 2))
+EVENT_IMAGE_THUMBNAILS = os.getenv("EVENT_IMAGE_THUMBNAILS", "True") == "True"
+EVENT_IMAGE_CACHE_SECONDS = int(os.getenv("EVENT_IMAGE_CACHE_SECONDS", 365 * 24 * 3600))
+
+# POST /batch/ (my_events_backend.batch): max sub-requests per batch and
+# threads used for "parallel": true batches
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", 20))
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", 4))
+
+# On-demand request profiling (my_events_backend.profiling): requests carrying a
+# token from `manage.py profile_token` are profiled and written to PROFILING_DIR.
+# Off by default; requires a SECRET_KEY other than DEV_SECRET_KEY
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "False") == "True"
+PROFILING_DIR = Path(os.getenv("PROFILING_DIR", BASE_DIR / "profiles"))
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", 1))
+PROFILING_TOKEN_MAX_AGE = int(os.getenv("PROFILING_TOKEN_MAX_AGE", 3600))
+PROFILING_KEEP = int(os.getenv("PROFILING_KEEP", 100))
+
+# Idempotency-Key handling (my_events_backend.idempotency): first responses are
+# replayed for IDEMPOTENCY_TTL_SECONDS; a claim whose request never finished
+# (crashed worker) can be taken over after IDEMPOTENCY_LOCK_SECONDS
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 24 * 3600))
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", 60))
+
+# Access log (my_events_backend.access_log): one JSON line per request. Requests
+# are logged with probability ACCESS_LOG_SAMPLE_RATES[route name] (default
+# ACCESS_LOG_SAMPLE_RATE); 5xx and requests slower than ACCESS_LOG_SLOW_MS are
+# always logged. LOG_QUEUE_SIZE bounds the records waiting for the log writer thread.
+ACCESS_LOG_ENABLED = os.getenv("ACCESS_LOG_ENABLED", "True") == "True"
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", 1.0))
+ACCESS_LOG_SAMPLE_RATES = {
+    "health": float(os.getenv("ACCESS_LOG_PROBE_SAMPLE_RATE", 0.01)),
+    "ready": float(os.getenv("ACCESS_LOG_PROBE_SAMPLE_RATE", 0.01)),
+}
+ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", 1000))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10_000))
 
 JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ACCESS_MINUTES = int(os.getenv("JWT_ACCESS_MINUTES", 60))
@@ -124,13 +242,28 @@ JWT_ACCESS_MINUTES = int(os.getenv("JWT_ACCESS_MINUTES", 60))
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {"()": "my_events_backend.access_log.RequestIdFilter"},
+    },
+    "formatters": {
+        "json": {"()": "my_events_backend.access_log.JsonFormatter"},
+    },
     "handlers": {
-        "console": {"class": "logging.StreamHandler"},
+        # stderr, written from a background thread
+        "console": {
+            "class": "my_events_backend.access_log.QueuedStreamHandler",
+            "queue_size": LOG_QUEUE_SIZE,
+            "formatter": "json",
+            "filters": ["request_id"],
+        },
     },
     "root": {
         "handlers": ["console"],
         "level": "INFO" if DEBUG else "WARNING",
     },
+    "loggers": {
+        "my_events_backend.access": {"level": "INFO"},
+    },
 }
 
 # On startup, print a small sanity line (DEV only)
@@ -0,0 +1,34 @@
+"""
+API-only settings profile.
+
+Select with DJANGO_SETTINGS_MODULE=my_events_backend.settings_api.
+
+All data lives in MongoDB and auth is JWT (my_events_backend.auth), so the
+admin, sessions, messages, DRF, static files and the SQLite database are
+not needed to serve the API. Dropping them shortens cold starts and the
+per-request middleware chain. Measure with `python -m benchmarks.startup`.
+"""
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    "corsheaders",
+    "events",
+    "users",
+]
+
+# CORS first; CommonMiddleware kept for ALLOWED_HOSTS checks and APPEND_SLASH
+MIDDLEWARE = [
+    "my_events_backend.access_log.AccessLogMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "my_events_backend.profiling.ProfilingMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "my_events_backend.read_routing.ReadPreferenceMiddleware",
+    "my_events_backend.availability.DatabaseAvailabilityMiddleware",
+]
+
+# No SQL database: Django falls back to its dummy backend
+DATABASES = {}
+
+TEMPLATES = []
+STATICFILES_DIRS = []
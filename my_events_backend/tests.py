@@ -0,0 +1,215 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from . import auth, availability, idempotency, mongo
+from .auth import make_access_token
+from .mongo import CircuitBreaker, DatabaseUnavailable
+
+# Runs on the in-memory stand-in unless a real server is given
+TEST_MONGODB_URI = os.getenv("MONGODB_TEST_URI", mongo.STANDIN_SCHEME)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """
+    Half-open probes are granted per request, not per collection lookup.
+    """
+
+    def setUp(self):
+        logging.disable(logging.WARNING)  # state changes are logged
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+    def _half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+        breaker.record_failure()
+        breaker._opened_at -= 60.0  # the open period is over
+        return breaker
+
+    def test_probe_request_keeps_its_slot(self):
+        breaker = self._half_open()
+
+        def probe():
+            for _ in range(3):  # e.g. events, users and upcoming collections
+                breaker.before_call()
+
+        contextvars.copy_context().run(probe)
+        self.assertEqual(breaker.snapshot()["state"], CircuitBreaker.HALF_OPEN)
+
+    def test_other_requests_fail_fast_while_probing(self):
+        breaker = self._half_open()
+        contextvars.copy_context().run(breaker.before_call)
+
+        with self.assertRaises(DatabaseUnavailable):
+            contextvars.copy_context().run(breaker.before_call)
+
+    def test_successful_probe_closes_the_breaker(self):
+        breaker = self._half_open()
+        contextvars.copy_context().run(breaker.before_call)
+        breaker.record_success()
+
+        self.assertEqual(breaker.snapshot()["state"], CircuitBreaker.CLOSED)
+        contextvars.copy_context().run(breaker.before_call)
+
+
+class IdempotencyTests(SimpleTestCase):
+    """
+    Claim, replay, conflict and release of Idempotency-Keys.
+    """
+
+    def setUp(self):
+        name = f"idempotency_test_{uuid.uuid4().hex}"
+        override = override_settings(
+            MONGODB_URI=TEST_MONGODB_URI, MONGODB_DB_NAME="my_events_test", MONGODB_IDEMPOTENCY_COLLECTION=name,
+            IDEMPOTENCY_LOCK_SECONDS=60,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        mongo._client = mongo._db = None
+        idempotency._index_ready = False
+        self.col = mongo.get_idempotency_collection()
+        self.calls = 0
+        self.status = 201
+        self.view = idempotency.idempotent(self._view)
+
+    def tearDown(self):
+        self.col.drop()
+        mongo._client = mongo._db = None
+
+    def _view(self, request):
+        self.calls += 1
+        return JsonResponse({"call": self.calls}, status=self.status)
+
+    def _post(self, body=None, key="key-1", path="/events/"):
+        request = RequestFactory().post(
+            path, json.dumps(body or {"title": "Launch"}), content_type="application/json", HTTP_IDEMPOTENCY_KEY=key,
+        )
+        request.user_id = "user-1"
+        return self.view(request)
+
+    def test_retry_replays_first_response(self):
+        first = self._post()
+        retry = self._post()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((retry.status_code, retry.content), (first.status_code, first.content))
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+
+    def test_retry_while_in_flight_is_409(self):
+        responses = []
+
+        def view(request):
+            responses.append(self._post())  # the client retries before we answer
+            return JsonResponse({}, status=201)
+
+        self.view = idempotency.idempotent(view)
+        self._post()
+
+        self.assertEqual(responses[0].status_code, 409)
+        self.assertIn("Retry-After", responses[0])
+
+    def test_same_key_with_different_body_is_422(self):
+        self._post({"title": "Launch"})
+        response = self._post({"title": "Other"})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.calls, 1)
+
+    def test_5xx_releases_the_key(self):
+        self.status = 503
+        self._post()
+        self.status = 201
+        response = self._post()
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", response)
+
+    def test_abandoned_claim_is_taken_over(self):
+        self.col.insert_one({
+            "_id": "user-1:key-1", "state": idempotency.PENDING,
+            "created_at": datetime.now(timezone.utc) - timedelta(seconds=120),
+            "method": "POST", "path": "/events/", "fingerprint": None,
+        })
+        response = self._post()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.col.find_one({"_id": "user-1:key-1"})["state"], idempotency.DONE)
+
+
+class BatchTests(SimpleTestCase):
+    """
+    POST /batch/ dispatches sub-requests through the regular URL patterns.
+    """
+
+    def setUp(self):
+        logging.disable(logging.WARNING)  # access log lines for each sub-request
+        self.addCleanup(logging.disable, logging.NOTSET)
+        # Not an ObjectId: /auth/profile/ answers 400 without touching MongoDB
+        self.token = make_access_token("not-an-object-id", "batch@example.com")
+
+    def _batch(self, requests, parallel=False, token=None):
+        return self.client.post(
+            "/batch/",
+            json.dumps({"requests": requests, "parallel": parallel}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {token or self.token}",
+        )
+
+    def test_token_is_verified_once_per_batch(self):
+        with mock.patch.object(auth, "decode_token", wraps=auth.decode_token) as decode:
+            response = self._batch([{"id": i, "path": "/auth/profile/"} for i in range(3)])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["status"] for r in response.json()["responses"]], [400, 400, 400])
+        self.assertEqual(decode.call_count, 1)
+
+    def test_invalid_token_is_rejected_in_every_sub_request(self):
+        response = self._batch([{"path": "/auth/profile/"}] * 2, token="not-a-jwt")
+
+        self.assertEqual([r["status"] for r in response.json()["responses"]], [401, 401])
+
+    def test_parallel_responses_keep_request_order(self):
+        first = threading.Event()
+        status = availability.warmup.status
+
+        def slow_status():
+            if not first.is_set():
+                first.set()
+                time.sleep(0.2)  # finishes after the requests behind it
+            return status()
+
+        requests = [{"id": "ready", "path": "/ready/"}] + [{"id": f"health-{i}", "path": "/health/"} for i in range(3)]
+        with mock.patch.object(availability.warmup, "status", side_effect=slow_status):
+            response = self._batch(requests, parallel=True)
+
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()["responses"]
+        self.assertEqual([r["id"] for r in responses], ["ready", "health-0", "health-1", "health-2"])
+        self.assertIn("warmup", responses[0]["body"])
+        self.assertEqual({r["body"]["status"] for r in responses[1:]}, {"ok"})
+
+    def test_nested_batch_is_rejected(self):
+        for path in ("/batch/", "/batch/?parallel=1"):
+            with self.subTest(path=path):
+                response = self._batch([{"path": "/health/"}, {"method": "POST", "path": path, "body": {}}])
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("requests[1]", response.json()["error"])
+
+    def test_shared_headers_cannot_be_overridden(self):
+        for name in ("Authorization", "cookie", "HOST"):
+            with self.subTest(header=name):
+                response = self._batch([{"path": "/auth/profile/", "headers": {name: "x"}}])
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("requests[0].headers", response.json()["error"])
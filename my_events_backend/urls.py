@@ -1,8 +1,18 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 
+from my_events_backend.availability import health_view, readiness_view
+from my_events_backend.batch import batch_view
+
 urlpatterns = [
-    path("admin/", admin.site.urls),
+    # Process health and MongoDB circuit breaker state
+    path("health/", health_view, name="health"),
+
+    # Startup warm-up status (503 until this worker is warm)
+    path("ready/", readiness_view, name="ready"),
+
+    # Several API calls in one round trip (POST)
+    path("batch/", batch_view, name="batch"),
 
     # Users authentication routes
     path("auth/", include("users.urls")),
@@ -15,4 +25,10 @@ urlpatterns = [
 
    
 
-]
\ No newline at end of file
+]
+
+# The admin is not installed in the API-only profile (settings_api)
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
@@ -0,0 +1,171 @@
+"""
+Startup warm-up, so the first requests after a deploy are not the slow ones.
+
+Started from the WSGI/ASGI entry points (not from management commands):
+opens MongoDB connections (TLS handshakes included) and pings the server,
+then runs the hooks registered by apps in AppConfig.ready() (index checks,
+read cache priming). GET /ready/ returns 503 until it has finished.
+
+Notes
+-----
+- Runs on a background thread and retries every WARMUP_RETRY_SECONDS until
+  it succeeds; with WARMUP_BLOCKING the entry point also waits for the
+  first attempt, so the worker only starts serving once warm.
+- Forked workers (e.g. gunicorn --preload) start over after fork: the
+  inherited client is dropped and the caches are per process.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from my_events_backend.mongo import get_client, get_db, is_standin
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+DISABLED = "disabled"
+
+_hooks: List[Tuple[str, Callable[[], Any]]] = []
+_lock = threading.Lock()
+_status: Dict[str, Any] = {"state": PENDING, "attempts": 0, "steps": [], "error": None, "duration_ms": None}
+_started = False
+_first_attempt = threading.Event()
+
+
+def register(name: str, fn: Callable[[], Any]) -> None:
+    """
+    Add a warm-up step (call from AppConfig.ready()).
+
+    Parameters
+    ----------
+    name : str
+    Step name shown by the readiness endpoint.
+    fn : Callable[[], Any]
+    Runs after MongoDB is connected; an exception fails the attempt. A
+    returned dict is shown as the step's detail.
+    """
+    if all(existing != name for existing, _ in _hooks):
+        _hooks.append((name, fn))
+
+
+def _connect() -> Dict[str, Any]:
+    """
+    Open the client's minimum pool of connections and ping the server.
+    """
+    if is_standin():
+        get_db()
+        return {"connections": 0}
+    client = get_client()
+    n = max(int(getattr(settings, "MONGODB_MIN_POOL_SIZE", 0)), 1)
+    # Concurrent pings check out (and so open) up to n pooled connections
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        list(pool.map(lambda _: client.admin.command("ping"), range(n)))
+    get_db()
+    return {"connections": n}
+
+
+def _attempt() -> bool:
+    started = time.perf_counter()
+    steps = []
+    with _lock:
+        _status["state"] = WARMING
+        _status["attempts"] += 1
+    ok = True
+    for name, fn in [("mongodb", _connect)] + _hooks:
+        step_started = time.perf_counter()
+        step = {"name": name, "ok": True}
+        try:
+            detail = fn()
+            if isinstance(detail, dict):
+                step["detail"] = detail
+        except Exception as e:
+            step.update(ok=False, error=f"{type(e).__name__}: {e}")
+            ok = False
+        step["duration_ms"] = round((time.perf_counter() - step_started) * 1000.0, 1)
+        steps.append(step)
+        if not ok:
+            break
+
+    with _lock:
+        _status.update(
+            state=READY if ok else FAILED,
+            steps=steps,
+            error=None if ok else steps[-1]["error"],
+            duration_ms=round((time.perf_counter() - started) * 1000.0, 1),
+        )
+    if ok:
+        logger.info("Warm-up finished in %.0f ms", _status["duration_ms"])
+    else:
+        logger.warning("Warm-up step %r failed: %s", steps[-1]["name"], steps[-1]["error"])
+    return ok
+
+
+def _run() -> None:
+    retry = float(getattr(settings, "WARMUP_RETRY_SECONDS", 5))
+    try:
+        while not _attempt():
+            _first_attempt.set()
+            time.sleep(retry)
+    finally:
+        _first_attempt.set()
+
+
+def start(wait: Optional[bool] = None) -> None:
+    """
+    Start warm-up once per process (no-op when WARMUP_ENABLED is False).
+
+    Parameters
+    ----------
+    wait : bool | None
+    Wait for the first attempt to finish (default: WARMUP_BLOCKING).
+    """
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+        if not getattr(settings, "WARMUP_ENABLED", True):
+            _status["state"] = DISABLED
+            return
+    threading.Thread(target=_run, name="warmup", daemon=True).start()
+    if getattr(settings, "WARMUP_BLOCKING", False) if wait is None else wait:
+        _first_attempt.wait()
+
+
+def status() -> Dict[str, Any]:
+    """
+    Current warm-up state: {"state", "attempts", "steps", "error", "duration_ms"}.
+    """
+    with _lock:
+        return dict(_status, steps=list(_status["steps"]))
+
+
+def is_ready() -> bool:
+    """
+    True once warm-up has succeeded (or is disabled, or was never started).
+    """
+    with _lock:
+        return _status["state"] in (READY, DISABLED) or not _started
+
+
+def _after_fork() -> None:
+    global _started, _lock, _first_attempt
+    was_started = _started
+    # Threads do not survive fork; neither may a lock held by one of them
+    _lock = threading.Lock()
+    _first_attempt = threading.Event()
+    _status.update(state=PENDING, attempts=0, steps=[], error=None, duration_ms=None)
+    _started = False
+    if was_started:
+        start(wait=False)
+
+
+os.register_at_fork(after_in_child=_after_fork)
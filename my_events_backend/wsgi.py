@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'my_events_backend.settings')
 
 application = get_wsgi_application()
+
+# Connect to MongoDB and prime caches before the first request (see GET /ready/)
+from my_events_backend import warmup  # noqa: E402
+
+warmup.start()
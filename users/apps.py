@@ -1,6 +1,28 @@
+import logging
+
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _verify_indexes():
+    from my_events_backend.mongo import get_users_collection
+
+    unique = [info["key"] for info in get_users_collection().index_information().values() if info.get("unique")]
+    missing = [] if [("email", 1)] in unique else ["email (unique)"]
+    if missing:
+        # Not created here: existing duplicate emails would make it fail
+        logger.warning("users collection is missing indexes: %s", ", ".join(missing))
+    return {"missing": missing}
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from my_events_backend import warmup
+
+        if getattr(settings, "WARMUP_VERIFY_INDEXES", True):
+            warmup.register("users indexes", _verify_indexes)
@@ -1,7 +1,6 @@
 from typing import Dict, Any, Mapping, Optional
 import re
 from django.contrib.auth.hashers import make_password, check_password
-from bson import ObjectId
 from datetime import datetime, timezone
 
 EMAIL_RE = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
@@ -92,6 +91,65 @@ def to_mongo_user(d: Mapping[str, Any]) -> Dict[str, Any]:
         "created_at": datetime.now(timezone.utc),
     }
 
+class UserRecord:
+    """
+    Compact public view of a user built once from a MongoDB document.
+
+    Notes
+    -----
+    - Never holds the password hash.
+    - Shared by every view that returns user data (see to_public).
+    """
+
+    __slots__ = ("id", "email", "first_name", "last_name")
+
+    def __init__(self, id: Optional[str], email: str = "", first_name: str = "", last_name: str = ""):
+        self.id = id
+        self.email = email
+        self.first_name = first_name
+        self.last_name = last_name
+
+    @classmethod
+    def from_bson(cls, doc: Mapping[str, Any]) -> "UserRecord":
+        """
+        Build a record from a user document (full or projected).
+        """
+        get = doc.get
+        _id = get("_id")
+        return cls(
+            str(_id) if _id else None,
+            str(get("email", "") or "").lower(),
+            str(get("first_name", "") or ""),
+            str(get("last_name", "") or ""),
+        )
+
+    def to_public(self) -> Dict[str, Any]:
+        """
+        Serialize to the public user payload.
+        """
+        return {
+            "id": self.id,
+            "email": self.email,
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+        }
+
+    @staticmethod
+    def public_from_bson(doc: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Serialize a document straight to the public payload.
+
+        Same result as from_bson(doc).to_public(), without building the record.
+        """
+        get = doc.get
+        _id = get("_id")
+        return {
+            "id": str(_id) if _id else None,
+            "email": str(get("email", "") or "").lower(),
+            "first_name": str(get("first_name", "") or ""),
+            "last_name": str(get("last_name", "") or ""),
+        }
+
 def user_to_public(doc: Mapping[str, Any]) -> Dict[str, Any]:
     """
     Convert a MongoDB user document into a public-facing dictionary.
@@ -111,20 +169,7 @@ def user_to_public(doc: Mapping[str, Any]) -> Dict[str, Any]:
     dict
     Public-safe user data ready for API responses.
     """
-    _id = doc.get("_id")
-    uid: Optional[str] = (
-         str(_id) if isinstance(_id, ObjectId)
-         else (str(_id) if _id else None))
-    
-    first = str(doc.get("first_name", "")or "")
-    last = str(doc.get("last_name", "")or "")
-
-    return {
-        "id": uid,
-        "email": str(doc.get("email", "") or "").lower(),
-        "first_name":first,
-        "last_name": last
-    }
+    return UserRecord.public_from_bson(doc)
 
 def verify_password(hashed: str, raw: str) -> bool:
     """
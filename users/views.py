@@ -5,7 +5,7 @@ from django.views.decorators.http import require_http_methods
 from pymongo.errors import DuplicateKeyError
 from bson import ObjectId
 
-from my_events_backend.mongo import get_users_collection , get_events_collection
+from my_events_backend.mongo import get_users_collection , get_events_collection, UNAVAILABLE_ERRORS
 from my_events_backend.auth import make_access_token, require_jwt
 from .models import (
     validate_register, validate_login,
@@ -50,6 +50,8 @@ def register_view(request):
 
     except DuplicateKeyError:
         return JsonResponse({"error": "Email already exists"}, status=409)
+    except UNAVAILABLE_ERRORS:
+        raise  # 503 from DatabaseAvailabilityMiddleware
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
@@ -94,6 +96,8 @@ def login_view(request):
 
         return JsonResponse({"user": user_to_public(doc), "access": token}, status=200)
 
+    except UNAVAILABLE_ERRORS:
+        raise  # 503 from DatabaseAvailabilityMiddleware
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
@@ -132,6 +136,8 @@ def profile_view(request):
 
         return JsonResponse({"user" : user_to_public(doc)}, status=200)
 
+    except UNAVAILABLE_ERRORS:
+        raise  # 503 from DatabaseAvailabilityMiddleware
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 import json
@@ -141,8 +147,9 @@ from django.views.decorators.http import require_http_methods
 from pymongo.errors import DuplicateKeyError
 from bson import ObjectId
 
-from my_events_backend.mongo import get_users_collection , get_events_collection
+from my_events_backend.mongo import get_users_collection , get_events_collection, UNAVAILABLE_ERRORS
 from my_events_backend.auth import make_access_token, require_jwt
+from events.models import EventRecord, EVENT_ATTENDING_FIELDS, fields_to_projection
 from .models import (
     validate_register, validate_login,
     to_mongo_user, user_to_public, verify_password
@@ -192,6 +199,8 @@ def register_view(request):
     except ValueError as e:
         # From validate_register or manual checks
         return JsonResponse({"error": str(e)}, status=400)
+    except UNAVAILABLE_ERRORS:
+        raise  # 503 from DatabaseAvailabilityMiddleware
     except Exception as e:
         # Generic fallback
         return JsonResponse({"error": f"Bad Request: {str(e)}"}, status=400)
@@ -237,6 +246,8 @@ def login_view(request):
 
         return JsonResponse({"user": user_to_public(doc), "access": token}, status=200)
 
+    except UNAVAILABLE_ERRORS:
+        raise  # 503 from DatabaseAvailabilityMiddleware
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
@@ -270,12 +281,14 @@ def profile_view(request):
             return JsonResponse({"error": "Invalid user id"}, status=400)
 
         users_collection = get_users_collection()
-        doc = users_collection.find_one({"_id": ObjectId(user_id)})
+        doc = users_collection.find_one({"_id": ObjectId(user_id)}, {"password": 0})
         if not doc:
             return JsonResponse({"error": "Not found"}, status=404)
 
         return JsonResponse({"user" : user_to_public(doc)}, status=200)
 
+    except UNAVAILABLE_ERRORS:
+        raise  # 503 from DatabaseAvailabilityMiddleware
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
@@ -301,21 +314,15 @@ def my_attending_events_view(request):
         if not user_id:
             return JsonResponse({"error" : "Unauthorized"}, status = 401)
         
-        evennts_collection = get_events_collection()
+        events_collection = get_events_collection()
+        projection = fields_to_projection(EVENT_ATTENDING_FIELDS)
+        cursor = events_collection.find({"attendees": user_id}, projection).sort("date", 1)
 
-        cursor = evennts_collection.find({"attendees": user_id}).sort("date",1)
-        
-        events = []
-        for ev in cursor:
-            events.append ({
-                "id" : str(ev["_id"]),
-                "title" : ev.get("title",""),
-                "date": ev.get("date", ""),
-                "description": ev.get("description",""),
-                "image": ev.get("image","") , 
-             })
-        return JsonResponse (events,safe=False, status = 200)
+        events = [EventRecord.from_bson(ev).to_public(EVENT_ATTENDING_FIELDS) for ev in cursor]
+        return JsonResponse(events, safe=False, status=200)
    
+    except UNAVAILABLE_ERRORS:
+        raise  # 503 from DatabaseAvailabilityMiddleware
     except Exception as e:
         return JsonResponse({"error": str(e)}, status =400)
 